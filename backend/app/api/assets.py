@@ -0,0 +1,111 @@
+import logging
+import mimetypes
+import os
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, RedirectResponse, Response, StreamingResponse
+
+from app.core.config import settings
+from app.services.asset_cache import asset_cache
+from app.services.asset_proxy import (
+    FORWARD_RESPONSE_HEADERS,
+    PASS_THROUGH_STATUS,
+    asset_proxy,
+    cache_control_for,
+)
+from app.services.image_upload import image_upload_pool
+from app.storage.object_store import object_store
+from app.storage.presigned import presigned_urls
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(tags=["Assets"])
+
+
+# =================================================
+# 이미지 / GLB 서빙 프록시 (Unity → FastAPI → MinIO, Docker 내부 주소)
+# =================================================
+@router.api_route("/nodexr-assets/{file_path:path}", methods=["GET", "HEAD"])
+async def proxy_minio(file_path: str, request: Request):
+    """
+    MinIO 의 nodexr-assets object 를 그대로 흘려보냄.
+    Range → 206, If-None-Match / If-Modified-Since → 304, uuid 파일명 object 는 immutable 캐시 헤더.
+    uuid 파일명 object 는 hot asset 캐시에서 (miss 는 MinIO 에서 1번만 받아서 적재).
+    이 프로세스에서 업로드 중인 key 는 업로드가 끝날 때까지 기다렸다가 MinIO 로 (실패해서 spool 에 있으면 그 파일로).
+    ASSET_DELIVERY_MODE 가 redirect / presigned 면 bytes 를 보내지 않고 presigned URL 로 302.
+    """
+    object_key = f"nodexr-assets/{file_path}"
+
+    local = settings.OBJECT_STORE_BACKEND == "local"
+
+    if settings.ASSET_DELIVERY_MODE in ("redirect", "presigned") and not local:
+        presigned = presigned_urls.get(object_key)  # region 고정 → 로컬 HMAC 서명만
+        # redirect 자체는 URL 이 새로 서명되기 전까지만 캐시
+        max_age = max(int(presigned.remaining()) - presigned_urls.refresh_margin_sec, 0)
+        return RedirectResponse(
+            presigned.url, status_code=302, headers={"cache-control": f"private, max-age={max_age}"},
+        )
+
+    if asset_cache.cacheable(object_key):
+        head = request.method == "HEAD"
+        entry = asset_cache.lookup(object_key) if head else await asset_cache.get(object_key)
+        if entry is not None:
+            try:
+                return asset_cache.respond(entry, request.headers, head=head)
+            except OSError as e:
+                logger.error(f"[ASSET_CACHE] disk read failed {object_key}: {e}")
+
+    # 방금 생성돼서 아직 업로드 중인 이미지 (캐시에서 밀려났거나 캐시 off) → 업로드가 끝난 뒤 MinIO 에서
+    await image_upload_pool.wait(object_key)
+
+    # 업로드가 끝내 실패해서 spool 에 보관 중인 이미지 (다시 올릴 때까지 여기서)
+    spooled = image_upload_pool.spooled_path(object_key)
+    if spooled is not None:
+        return FileResponse(spooled, media_type=mimetypes.guess_type(object_key)[0],
+                            headers={"cache-control": "no-cache"})
+
+    if local:
+        return _serve_local(object_key)
+
+    try:
+        upstream = await asset_proxy.open(request.method, object_key, request.headers)
+    except httpx.HTTPError as e:
+        logger.error(f"🔥 Proxy Connection Failed: {object_key}: {e}")
+        raise HTTPException(status_code=502, detail="MinIO server unreachable")
+
+    if upstream.status_code not in PASS_THROUGH_STATUS:
+        await upstream.aclose()
+        logger.error(f"❌ MinIO Error: {upstream.status_code} for {object_key}")
+        if upstream.status_code in (403, 404):
+            raise HTTPException(status_code=404, detail="File not found in MinIO")
+        raise HTTPException(status_code=502, detail="MinIO error")
+
+    headers = {
+        name: upstream.headers[name]
+        for name in FORWARD_RESPONSE_HEADERS
+        if name in upstream.headers
+    }
+    headers["cache-control"] = cache_control_for(object_key)
+
+    # 304 / 412 / 416 / HEAD 는 body 없음
+    if request.method == "HEAD" or upstream.status_code in (304, 412, 416):
+        await upstream.aclose()
+        return Response(status_code=upstream.status_code, headers=headers)
+
+    return StreamingResponse(
+        asset_proxy.stream(upstream),
+        status_code=upstream.status_code,
+        headers=headers,
+    )
+
+
+def _serve_local(object_key: str) -> Response:
+    """로컬 파일시스템 backend: 파일을 그대로 (Range / HEAD 는 FileResponse 가 처리)"""
+    try:
+        path = object_store.backend.path_for(object_key)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="File not found")
+    if not os.path.isfile(path):
+        raise HTTPException(status_code=404, detail="File not found")
+    return FileResponse(path, headers={"cache-control": cache_control_for(object_key)})
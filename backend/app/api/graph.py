@@ -0,0 +1,40 @@
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from app.db.session import get_db
+from app.schemas.response import ApiResponse
+from app.core.codes import GraphCode, GRAPH_MESSAGE
+from app.services.graph_events import graph_event_publisher
+from app.services.graph_snapshots import load_snapshot_state
+from app.utils.asset_url import client_graph_state
+
+router = APIRouter(prefix="/api/graph", tags=["Graph"])
+
+
+@router.get("/state", response_model=ApiResponse)
+def get_graph_state(room_id: UUID, db: Session = Depends(get_db)):
+    """
+    full graph_state 조회 (GRAPH_DELTA gap 발생 시 재동기화용)
+    """
+    return ApiResponse(
+        code=GraphCode.GRAPH_STATE_OK,
+        message=GRAPH_MESSAGE[GraphCode.GRAPH_STATE_OK],
+        result=graph_event_publisher.full_state_event(db, room_id)
+    )
+
+
+@router.get("/snapshots/{graph_snapshot_id}", response_model=ApiResponse)
+def get_graph_snapshot(graph_snapshot_id: UUID, db: Session = Depends(get_db)):
+    """
+    snapshot 복원 (keyframe + delta 체인 → full graph_state)
+    """
+    graph_state = load_snapshot_state(db, graph_snapshot_id)
+    if graph_state is None:
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+
+    return ApiResponse(
+        code=GraphCode.GRAPH_SNAPSHOT_OK,
+        message=GRAPH_MESSAGE[GraphCode.GRAPH_SNAPSHOT_OK],
+        result={"graph_state": client_graph_state(graph_state)}
+    )
@@ -0,0 +1,115 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.schemas.response import ApiResponse
+from app.core.codes import MetricsCode, METRICS_MESSAGE
+from app.core.ws_manager import room_ws_manager, graph_ws_manager
+from app.db.pool import pool_stats
+from app.db.session import engine, get_db
+from app.services.asset_cache import asset_cache
+from app.services.asset_proxy import asset_proxy
+from app.services.core_image_cache import core_image_cache
+from app.services.image_service import image_service
+from app.services.image_upload import image_upload_pool
+from app.services.job_queue import queue_stats
+from app.services.llm_cache import llm_cache
+from app.services.pipeline_worker import pipeline_worker_pool
+from app.services.utterance_dedup import utterance_dedup
+from app.storage.object_store import object_store
+from app.storage.presigned import presigned_urls
+
+router = APIRouter(prefix="/api/metrics", tags=["Metrics"])
+
+
+@router.get("/ws", response_model=ApiResponse)
+def ws_metrics():
+    """
+    연결별 송신 큐 길이 / 전송 수 / drop 수 / lag
+    """
+    return ApiResponse(
+        code=MetricsCode.METRICS_OK,
+        message=METRICS_MESSAGE[MetricsCode.METRICS_OK],
+        result={
+            "room_connect": room_ws_manager.stats(),
+            "graph_event": graph_ws_manager.stats(),
+        }
+    )
+
+
+@router.get("/pipeline", response_model=ApiResponse)
+def pipeline_metrics(window_sec: float = 900, db: Session = Depends(get_db)):
+    """
+    job queue 깊이 / 대기·실행 시간 분포 / 단계별 소요시간 + 이 프로세스 worker pool 상태
+    + 중복 발화 병합 수 (이 프로세스 기준)
+    """
+    return ApiResponse(
+        code=MetricsCode.METRICS_OK,
+        message=METRICS_MESSAGE[MetricsCode.METRICS_OK],
+        result={
+            "queue": queue_stats(db, window_sec=window_sec),
+            "worker": pipeline_worker_pool.stats(),
+            "dedup": utterance_dedup.stats(),
+        }
+    )
+
+
+@router.get("/db", response_model=ApiResponse)
+def db_metrics():
+    """
+    커넥션 풀 사용량 / checkout 대기시간 분포 / 타임아웃 수
+    """
+    return ApiResponse(
+        code=MetricsCode.METRICS_OK,
+        message=METRICS_MESSAGE[MetricsCode.METRICS_OK],
+        result=pool_stats(engine),
+    )
+
+
+@router.get("/llm", response_model=ApiResponse)
+def llm_metrics():
+    """
+    LLM 응답 캐시 hit / miss / 저장 / eviction
+    """
+    return ApiResponse(
+        code=MetricsCode.METRICS_OK,
+        message=METRICS_MESSAGE[MetricsCode.METRICS_OK],
+        result={"cache": llm_cache.stats()},
+    )
+
+
+@router.get("/images", response_model=ApiResponse)
+def image_metrics():
+    """
+    room 별 core 이미지 캐시 hit / miss / warm / 무효화, 생성 이미지 pass-through / 변환 / 거부 수
+    + 이미지 1장 기준 단계별 ms (generate / encode / upload_wait), 업로드 worker pool 대기열 / 재시도 / 업로드 ms
+    """
+    return ApiResponse(
+        code=MetricsCode.METRICS_OK,
+        message=METRICS_MESSAGE[MetricsCode.METRICS_OK],
+        result={
+            "core_image_cache": core_image_cache.stats(),
+            "output": image_service.output_stats(),
+            "stages_ms": image_service.stage_stats(),
+            "uploads": image_upload_pool.stats(),
+        },
+    )
+
+
+@router.get("/assets", response_model=ApiResponse)
+def asset_metrics():
+    """
+    /nodexr-assets 프록시 상태 코드별 응답 수 (200 / 206 / 304 ...) / 전송 bytes
+    + hot asset 캐시 hit ratio / 캐시에서 보낸 bytes / MinIO 에서 받은 bytes
+    + presigned URL 재사용 / 새로 서명한 수 (redirect / presigned 모드)
+    + object storage thread pool 진행 중 작업 수 / 업로드·다운로드 수와 평균 시간
+    """
+    return ApiResponse(
+        code=MetricsCode.METRICS_OK,
+        message=METRICS_MESSAGE[MetricsCode.METRICS_OK],
+        result={
+            "proxy": asset_proxy.stats(),
+            "cache": asset_cache.stats(),
+            "presigned": presigned_urls.stats(),
+            "storage": object_store.stats(),
+        },
+    )
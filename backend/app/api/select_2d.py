@@ -1,10 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.db.session import get_db
 from app.schemas.response import ApiResponse
 from app.core.ws_manager import graph_ws_manager
+from app.services.graph_cache import graph_cache
+from app.services.core_image_cache import core_image_cache
 
 from app.db.models.node import Node
 from app.db.models.asset import Asset
@@ -18,6 +20,7 @@ router = APIRouter(prefix="/api/2d", tags=["2D Select"])
 @router.post("/select", response_model=ApiResponse)
 def select_2d_image(
     req: Select2DRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     # -------------------------------------------------
@@ -55,6 +58,15 @@ def select_2d_image(
     selected_asset.type = "CURR_2D_CORE"
 
     db.commit()
+    graph_cache.set_core(req.room_id, selected_asset.node_id)
+    # 다른 worker 는 GRAPH_STATE 의 core_img_url 을 DB 에서 다시 읽도록
+    background_tasks.add_task(graph_cache.publish_invalidate, req.room_id)
+
+    # 이전 core 이미지 캐시 무효화, 새 core 는 응답 후 미리 적재 (다음 카테고리 발화가 MinIO 를 기다리지 않도록)
+    core_image_cache.invalidate(req.room_id)
+    background_tasks.add_task(
+        core_image_cache.warm, req.room_id, selected_asset.asset_id, selected_asset.img_url,
+    )
 
     # -------------------------------------------------
     # 4️⃣ 응답
@@ -1,7 +1,12 @@
+import json
 import logging
 from uuid import UUID
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from starlette.concurrency import run_in_threadpool
 from app.core.ws_manager import room_ws_manager, graph_ws_manager
+from app.db.session import SessionLocal
+from app.services.graph_events import graph_event_publisher
+from app.utils.serialize import dumps_json
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -19,18 +24,69 @@ async def ws_room_connect(ws: WebSocket, room_id: UUID):
             message = await ws.receive_text()
             logger.info(f"Message from room {room_id}: {message}")  # 수신된 메시지 로그로 남김
     except WebSocketDisconnect:
-        room_ws_manager.disconnect(room_id, ws)
         logger.info(f"Client disconnected from room {room_id}")
+    finally:
+        # 다른 예외로 끝나도 연결 / writer task 가 남지 않게
+        room_ws_manager.disconnect(room_id, ws)
 
 @router.websocket("/ws/graph_event/{room_id}")
-async def ws_graph_event(ws: WebSocket, room_id: UUID):
+async def ws_graph_event(ws: WebSocket, room_id: UUID, last_version: int | None = None):
+    """
+    last_version: 재접속 시 클라이언트가 마지막으로 적용한 version.
+    - 없으면 현재 GRAPH_STATE 를 바로 전송
+    - 있으면 놓친 GRAPH_DELTA 를 replay, 버퍼로 메울 수 없으면 GRAPH_STATE 1회
+    """
     await graph_ws_manager.connect(room_id, ws)
-    logger.info(f"Client connected to graph event for room {room_id}")
+    logger.info(f"Client connected to graph event for room {room_id} (last_version={last_version})")
     try:
+        await _resume(ws, room_id, last_version)
+
         while True:
             # 클라에서 보낸 메시지 확인
             message = await ws.receive_text()
             logger.info(f"Message from room {room_id} graph event: {message}")  # 수신된 메시지 로그로 남김
+
+            # gap 감지 등으로 클라이언트가 full state 를 요청한 경우에만 GRAPH_STATE 전송
+            if _is_sync_request(message):
+                state = await _full_state(room_id)
+                await graph_ws_manager.send_text(room_id, ws, dumps_json(state))
     except WebSocketDisconnect:
+        logger.info(f"Client disconnected from graph event for room {room_id}")
+    finally:
+        # _resume 의 DB 로드 실패 등 다른 예외로 끝나도 연결 / writer task 가 남지 않게
         graph_ws_manager.disconnect(room_id, ws)
-        logger.info(f"Client disconnected from graph event for room {room_id}")
\ No newline at end of file
+
+async def _resume(ws: WebSocket, room_id: UUID, last_version: int | None):
+    frames = graph_event_publisher.replay_frames(room_id, last_version)
+    if frames is not None:
+        for text in frames:
+            await graph_ws_manager.send_text(room_id, ws, text)
+        logger.info(f"[WS:RESUME] room={room_id} replay={len(frames)} from={last_version}")
+        return
+
+    state = await _full_state(room_id)
+    await graph_ws_manager.send_text(room_id, ws, dumps_json(state))
+    logger.info(f"[WS:RESUME] room={room_id} full_state version={state['version']}")
+
+
+async def _full_state(room_id: UUID) -> dict:
+    state = graph_event_publisher.cached_full_state_event(room_id)
+    if state is None:
+        state = await run_in_threadpool(_load_full_state, room_id)
+    return state
+
+
+def _is_sync_request(message: str) -> bool:
+    try:
+        data = json.loads(message)
+    except ValueError:
+        return False
+    return isinstance(data, dict) and data.get("event") == "GRAPH_SYNC"
+
+
+def _load_full_state(room_id: UUID) -> dict:
+    db = SessionLocal()
+    try:
+        return graph_event_publisher.full_state_event(db, room_id)
+    finally:
+        db.close()
@@ -0,0 +1,220 @@
+import asyncio
+import json
+from abc import ABC, abstractmethod
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict
+from uuid import UUID, uuid4
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# (channel, room_id, text, local, version) → 각 worker 의 WSRoomManager 로 전달
+# version: GRAPH_DELTA 처럼 version 이 있는 프레임이면 publish 쪽이 함께 실어 보냄 (수신 쪽에서 text 파싱 불필요)
+BusHandler = Callable[[str, UUID, str, bool, int | None], Awaitable[None]]
+
+
+class BroadcastBus(ABC):
+    """
+    WS broadcast 를 모든 worker 프로세스로 퍼뜨리는 bus.
+    publish 한 worker 자신도 bus 를 통해 수신하므로 로컬 소켓 전송 경로는 하나다.
+    """
+
+    def __init__(self):
+        self.origin = uuid4().hex
+        self._handler: BusHandler | None = None
+        self._channel_handlers: Dict[str, BusHandler] = {}
+
+    def set_handler(self, handler: BusHandler):
+        self._handler = handler
+
+    def set_channel_handler(self, channel: str, handler: BusHandler):
+        # WS 프레임이 아닌 channel (graph_cache 무효화 등) 은 전용 handler 로
+        self._channel_handlers[channel] = handler
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    @abstractmethod
+    async def publish(self, channel: str, room_id: UUID, text: str, version: int | None = None):
+        ...
+
+    async def _dispatch(self, channel: str, room_id: UUID, text: str, origin: str, version: int | None = None):
+        handler = self._channel_handlers.get(channel, self._handler)
+        if handler is None:
+            return
+        try:
+            await handler(channel, room_id, text, origin == self.origin, version)
+        except Exception:
+            logger.exception(f"[BUS] dispatch failed channel={channel} room={room_id}")
+
+
+class InProcessBus(BroadcastBus):
+    """단일 프로세스 / 테스트용: publish 즉시 같은 프로세스로 전달"""
+
+    async def publish(self, channel: str, room_id: UUID, text: str, version: int | None = None):
+        await self._dispatch(channel, room_id, text, self.origin, version)
+
+
+class PostgresBus(BroadcastBus):
+    """
+    Postgres LISTEN/NOTIFY 기반 bus (multi-worker uvicorn 용).
+    - NOTIFY payload 한도(8000 bytes, 최종 JSON 기준)를 넘는 프레임은 broadcast_messages 에 본문을 저장하고 id 만 NOTIFY
+    - publish 는 단일 스레드에서 순서대로 실행 → room 내 프레임 순서 유지
+    - 수신은 LISTEN 전용 커넥션 fd 를 event loop 에 등록, 단일 consumer task 가 순서대로 dispatch
+    """
+
+    CHANNEL = "nodexr_broadcast"
+    MAX_INLINE_BYTES = 7000
+    MESSAGE_TTL_SEC = 300
+
+    def __init__(self):
+        super().__init__()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bus-publish")
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._listen_conn = None
+        self._inbox: "asyncio.Queue[str] | None" = None
+        self._consumer: asyncio.Task | None = None
+        self._stopped = False
+
+    @staticmethod
+    def _connect():
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        conn = psycopg2.connect(
+            dbname=settings.POSTGRES_DB,
+            user=settings.POSTGRES_USER,
+            password=settings.POSTGRES_PASSWORD,
+            host=settings.POSTGRES_HOST,
+            port=settings.POSTGRES_PORT,
+        )
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        return conn
+
+    # =================================================
+    # listen
+    # =================================================
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._inbox = asyncio.Queue()
+        self._consumer = asyncio.create_task(self._consume())
+        await self._listen()
+
+    async def _listen(self):
+        backoff = 0.5
+        while not self._stopped:
+            try:
+                conn = await self._loop.run_in_executor(None, self._connect)
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self.CHANNEL}")
+                self._listen_conn = conn
+                self._loop.add_reader(conn.fileno(), self._on_readable)
+                logger.info(f"[BUS] LISTEN {self.CHANNEL} origin={self.origin}")
+                return
+            except Exception as e:
+                logger.error(f"[BUS] listen connect failed: {e}")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 10)
+
+    def _on_readable(self):
+        conn = self._listen_conn
+        try:
+            conn.poll()
+        except Exception as e:
+            logger.error(f"[BUS] listen connection lost: {e}")
+            self._loop.remove_reader(conn.fileno())
+            self._listen_conn = None
+            if not self._stopped:
+                asyncio.ensure_future(self._listen())
+            return
+
+        while conn.notifies:
+            self._inbox.put_nowait(conn.notifies.pop(0).payload)
+
+    async def _consume(self):
+        while True:
+            raw = await self._inbox.get()
+            try:
+                msg = json.loads(raw)
+                text = msg.get("t")
+                if text is None:
+                    text = await self._loop.run_in_executor(None, self._fetch_body, msg["id"])
+                if text is not None:
+                    await self._dispatch(msg["c"], UUID(msg["r"]), text, msg["o"], msg.get("v"))
+            except Exception:
+                logger.exception("[BUS] bad notification")
+
+    # =================================================
+    # publish
+    # =================================================
+    async def publish(self, channel: str, room_id: UUID, text: str, version: int | None = None):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._notify, channel, room_id, text, version)
+
+    def _notify(self, channel: str, room_id: UUID, text: str, version: int | None = None):
+        from sqlalchemy import text as sql
+        from app.db.session import engine
+
+        msg = {"c": channel, "r": str(room_id), "o": self.origin}
+        if version is not None:
+            msg["v"] = version
+        with engine.begin() as conn:
+            payload = self._inline_payload(msg, text)
+            if payload is None:
+                msg["id"] = conn.execute(
+                    sql("INSERT INTO broadcast_messages (body) VALUES (:body) RETURNING message_id"),
+                    {"body": text},
+                ).scalar()
+                conn.execute(
+                    sql("DELETE FROM broadcast_messages WHERE created_at < now() - make_interval(secs => :ttl)"),
+                    {"ttl": self.MESSAGE_TTL_SEC},
+                )
+                payload = json.dumps(msg, ensure_ascii=False)
+            # 같은 트랜잭션에서 NOTIFY → 본문 insert 가 커밋된 뒤에 전달됨
+            conn.execute(sql("SELECT pg_notify(:ch, :payload)"), {"ch": self.CHANNEL, "payload": payload})
+
+    @classmethod
+    def _inline_payload(cls, msg: dict, text: str) -> str | None:
+        """
+        본문을 NOTIFY 에 그대로 실을 수 있으면 최종 payload, 아니면 None.
+        한도는 실제로 보낼 문자열 기준 (escape 된 따옴표 / 개행 포함, 한글은 UTF-8 3 bytes)
+        """
+        payload = json.dumps({**msg, "t": text}, ensure_ascii=False)
+        return payload if len(payload.encode("utf-8")) <= cls.MAX_INLINE_BYTES else None
+
+    @staticmethod
+    def _fetch_body(message_id: int) -> str | None:
+        from sqlalchemy import text as sql
+        from app.db.session import engine
+
+        with engine.connect() as conn:
+            return conn.execute(
+                sql("SELECT body FROM broadcast_messages WHERE message_id = :id"),
+                {"id": message_id},
+            ).scalar()
+
+    async def stop(self):
+        self._stopped = True
+        if self._listen_conn is not None:
+            self._loop.remove_reader(self._listen_conn.fileno())
+            self._listen_conn.close()
+            self._listen_conn = None
+        if self._consumer:
+            self._consumer.cancel()
+        self._executor.shutdown(wait=False)
+
+
+def create_bus(kind: str) -> BroadcastBus:
+    if kind == "postgres":
+        return PostgresBus()
+    if kind == "inprocess":
+        return InProcessBus()
+    raise ValueError(f"unknown broadcast bus: {kind}")
+
+
+broadcast_bus = create_bus(settings.BROADCAST_BUS)
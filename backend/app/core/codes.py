@@ -20,6 +20,13 @@ class CategoryCode:
 
 class Generate3DCode:
     GENERATE_3D_OK = "3D200"
+
+class MetricsCode:
+    METRICS_OK = "METRIC200"
+
+class GraphCode:
+    GRAPH_STATE_OK = "GRAPH200"
+    GRAPH_SNAPSHOT_OK = "GRAPH201"
     
 
 ROOM_MESSAGE = {
@@ -45,4 +52,13 @@ CATEGORY_MESSAGE = {
 
 GENERATE_3D_MESSAGE = {
     Generate3DCode.GENERATE_3D_OK: "3D화 성공"
-}
\ No newline at end of file
+}
+
+GRAPH_MESSAGE = {
+    GraphCode.GRAPH_STATE_OK: "그래프 상태 조회 성공",
+    GraphCode.GRAPH_SNAPSHOT_OK: "그래프 스냅샷 조회 성공"
+}
+
+METRICS_MESSAGE = {
+    MetricsCode.METRICS_OK: "메트릭 조회 성공"
+}
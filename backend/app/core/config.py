@@ -18,6 +18,12 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_PORT: int = 5432
 
+    # 커넥션 풀 (웹 요청 threadpool + 파이프라인 DB 구간이 공유)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SEC: float = 10.0   # 풀이 비었을 때 커넥션을 기다리는 최대 시간
+    DB_POOL_RECYCLE_SEC: int = 1800
+
     @property
     def DATABASE_URL(self) -> str:
         return (
@@ -34,18 +40,126 @@ class Settings(BaseSettings):
     MINIO_SECRET_KEY: str
     MINIO_BUCKET: str
     MINIO_SECURE: bool = False
+    OBJECT_STORE_BACKEND: str = "minio"           # minio | local (테스트 / 단일 노드: OBJECT_STORE_LOCAL_DIR 에 파일로)
+    OBJECT_STORE_LOCAL_DIR: str = "./data/objects"
+    OBJECT_STORE_MAX_WORKERS: int = 16            # storage 전용 thread pool 크기 (동시 업로드 / 다운로드 수)
+    OBJECT_STORE_CHUNK_SIZE: int = 256 * 1024     # streaming read 버퍼 크기
+    OBJECT_STORE_PART_SIZE: int = 8 * 1024 * 1024  # 이보다 큰 object 는 multipart (최소 5MiB)
+    OBJECT_STORE_PARALLEL_UPLOADS: int = 4        # multipart part 동시 업로드 수
+    MINIO_PROXY_UPSTREAM: str = "http://minio:9000"  # /nodexr-assets 프록시가 붙는 MinIO 주소 (Docker 내부)
+    ASSET_PROXY_MAX_CONNECTIONS: int = 64             # 프록시 공유 커넥션 풀 크기
+    ASSET_PROXY_TIMEOUT_SEC: float = 10.0             # 연결 / chunk 1개 읽기 타임아웃
+    ASSET_PROXY_CHUNK_SIZE: int = 64 * 1024
+    ASSET_IMMUTABLE_MAX_AGE_SEC: int = 365 * 24 * 3600  # uuid 파일명 object 의 Cache-Control max-age
+    ASSET_CACHE_ENABLED: bool = True                   # 프록시 앞단 hot asset 캐시 (uuid 파일명 object 만)
+    ASSET_CACHE_MAX_BYTES: int = 256 * 1024 * 1024     # 메모리 tier byte 예산
+    ASSET_CACHE_MAX_OBJECT_BYTES: int = 16 * 1024 * 1024  # 이보다 큰 object(GLB 등)는 캐시하지 않고 흘려보냄
+    ASSET_CACHE_DISK_DIR: str = ""                     # 비어 있으면 디스크 tier 없음 (worker 마다 <dir>/<pid>, 시작할 때 비움)
+    ASSET_CACHE_DISK_MAX_BYTES: int = 2 * 1024 * 1024 * 1024
+    # proxy    : /nodexr-assets 가 MinIO bytes 를 직접 전달 (기본)
+    # redirect : img_url 은 그대로, /nodexr-assets 가 presigned URL 로 302 (클라이언트가 MinIO 에서 직접 받음)
+    # presigned: 클라이언트로 보내는 img_url 을 presigned URL 로 (저장되는 graph_state / snapshot 은 그대로, 보낼 때 서명)
+    ASSET_DELIVERY_MODE: str = "proxy"
+    MINIO_PUBLIC_ENDPOINT: str = ""   # 클라이언트가 접근하는 MinIO host:port (presigned 서명 대상), 비어 있으면 MINIO_ENDPOINT
+    MINIO_PUBLIC_SECURE: bool = False
+    MINIO_REGION: str = "us-east-1"   # presign 때 region 조회 요청 없이 로컬에서 서명
+    ASSET_PRESIGN_EXPIRES_SEC: int = 60 * 60               # redirect 모드 presigned URL 유효시간
+    ASSET_PRESIGN_INLINE_EXPIRES_SEC: int = 7 * 24 * 3600  # presigned 모드 (S3 / MinIO 최대 7일)
+    ASSET_PRESIGN_REFRESH_MARGIN_SEC: int = 5 * 60         # 만료까지 이보다 적게 남으면 새로 서명
+    ASSET_PRESIGN_CACHE_MAX_ENTRIES: int = 10000
 
     # =================================================
     # OpenAI
     # =================================================
     OPENAI_API_KEY: str
     OPENAI_MODEL: str = Field(default="gpt-4.1")
+    LLM_MAX_CONCURRENCY: int = 8         # 프로세스 전체 동시 chat completion 수
+    LLM_HTTP_MAX_CONNECTIONS: int = 16   # 공유 HTTP 커넥션 풀 크기
+    LLM_REQUEST_TIMEOUT_SEC: float = 30.0  # 요청 1회 타임아웃
+    LLM_DEADLINE_SEC: float = 90.0       # 재시도 포함 전체 마감 시간
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BASE_SEC: float = 0.5      # 지수 백오프 기준 (full jitter)
+    LLM_RETRY_MAX_SEC: float = 8.0
+    LLM_STREAMING: bool = True           # 응답을 스트리밍으로 받아 keyword 등 앞 필드부터 처리
+
+    # LLM 응답 캐시 (같은 topic / category / 발화 반복 시 재호출 방지)
+    LLM_CACHE_ENABLED: bool = True       # false 면 항상 새로 생성 (temperature 다양성이 필요할 때)
+    LLM_CACHE_BACKEND: str = "memory"    # memory / postgres (memory LRU + llm_cache 테이블)
+    LLM_CACHE_MAX_ENTRIES: int = 1024    # memory LRU 크기
+    LLM_CACHE_TTL_SEC: int = 86400
+
+    # =================================================
+    # Gemini (이미지 생성)
+    # =================================================
+    IMAGE_MODEL: str = "gemini-2.5-flash-image"
+    IMAGE_MAX_CONCURRENCY: int = 6   # 프로세스 전체 동시 Gemini 호출 수
+    IMAGE_TIMEOUT_SEC: float = 60.0  # 이미지 1장 생성 요청 타임아웃
+    CORE_IMAGE_CACHE_MAX_ROOMS: int = 256  # room 별 CURR_2D_CORE 이미지(인코딩된 bytes + Part) 캐시 크기
+    IMAGE_OUTPUT_FORMAT: str = "original"  # original: Gemini bytes 그대로 업로드 / png | jpeg | webp: 다르면 변환
+    IMAGE_OUTPUT_QUALITY: int = 90         # jpeg / webp 로 변환할 때 품질
+    IMAGE_MAX_PIXELS: int = 4096 * 4096    # header 기준 가로x세로가 이보다 크면 업로드하지 않음
+    IMAGE_UPLOAD_WORKERS: int = 8              # 생성 이미지 업로드 worker 수 (생성과 분리된 동시 업로드 수)
+    IMAGE_UPLOAD_QUEUE_SIZE: int = 64          # 업로드 대기열 상한 (가득 차면 생성 쪽이 기다림)
+    IMAGE_UPLOAD_RETRIES: int = 2
+    IMAGE_UPLOAD_RETRY_BACKOFF_SEC: float = 0.5
+    IMAGE_UPLOAD_EARLY_RELEASE: bool = True    # key 예약 + hot 캐시 적재 후 업로드 완료 전에 파이프라인 진행
+                                               # (PIPELINE_WORKER_MODE / BROADCAST_BUS inprocess + proxy 전달일 때만)
+    IMAGE_UPLOAD_DRAIN_TIMEOUT_SEC: float = 30.0  # 종료 시 남은 업로드를 기다리는 시간
+    IMAGE_UPLOAD_SPOOL_DIR: str = "./data/upload_spool"  # early release 업로드가 실패 / 종료로 남으면 bytes 보관 (비우면 끔)
+    IMAGE_UPLOAD_SPOOL_RETRY_SEC: float = 60.0            # spool 에 남은 업로드 재시도 주기
 
     # =================================================
     # Prompt (Graph Policy)
     # =================================================
     GRAPH_SYSTEM_PROMPT: str = ""
 
+    # =================================================
+    # Graph cache (room 별 in-memory graph)
+    # =================================================
+    GRAPH_CACHE_MAX_ROOMS: int = 256
+    GRAPH_CACHE_IDLE_TTL_SEC: float = 30 * 60
+
+    # =================================================
+    # Graph snapshot (keyframe + delta 체인)
+    # =================================================
+    GRAPH_SNAPSHOT_KEYFRAME_INTERVAL: int = 20  # keyframe 이후 이 version 수만큼 지나면 새 keyframe
+
+    # =================================================
+    # WebSocket fan-out (연결별 송신 큐)
+    # =================================================
+    WS_SEND_QUEUE_SIZE: int = 64
+    WS_SLOW_CONSUMER_POLICY: str = "drop_oldest"  # drop_oldest / coalesce / disconnect
+    WS_SEND_TIMEOUT_SEC: float = 10.0
+
+    # =================================================
+    # Broadcast bus (worker 간 WS fan-out)
+    # =================================================
+    BROADCAST_BUS: str = "inprocess"  # inprocess (단일 프로세스) / postgres (LISTEN/NOTIFY, multi-worker)
+
+    # =================================================
+    # Graph event replay (재접속 시 놓친 GRAPH_DELTA 재전송)
+    # =================================================
+    GRAPH_REPLAY_BUFFER_SIZE: int = 128  # room 별 보관 프레임 수
+    GRAPH_REPLAY_MAX_FRAMES: int = 32    # 이보다 많이 놓쳤으면 replay 대신 GRAPH_STATE 1회
+
+    # =================================================
+    # 발화 파이프라인 Job Queue
+    # =================================================
+    PIPELINE_WORKER_MODE: str = "inprocess"  # inprocess (웹 프로세스 안에서 실행) / external (python -m app.worker)
+    PIPELINE_MAX_CONCURRENCY: int = 8        # worker 프로세스 1개당 동시 실행 job 수 (프로세스 안 semaphore)
+    PIPELINE_MAX_RUNNING_JOBS: int = 32      # 전체 worker 합산 동시 RUNNING job 수 (claim 에서 확인, 0 이면 제한 없음)
+    PIPELINE_POLL_INTERVAL_SEC: float = 1.0
+    PIPELINE_MAX_ATTEMPTS: int = 2
+    PIPELINE_JOB_LEASE_SEC: float = 60       # 이 시간 동안 heartbeat 가 없는 RUNNING job 은 worker 가 죽은 것으로 보고 회수
+    PIPELINE_HEARTBEAT_INTERVAL_SEC: float = 15  # 실행 중인 job 의 heartbeat_at 갱신 주기 (lease 보다 충분히 짧게)
+    PIPELINE_BATCH_WINDOW_SEC: float = 0.0   # >0 이면 CATEGORY_DISCUSS 를 이 시간 동안 모아 room 당 LLM 1회 / 이미지 1세트
+    PIPELINE_BATCH_MAX_SIZE: int = 5         # micro-batch 1회에 묶는 최대 발화 수
+
+    # 중복 발화 병합 (STT partial / final 재전송 등)
+    UTTERANCE_DEDUP_ENABLED: bool = True
+    UTTERANCE_DEDUP_THRESHOLD: float = 0.85  # 문자 3-gram Jaccard 이상이면 같은 발화로 간주
+    UTTERANCE_DEDUP_WINDOW_SEC: float = 60.0  # 이 시간 안에 들어온 PENDING / RUNNING job 과만 비교
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
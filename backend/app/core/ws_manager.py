@@ -1,35 +1,213 @@
-from typing import Dict, Set
+import asyncio
+import time
+from typing import Callable, Dict, List
 from uuid import UUID
 from fastapi import WebSocket
 import logging
 
+from app.core.broadcast_bus import BroadcastBus, broadcast_bus
+from app.core.config import settings
+from app.utils.serialize import dumps_json
+
 logger = logging.getLogger(__name__)
 
+# 느린 소비자(큐가 가득 찬 연결) 처리 정책
+# - drop_oldest : 가장 오래된 프레임을 버림 (클라이언트는 version gap 으로 감지 후 재동기화)
+# - coalesce    : 대기 중인 프레임을 모두 버리고 최신 프레임 하나만 유지
+# - disconnect  : 연결을 끊음 (클라이언트 재접속 후 재동기화)
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+
+
+class WSConnection:
+    """
+    연결 1개 = bounded 송신 큐 + 전용 writer task.
+    broadcast 는 큐에 넣기만 하므로 느린 클라이언트가 다른 연결/파이프라인을 막지 않는다.
+    """
+
+    def __init__(self, manager: "WSRoomManager", room_id: UUID, ws: WebSocket):
+        self.manager = manager
+        self.room_id = room_id
+        self.ws = ws
+        self.queue: "asyncio.Queue[tuple[float, str]]" = asyncio.Queue(maxsize=manager.queue_size)
+        self.task: asyncio.Task | None = None
+        self.closed = False
+
+        # lag metrics
+        self.connected_at = time.time()
+        self.sent = 0
+        self.dropped = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    @property
+    def client(self) -> str:
+        client = getattr(self.ws, "client", None)
+        return f"{client.host}:{client.port}" if client else hex(id(self.ws))
+
+    def start(self):
+        self.task = asyncio.create_task(self._writer())
+
+    def enqueue(self, text: str):
+        if self.closed:
+            return
+
+        if self.queue.full():
+            policy = self.manager.slow_consumer_policy
+            if policy == "disconnect":
+                logger.warning(f"[WS:SLOW] room={self.room_id} client={self.client} policy=disconnect")
+                self.manager._drop(self)
+                return
+            if policy == "coalesce":
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+                    self.dropped += 1
+            else:
+                self.queue.get_nowait()
+                self.dropped += 1
+
+        self.queue.put_nowait((time.monotonic(), text))
+
+    async def _writer(self):
+        try:
+            while True:
+                enqueued_at, text = await self.queue.get()
+                await asyncio.wait_for(self.ws.send_text(text), timeout=self.manager.send_timeout)
+
+                lag_ms = (time.monotonic() - enqueued_at) * 1000
+                self.sent += 1
+                self.last_lag_ms = lag_ms
+                self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.info(f"[WS:WRITER] room={self.room_id} client={self.client} closed: {e!r}")
+            self.manager._drop(self)
+
+    def close(self):
+        self.closed = True
+        if self.task and not self.task.done():
+            self.task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "client": self.client,
+            "connected_sec": round(time.time() - self.connected_at, 1),
+            "queued": self.queue.qsize(),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "last_lag_ms": round(self.last_lag_ms, 2),
+            "max_lag_ms": round(self.max_lag_ms, 2),
+        }
+
+
+# bus 로 들어온 프레임을 받은 worker 에서의 후처리 (room_id, text, local, version)
+DeliveryListener = Callable[[UUID, str, bool, int | None], None]
+
+# channel 이름 → manager (bus 수신 시 라우팅)
+_managers: Dict[str, "WSRoomManager"] = {}
+
+
+async def _on_bus_message(channel: str, room_id: UUID, text: str, local: bool, version: int | None):
+    manager = _managers.get(channel)
+    if manager:
+        manager.deliver(room_id, text, local, version)
+
+
 class WSRoomManager:
-    def __init__(self):
-        self._conns: Dict[UUID, Set[WebSocket]] = {}
+    """
+    broadcast 는 bus 로 publish → 모든 worker 가 수신해 자신이 가진 소켓 큐에 넣는다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        bus: BroadcastBus = broadcast_bus,
+        queue_size: int = settings.WS_SEND_QUEUE_SIZE,
+        slow_consumer_policy: str = settings.WS_SLOW_CONSUMER_POLICY,
+        send_timeout: float = settings.WS_SEND_TIMEOUT_SEC,
+    ):
+        if slow_consumer_policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"unknown slow consumer policy: {slow_consumer_policy}")
+
+        self.name = name
+        self.bus = bus
+        self.queue_size = queue_size
+        self.slow_consumer_policy = slow_consumer_policy
+        self.send_timeout = send_timeout
+        self._conns: Dict[UUID, Dict[WebSocket, WSConnection]] = {}
+        self._listeners: List[DeliveryListener] = []
+        _managers[name] = self
+        bus.set_handler(_on_bus_message)
 
     async def connect(self, room_id: UUID, ws: WebSocket):
         await ws.accept()
-        self._conns.setdefault(room_id, set()).add(ws)
+        conn = WSConnection(self, room_id, ws)
+        conn.start()
+        self._conns.setdefault(room_id, {})[ws] = conn
 
     def disconnect(self, room_id: UUID, ws: WebSocket):
-        if room_id in self._conns:
-            self._conns[room_id].discard(ws)
-            if not self._conns[room_id]:
-                self._conns.pop(room_id, None)
+        conns = self._conns.get(room_id)
+        if conns is None:
+            return
+        conn = conns.pop(ws, None)
+        if conn:
+            conn.close()
+        if not conns:
+            self._conns.pop(room_id, None)
+
+    def _drop(self, conn: WSConnection):
+        self.disconnect(conn.room_id, conn.ws)
+        asyncio.create_task(self._close_socket(conn.ws))
+
+    @staticmethod
+    async def _close_socket(ws: WebSocket):
+        try:
+            await ws.close()
+        except Exception:
+            pass
+
+    async def broadcast(self, room_id: UUID, payload: dict, version: int | None = None):
+        # payload 는 연결 수와 무관하게 1번만 인코딩
+        await self.broadcast_text(room_id, dumps_json(payload), version)
+
+    async def broadcast_text(self, room_id: UUID, text: str, version: int | None = None):
+        await self.bus.publish(self.name, room_id, text, version)
 
-    async def broadcast(self, room_id: UUID, payload: dict):
-        conns = list(self._conns.get(room_id, set()))
+    def add_listener(self, listener: DeliveryListener):
+        self._listeners.append(listener)
+
+    def deliver(self, room_id: UUID, text: str, local: bool = True, version: int | None = None):
+        for listener in self._listeners:
+            try:
+                listener(room_id, text, local, version)
+            except Exception:
+                logger.exception(f"[WS:DELIVER] listener failed room={room_id}")
+
+        # 연결별 큐에 넣고 바로 반환 (실제 전송은 각 writer task)
+        conns = list(self._conns.get(room_id, {}).values())
         logger.info(
             f"[WS:BROADCAST] room={room_id} "
             f"connections={len(conns)} "
+            f"bytes={len(text)}"
         )
-        for ws in conns:
-            try:
-                await ws.send_json(payload)
-            except Exception:
-                self.disconnect(room_id, ws)
+        for conn in conns:
+            conn.enqueue(text)
+
+    async def send_text(self, room_id: UUID, ws: WebSocket, text: str):
+        # 단일 연결 응답도 같은 큐를 거쳐야 broadcast 프레임과 순서가 섞이지 않는다
+        conn = self._conns.get(room_id, {}).get(ws)
+        if conn:
+            conn.enqueue(text)
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.slow_consumer_policy,
+            "queue_size": self.queue_size,
+            "rooms": {
+                str(room_id): [conn.stats() for conn in conns.values()]
+                for room_id, conns in self._conns.items()
+            },
+        }
 
-room_ws_manager = WSRoomManager()
-graph_ws_manager = WSRoomManager()
\ No newline at end of file
+room_ws_manager = WSRoomManager("room_connect")
+graph_ws_manager = WSRoomManager("graph_event")
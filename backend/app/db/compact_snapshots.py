@@ -0,0 +1,122 @@
+"""
+graph_snapshots 를 keyframe + delta 체인으로 1회 변환(compaction)
+
+    python -m app.db.compact_snapshots [--room ROOM_ID] [--keyframe-interval N] [--dry-run]
+
+- 스키마(kind / version / keyframe_snapshot_id 컬럼)를 먼저 보장
+- room 별로 created_at 순서대로 full state 를 복원한 뒤 다시 인코딩
+  (이미 변환된 row 도 복원 후 재인코딩하므로 여러 번 실행해도 결과 동일)
+- version 이 없는 기존 row 는 room 내 순번으로 채움
+"""
+import argparse
+import json
+import logging
+from uuid import UUID
+
+from app.core.config import settings
+from app.db.models.graph_snapshot import GraphSnapshot
+from app.db.schema import ensure_schema
+from app.db.session import SessionLocal
+from app.services.graph_snapshots import apply_diff, diff_graph, index_state
+
+logger = logging.getLogger(__name__)
+
+
+def _size(state: dict) -> int:
+    return len(json.dumps(state, ensure_ascii=False))
+
+
+def compact_room(db, room_id, keyframe_interval: int, dry_run: bool = False) -> tuple[int, int, int]:
+    rows = (
+        db.query(GraphSnapshot)
+        .filter(GraphSnapshot.room_id == room_id)
+        .order_by(GraphSnapshot.created_at, GraphSnapshot.version)
+        .all()
+    )
+
+    before = after = 0
+    prev_nodes, prev_edges = {}, {}
+    prev_id = None
+    keyframe_id, keyframe_version = None, None
+    last_version = 0
+
+    for row in rows:
+        before += _size(row.graph_state)
+
+        # 1) full state 복원
+        if row.kind == "DELTA":
+            nodes, edges = dict(prev_nodes), dict(prev_edges)
+            apply_diff(nodes, edges, row.graph_state)
+        else:
+            nodes, edges = index_state(row.graph_state)
+
+        version = row.version if row.version is not None else last_version + 1
+        version = max(version, last_version + 1)
+        snapshot_id = str(row.graph_snapshot_id)
+
+        # 2) keyframe / delta 재인코딩
+        if keyframe_id is None or version - keyframe_version >= keyframe_interval:
+            state = {
+                "graph_snapshot_id": snapshot_id,
+                "nodes": list(nodes.values()),
+                "edges": list(edges.values()),
+            }
+            kind, keyframe_id, keyframe_version = "KEYFRAME", row.graph_snapshot_id, version
+            keyframe_ref = None
+        else:
+            state = {
+                "graph_snapshot_id": snapshot_id,
+                "base_snapshot_id": prev_id,
+                **diff_graph(prev_nodes, prev_edges, nodes, edges),
+            }
+            kind, keyframe_ref = "DELTA", keyframe_id
+
+        after += _size(state)
+        if not dry_run:
+            row.graph_state = state
+            row.kind = kind
+            row.version = version
+            row.keyframe_snapshot_id = keyframe_ref
+
+        prev_nodes, prev_edges, prev_id = nodes, edges, snapshot_id
+        last_version = version
+
+    if not dry_run:
+        db.commit()
+    return len(rows), before, after
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--room", type=UUID, default=None)
+    parser.add_argument("--keyframe-interval", type=int, default=settings.GRAPH_SNAPSHOT_KEYFRAME_INTERVAL)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    ensure_schema()
+
+    db = SessionLocal()
+    try:
+        if args.room:
+            room_ids = [args.room]
+        else:
+            room_ids = [r for (r,) in db.query(GraphSnapshot.room_id).distinct().all()]
+
+        total_before = total_after = 0
+        for room_id in room_ids:
+            count, before, after = compact_room(db, room_id, args.keyframe_interval, args.dry_run)
+            total_before += before
+            total_after += after
+            logger.info(f"[SNAPSHOT:COMPACT] room={room_id} rows={count} bytes {before} → {after}")
+
+        logger.info(
+            f"[SNAPSHOT:COMPACT] rooms={len(room_ids)} bytes {total_before} → {total_after}"
+            f"{' (dry-run)' if args.dry_run else ''}"
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
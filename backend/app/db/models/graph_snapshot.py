@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, DateTime, ForeignKey
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -9,5 +9,8 @@ class GraphSnapshot(Base):
 
     graph_snapshot_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     room_id = Column(UUID(as_uuid=True), ForeignKey("rooms.room_id", ondelete="CASCADE"), nullable=False)
-    graph_state = Column(JSONB, nullable=False)
-    created_at = Column(DateTime, server_default=func.now())
\ No newline at end of file
+    graph_state = Column(JSONB, nullable=False)  # KEYFRAME: full graph_state / DELTA: 직전 snapshot 대비 diff
+    kind = Column(String, nullable=False, default="KEYFRAME", server_default="KEYFRAME")  # KEYFRAME / DELTA
+    version = Column(Integer, nullable=True)  # room graph version (GRAPH_DELTA version)
+    keyframe_snapshot_id = Column(UUID(as_uuid=True), ForeignKey("graph_snapshots.graph_snapshot_id", ondelete="CASCADE"), nullable=True)  # DELTA 체인의 기준 keyframe
+    created_at = Column(DateTime, server_default=func.now())
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, DateTime, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+class LLMCacheEntry(Base):
+    __tablename__ = "llm_cache"
+
+    cache_key = Column(String, primary_key=True)  # sha256(kind, template hash, model, 정규화된 입력)
+    kind = Column(String, nullable=False)  # basic_discuss / category_discuss
+    model = Column(String, nullable=False)
+    response = Column(JSONB, nullable=False)  # 파싱된 응답 JSON
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    expires_at = Column(DateTime, nullable=False)
@@ -0,0 +1,26 @@
+import uuid
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+class PipelineJob(Base):
+    __tablename__ = "pipeline_jobs"
+
+    job_id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    room_id = Column(UUID(as_uuid=True), ForeignKey("rooms.room_id", ondelete="CASCADE"), nullable=False)
+    utterance_id = Column(UUID(as_uuid=True), ForeignKey("utterances.utterance_id", ondelete="SET NULL"), nullable=True)
+    phase = Column(String, nullable=False)  # BASIC_DISCUSS / CATEGORY_DISCUSS
+    text = Column(Text, nullable=False)
+    status = Column(String, nullable=False, default="PENDING", server_default="PENDING")  # PENDING / RUNNING / DONE / FAILED
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    worker = Column(String, nullable=True)  # claim 한 worker id
+    error = Column(Text, nullable=True)
+    stage_timings = Column(JSONB, nullable=True)  # 단계별 소요시간(ms)
+    coalesced = Column(Integer, nullable=False, default=0, server_default="0")  # 합쳐진 중복 발화 수
+    batch_job_id = Column(UUID(as_uuid=True), nullable=True)  # micro-batch 로 같이 실행된 경우 대표 job
+    committed_phases = Column(JSONB(none_as_null=True), nullable=True)  # 커밋된 파이프라인 DB 단계 (있으면 재실행하지 않음)
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)  # 실행 중인 worker 가 주기적으로 갱신 (lease)
+    finished_at = Column(DateTime, nullable=True)
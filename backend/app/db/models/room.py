@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -12,4 +12,6 @@ class Room(Base):
     room_topic = Column(String, nullable=False)
     password = Column(String, nullable=False)
     phase = Column(String, nullable=True)
+    # 마지막으로 발급된 GRAPH_DELTA / snapshot version (graph_events.next_version)
+    graph_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, server_default=func.now())
\ No newline at end of file
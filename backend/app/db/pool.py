@@ -0,0 +1,55 @@
+import time
+from collections import deque
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.utils.timing import percentiles
+
+
+class PoolMetrics:
+    """커넥션 checkout 대기시간 (최근 N개) / 타임아웃 수"""
+
+    def __init__(self, size: int = 2048):
+        self.waits_ms: deque = deque(maxlen=size)
+        self.checkouts = 0
+        self.timeouts = 0
+
+    def record(self, wait_ms: float):
+        self.checkouts += 1
+        self.waits_ms.append(wait_ms)
+
+
+pool_metrics = PoolMetrics()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool 과 동일, checkout 에 걸린 시간만 pool_metrics 에 기록"""
+
+    def _do_get(self):
+        t0 = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.timeouts += 1
+            raise
+        pool_metrics.record((time.perf_counter() - t0) * 1000)
+        return conn
+
+
+def pool_stats(engine) -> dict:
+    pool = engine.pool
+    stats = {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout_sec": pool.timeout(),
+    }
+    return {
+        **stats,
+        "checkouts": pool_metrics.checkouts,
+        "timeouts": pool_metrics.timeouts,
+        "wait_ms": percentiles(pool_metrics.waits_ms),
+    }
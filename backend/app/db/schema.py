@@ -0,0 +1,69 @@
+import logging
+
+from sqlalchemy import text
+
+from app.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+# =================================================
+# 기존 테이블에 대한 idempotent DDL
+# (migration 도구가 없으므로 startup / 운영 명령에서 호출)
+# =================================================
+SCHEMA_STATEMENTS = [
+    # graph_snapshots: keyframe + delta 체인
+    "ALTER TABLE graph_snapshots ADD COLUMN IF NOT EXISTS kind VARCHAR NOT NULL DEFAULT 'KEYFRAME'",
+    "ALTER TABLE graph_snapshots ADD COLUMN IF NOT EXISTS version INTEGER",
+    "ALTER TABLE graph_snapshots ADD COLUMN IF NOT EXISTS keyframe_snapshot_id UUID "
+    "REFERENCES graph_snapshots(graph_snapshot_id) ON DELETE CASCADE",
+    "CREATE INDEX IF NOT EXISTS ix_graph_snapshots_room_version ON graph_snapshots (room_id, version)",
+    "CREATE INDEX IF NOT EXISTS ix_graph_snapshots_keyframe ON graph_snapshots (keyframe_snapshot_id, version)",
+    # rooms.graph_version: 재시작해도 이어지는 room 별 graph version (기존 room 은 최신 snapshot version 부터)
+    "ALTER TABLE rooms ADD COLUMN IF NOT EXISTS graph_version INTEGER NOT NULL DEFAULT 0",
+    "UPDATE rooms SET graph_version = s.version "
+    "FROM (SELECT room_id, max(version) AS version FROM graph_snapshots GROUP BY room_id) s "
+    "WHERE rooms.room_id = s.room_id AND rooms.graph_version < s.version",
+    # broadcast_messages: NOTIFY payload 한도를 넘는 WS 프레임 본문 (PostgresBus)
+    "CREATE TABLE IF NOT EXISTS broadcast_messages ("
+    "message_id BIGSERIAL PRIMARY KEY, body TEXT NOT NULL, created_at TIMESTAMP NOT NULL DEFAULT now())",
+    "CREATE INDEX IF NOT EXISTS ix_broadcast_messages_created_at ON broadcast_messages (created_at)",
+    # pipeline_jobs: utterance phase 파이프라인 job queue
+    "CREATE TABLE IF NOT EXISTS pipeline_jobs ("
+    "job_id UUID PRIMARY KEY, "
+    "room_id UUID NOT NULL REFERENCES rooms(room_id) ON DELETE CASCADE, "
+    "utterance_id UUID REFERENCES utterances(utterance_id) ON DELETE SET NULL, "
+    "phase VARCHAR NOT NULL, text TEXT NOT NULL, "
+    "status VARCHAR NOT NULL DEFAULT 'PENDING', attempts INTEGER NOT NULL DEFAULT 0, "
+    "worker VARCHAR, error TEXT, stage_timings JSONB, "
+    "created_at TIMESTAMP NOT NULL DEFAULT now(), started_at TIMESTAMP, finished_at TIMESTAMP)",
+    "CREATE INDEX IF NOT EXISTS ix_pipeline_jobs_pending ON pipeline_jobs (created_at) WHERE status = 'PENDING'",
+    "CREATE INDEX IF NOT EXISTS ix_pipeline_jobs_room_status ON pipeline_jobs (room_id, status)",
+    "CREATE INDEX IF NOT EXISTS ix_pipeline_jobs_finished_at ON pipeline_jobs (finished_at)",
+    "CREATE INDEX IF NOT EXISTS ix_pipeline_jobs_running ON pipeline_jobs (started_at) WHERE status = 'RUNNING'",
+    "ALTER TABLE pipeline_jobs ADD COLUMN IF NOT EXISTS coalesced INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE pipeline_jobs ADD COLUMN IF NOT EXISTS batch_job_id UUID",
+    "ALTER TABLE pipeline_jobs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMP",
+    "ALTER TABLE pipeline_jobs ADD COLUMN IF NOT EXISTS committed_phases JSONB",
+    # llm_cache: LLM 응답 캐시 (LLM_CACHE_BACKEND=postgres 일 때 2차 tier)
+    "CREATE TABLE IF NOT EXISTS llm_cache ("
+    "cache_key VARCHAR PRIMARY KEY, kind VARCHAR NOT NULL, model VARCHAR NOT NULL, response JSONB NOT NULL, "
+    "created_at TIMESTAMP NOT NULL DEFAULT now(), expires_at TIMESTAMP NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS ix_llm_cache_expires_at ON llm_cache (expires_at)",
+]
+
+
+def ensure_schema() -> None:
+    """
+    statement 마다 별도 트랜잭션 (하나가 실패해도 나머지는 적용),
+    하나라도 실패하면 끝까지 시도한 뒤 첫 에러를 다시 올림 → 테이블이 빠진 채로 기동하지 않음
+    """
+    first_error: Exception | None = None
+    for stmt in SCHEMA_STATEMENTS:
+        try:
+            with engine.begin() as conn:
+                conn.execute(text(stmt))
+        except Exception as e:
+            logger.error(f"ensure_schema error: {stmt[:80]}...: {e}")
+            first_error = first_error or e
+    if first_error is not None:
+        raise first_error
@@ -4,6 +4,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base, Session
 
 from app.core.config import settings
+from app.db.pool import TimedQueuePool
 
 # =================================================
 # SQLAlchemy Engine
@@ -12,6 +13,11 @@ engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
     future=True,
+    poolclass=TimedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SEC,
+    pool_recycle=settings.DB_POOL_RECYCLE_SEC,
 )
 
 # =================================================
@@ -1,16 +1,25 @@
 from fastapi import FastAPI 
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-import httpx
 import logging
 
-from app.storage.minio import ensure_bucket
+from app.storage.object_store import object_store
+from app.core.broadcast_bus import broadcast_bus
+from app.core.config import settings
+from app.services.image_upload import image_upload_pool
+from app.services.pipeline_worker import pipeline_worker_pool
+from app.services.llm_service import llm_service
+from app.services.asset_proxy import asset_proxy
+from app.services.asset_cache import asset_cache
+from app.db.schema import ensure_schema
 from app.api.rooms import router as room_router
 from app.api.ws import router as ws_router
 from app.api.utterances import router as utter_router
 from app.api.select_2d import router as select_2d_router
 from app.api.category import router as category_router
 from app.api.generate_3d import router as generate_3d_router
+from app.api.graph import router as graph_router
+from app.api.metrics import router as metrics_router
+from app.api.assets import router as assets_router
 
 # 로그 설정
 logging.basicConfig(level=logging.INFO)
@@ -31,39 +40,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# =================================================
-# 이미지 서빙 프록시 (Docker 환경용 최종 수정)
-# =================================================
-@app.get("/nodexr-assets/{file_path:path}")
-async def proxy_minio(file_path: str):
-    """
-    유니티의 요청을 받아 MinIO 컨테이너(9000번 포트)에서 이미지를 가져옵니다.
-    """
-    # Docker 네트워크 내부 주소인 'minio'를 사용합니다.
-    base_minio_url = "http://minio:9000" 
-    target_url = f"{base_minio_url}/nodexr-assets/{file_path}"
-    
-    logger.info(f"🔍 Proxy Request to: {target_url}")
-
-    async with httpx.AsyncClient() as client:
-        try:
-            resp = await client.get(target_url, timeout=10.0)
-            
-            if resp.status_code != 200:
-                logger.error(f"❌ MinIO Error: {resp.status_code} for {target_url}")
-                return {"error": "File not found in MinIO"}, 404
-            
-            return StreamingResponse(
-                resp.iter_bytes(), 
-                media_type=resp.headers.get("content-type", "image/png")
-            )
-        except Exception as e:
-            logger.error(f"🔥 Proxy Connection Failed: {str(e)}")
-            return {"error": "MinIO server unreachable"}, 500
-
 @app.on_event("startup")
 def startup():
-    ensure_bucket()
+    ensure_schema()
+
+@app.on_event("startup")
+async def ensure_object_bucket():
+    try:
+        await object_store.ensure_bucket()
+    except Exception as e:
+        logger.error(f"Object store ensure_bucket error: {e}")
+
+@app.on_event("startup")
+async def start_broadcast_bus():
+    await broadcast_bus.start()
+
+@app.on_event("startup")
+def start_asset_cache():
+    # 디스크 tier: 이 프로세스 디렉토리를 비우고 종료된 worker 디렉토리 정리
+    asset_cache.start()
+
+@app.on_event("startup")
+async def start_image_uploads():
+    # 이전 실행이 spool 에 남긴 업로드 재시도
+    await image_upload_pool.start()
+
+@app.on_event("startup")
+async def start_pipeline_workers():
+    # external 모드면 python -m app.worker 가 실행
+    if settings.PIPELINE_WORKER_MODE == "inprocess":
+        await pipeline_worker_pool.start()
+
+@app.on_event("shutdown")
+async def stop_pipeline_workers():
+    if settings.PIPELINE_WORKER_MODE == "inprocess":
+        await pipeline_worker_pool.stop()
+
+@app.on_event("shutdown")
+async def stop_broadcast_bus():
+    await broadcast_bus.stop()
+
+@app.on_event("shutdown")
+async def close_llm_client():
+    await llm_service.aclose()
+
+@app.on_event("shutdown")
+async def close_asset_proxy():
+    await asset_proxy.aclose()
+
+@app.on_event("shutdown")
+async def drain_image_uploads():
+    await image_upload_pool.drain(settings.IMAGE_UPLOAD_DRAIN_TIMEOUT_SEC)
+
+@app.on_event("shutdown")
+def stop_object_store():
+    object_store.shutdown()
 
 # Router 등록
 app.include_router(room_router)
@@ -71,4 +102,7 @@ app.include_router(ws_router)
 app.include_router(utter_router)
 app.include_router(select_2d_router)
 app.include_router(category_router)
-app.include_router(generate_3d_router)
\ No newline at end of file
+app.include_router(generate_3d_router)
+app.include_router(graph_router)
+app.include_router(metrics_router)
+app.include_router(assets_router)
\ No newline at end of file
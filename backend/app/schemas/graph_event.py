@@ -4,6 +4,13 @@ from pydantic import BaseModel
 
 NodeType = Literal["CATEGORY", "ASSET"]
 
+# GRAPH_DELTA : 추가/변경된 노드·엣지만 전송 (version 단위 patch)
+# GRAPH_STATE : full graph_state (요청 시에만 전송)
+GraphEventType = Literal["GRAPH_DELTA", "GRAPH_STATE"]
+
+# delta 를 만든 파이프라인 단계
+GraphEventCause = Literal["NODE_KEYWORD_UPDATE", "NODE_IMAGE_UPDATE"]
+
 class GraphNodeDTO(BaseModel):
     node_id: UUID
     node_type: NodeType
@@ -22,7 +29,21 @@ class GraphStateDTO(BaseModel):
     nodes: List[GraphNodeDTO]
     edges: List[GraphEdgeDTO]
 
+class GraphDeltaDTO(BaseModel):
+    graph_snapshot_id: Optional[UUID] = None
+    nodes: List[GraphNodeDTO] = []   # 추가/변경된 노드 (node_id 기준 upsert)
+    edges: List[GraphEdgeDTO] = []   # 추가된 엣지 (edge_id 기준 upsert)
+
 class GraphEventDTO(BaseModel):
-    event: str
+    """
+    version 은 room 단위로 단조 증가.
+    클라이언트는 base_version == 자신의 version 일 때만 delta 를 적용하고,
+    다르면(gap) GRAPH_SYNC 를 요청해 GRAPH_STATE 로 다시 맞춘다.
+    """
+    event: GraphEventType
+    version: int
+    base_version: Optional[int] = None           # GRAPH_DELTA
+    cause: Optional[GraphEventCause] = None      # GRAPH_DELTA
     core_img_url: Optional[str] = None
-    graph_state: GraphStateDTO
\ No newline at end of file
+    delta: Optional[GraphDeltaDTO] = None        # GRAPH_DELTA
+    graph_state: Optional[GraphStateDTO] = None  # GRAPH_STATE
@@ -0,0 +1,380 @@
+import asyncio
+import hashlib
+import logging
+import mimetypes
+import mmap
+import os
+import shutil
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterator, Mapping, Tuple
+
+from fastapi.responses import Response, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.services.asset_proxy import asset_proxy, cache_control_for
+from app.storage.object_store import object_store
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedAsset:
+    object_key: str
+    content_type: str
+    etag: str
+    size: int
+    data: bytes | None = None  # 메모리 tier
+    path: str | None = None    # 디스크 tier (mmap 으로 읽음)
+
+
+class _Unsatisfiable(Exception):
+    pass
+
+
+def _parse_range(value: str, size: int) -> Tuple[int, int] | None:
+    """
+    'bytes=a-b' / 'bytes=a-' / 'bytes=-n' 단일 범위만 → (start, end) (end 포함).
+    형식이 다르거나 여러 범위면 None (전체 200 응답), 범위가 object 밖이면 _Unsatisfiable (416).
+    """
+    unit, _, spec = value.partition("=")
+    start_s, sep, end_s = spec.strip().partition("-")
+    if unit.strip().lower() != "bytes" or "," in spec or not sep:
+        return None
+    if not (start_s.isdigit() or start_s == "") or not (end_s.isdigit() or end_s == ""):
+        return None
+
+    if start_s == "":
+        if not end_s or int(end_s) == 0:
+            raise _Unsatisfiable()
+        return max(size - int(end_s), 0), size - 1
+
+    start = int(start_s)
+    end = min(int(end_s), size - 1) if end_s else size - 1
+    if start >= size or start > end:
+        raise _Unsatisfiable()
+    return start, end
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _prepare_disk_dir(root: str) -> str:
+    """
+    디스크 tier 디렉토리 = <root>/<pid> (worker 프로세스마다 따로, 비운 상태로 시작).
+    디스크 tier index 는 메모리에만 있으므로 이전 실행이 남긴 파일은 세지도 evict 하지도 못함 → 시작할 때 정리:
+    같은 pid 디렉토리, 이미 종료된 프로세스의 디렉토리, root 에 바로 쓰인 예전 파일.
+    """
+    os.makedirs(root, exist_ok=True)
+    pid = os.getpid()
+    for name in os.listdir(root):
+        path = os.path.join(root, name)
+        if name.isdigit() and int(name) != pid and _pid_alive(int(name)):
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    path = os.path.join(root, str(pid))
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+class HotAssetCache:
+    """
+    /nodexr-assets 프록시 앞단의 byte 예산 LRU 캐시 (immutable = uuid 파일명 object 만).
+    - 한 room 의 헤드셋 N 대가 방금 만든 이미지 3장을 동시에 받아도 MinIO 조회는 object 당 1번 (single-flight)
+    - 새로 업로드한 2D 이미지는 업로드 시점에 바로 넣어 둠 (put) → 첫 요청부터 hit
+      (업로드한 프로세스에만 들어감: external worker 모드면 API 프로세스는 첫 miss 때 적재)
+    - ASSET_CACHE_DISK_DIR 이 있으면 디스크 tier: 메모리에 넣을 때 같이 쓰고(write-through),
+      메모리에서 밀려난 뒤에는 mmap 으로 읽어서 응답 (프로세스별 하위 디렉토리, start() 에서 비움 · start 전에는 메모리만)
+    - If-None-Match → 304, Range → 206 을 캐시에서 바로 처리
+    """
+
+    def __init__(
+        self,
+        max_bytes: int,
+        max_object_bytes: int,
+        disk_dir: str | None = None,
+        disk_max_bytes: int = 0,
+    ):
+        self.max_bytes = max_bytes
+        self.max_object_bytes = max_object_bytes
+        self.disk_root = disk_dir
+        self.disk_dir: str | None = None  # start() 에서 <disk_root>/<pid>
+        self.disk_max_bytes = disk_max_bytes
+
+        self._memory: "OrderedDict[str, CachedAsset]" = OrderedDict()
+        self._disk: "OrderedDict[str, CachedAsset]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._loading: Dict[str, asyncio.Future] = {}  # event loop 에서만
+        self._oversized: "OrderedDict[str, None]" = OrderedDict()  # 한 번 크기 초과였던 key 는 바로 프록시로
+        self._lock = threading.Lock()  # put 은 이미지 업로드(threadpool)에서도 호출
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.uncacheable = 0
+        self.pushes = 0
+        self.evictions = 0
+        self.bytes_served = 0
+        self.bytes_fetched = 0
+
+    @staticmethod
+    def cacheable(object_key: str) -> bool:
+        return settings.ASSET_CACHE_ENABLED and cache_control_for(object_key) != "no-cache"
+
+    # =================================================
+    # 조회 / 적재
+    # =================================================
+    def lookup(self, object_key: str) -> CachedAsset | None:
+        with self._lock:
+            entry = self._memory.get(object_key)
+            if entry is not None:
+                self._memory.move_to_end(object_key)
+                self.memory_hits += 1
+                return entry
+            entry = self._disk.get(object_key)
+            if entry is not None:
+                self._disk.move_to_end(object_key)
+                self.disk_hits += 1
+                return entry
+        return None
+
+    async def get(self, object_key: str) -> CachedAsset | None:
+        """
+        hit 이면 바로, miss 면 MinIO 에서 1번만 받아서 적재.
+        object 가 없거나 max_object_bytes 보다 크면 None (호출한 쪽이 프록시로 흘려보냄).
+        """
+        entry = self.lookup(object_key)
+        if entry is not None or object_key in self._oversized:
+            return entry
+
+        pending = self._loading.get(object_key)
+        if pending is not None:
+            with self._lock:
+                self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        with self._lock:
+            self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._loading[object_key] = future
+        entry = None
+        try:
+            entry = await self._fetch(object_key)
+        except Exception as e:
+            logger.error(f"[ASSET_CACHE] fetch failed {object_key}: {e}")
+        finally:
+            future.set_result(entry)
+            self._loading.pop(object_key, None)
+        return entry
+
+    async def _fetch(self, object_key: str) -> CachedAsset | None:
+        if settings.OBJECT_STORE_BACKEND == "local":
+            return await self._fetch_local(object_key)
+
+        upstream = await asset_proxy.open("GET", object_key, {})
+        try:
+            length = int(upstream.headers.get("content-length") or 0)
+            if upstream.status_code != 200:
+                return None
+            if not length or length > self.max_object_bytes:
+                self._mark_oversized(object_key)
+                return None
+            data = await upstream.aread()
+        finally:
+            await upstream.aclose()
+
+        with self._lock:
+            self.bytes_fetched += len(data)
+        return await run_in_threadpool(
+            self._store,
+            object_key,
+            data,
+            upstream.headers.get("content-type", "application/octet-stream"),
+            upstream.headers.get("etag"),
+        )
+
+    async def _fetch_local(self, object_key: str) -> CachedAsset | None:
+        try:
+            length = os.path.getsize(object_store.backend.path_for(object_key))
+        except (OSError, ValueError):
+            return None
+        if not length or length > self.max_object_bytes:
+            self._mark_oversized(object_key)
+            return None
+
+        data = await object_store.get(object_key)
+        with self._lock:
+            self.bytes_fetched += len(data)
+        content_type = mimetypes.guess_type(object_key)[0] or "application/octet-stream"
+        return await run_in_threadpool(self._store, object_key, data, content_type, None)
+
+    def _mark_oversized(self, object_key: str):
+        with self._lock:
+            self.uncacheable += 1
+        self._oversized[object_key] = None
+        while len(self._oversized) > 1024:
+            self._oversized.popitem(last=False)
+
+    def put(self, object_key: str, data: bytes, content_type: str, etag: str | None = None):
+        """업로드 직후 호출 (threadpool). immutable key 가 아니면 무시."""
+        if not self.cacheable(object_key) or len(data) > self.max_object_bytes:
+            return
+        self._store(object_key, data, content_type, etag)
+        with self._lock:
+            self.pushes += 1
+
+    def _store(self, object_key: str, data: bytes, content_type: str, etag: str | None) -> CachedAsset:
+        # 단일 PUT object 의 MinIO ETag 와 같은 값 (md5)
+        etag = etag or f'"{hashlib.md5(data).hexdigest()}"'
+        entry = CachedAsset(object_key=object_key, content_type=content_type, etag=etag, size=len(data), data=data)
+        path = self._write_disk(object_key, data)
+
+        with self._lock:
+            old = self._memory.pop(object_key, None)
+            if old is not None:
+                self._memory_bytes -= old.size
+            self._memory[object_key] = entry
+            self._memory_bytes += entry.size
+            while self._memory_bytes > self.max_bytes and len(self._memory) > 1:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted.size
+                self.evictions += 1
+
+            if path is not None and object_key not in self._disk:
+                self._disk[object_key] = CachedAsset(
+                    object_key=object_key, content_type=content_type, etag=etag, size=len(data), path=path,
+                )
+                self._disk_bytes += len(data)
+            expired = []
+            while self._disk_bytes > self.disk_max_bytes and len(self._disk) > 1:
+                _, evicted = self._disk.popitem(last=False)
+                self._disk_bytes -= evicted.size
+                expired.append(evicted.path)
+
+        for expired_path in expired:
+            try:
+                os.remove(expired_path)
+            except OSError:
+                pass
+        return entry
+
+    def _write_disk(self, object_key: str, data: bytes) -> str | None:
+        if not self.disk_dir:
+            return None
+        path = os.path.join(self.disk_dir, hashlib.sha1(object_key.encode()).hexdigest())
+        if os.path.exists(path):
+            return path
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+            return path
+        except OSError as e:
+            logger.error(f"[ASSET_CACHE] disk write failed {object_key}: {e}")
+            return None
+
+    # =================================================
+    # 응답
+    # =================================================
+    def respond(self, entry: CachedAsset, request_headers: Mapping[str, str], head: bool = False) -> Response:
+        headers = {
+            "content-type": entry.content_type,
+            "etag": entry.etag,
+            "accept-ranges": "bytes",
+            "cache-control": cache_control_for(entry.object_key),
+        }
+
+        if_none_match = request_headers.get("if-none-match")
+        if if_none_match and (if_none_match.strip() == "*" or entry.etag in if_none_match):
+            return Response(status_code=304, headers=headers)
+
+        start, end, status = 0, entry.size - 1, 200
+        range_header = request_headers.get("range")
+        if_range = request_headers.get("if-range")
+        if range_header and (not if_range or if_range == entry.etag):
+            try:
+                byte_range = _parse_range(range_header, entry.size)
+            except _Unsatisfiable:
+                headers["content-range"] = f"bytes */{entry.size}"
+                return Response(status_code=416, headers=headers)
+            if byte_range is not None:
+                (start, end), status = byte_range, 206
+                headers["content-range"] = f"bytes {start}-{end}/{entry.size}"
+
+        length = end - start + 1
+        headers["content-length"] = str(length)
+        if head:
+            return Response(status_code=status, headers=headers)
+
+        with self._lock:
+            self.bytes_served += length
+        if entry.data is not None:
+            body = entry.data if status == 200 else entry.data[start:end + 1]
+            return Response(content=body, status_code=status, headers=headers)
+        # 미리 열어 두면 그 사이 디스크 eviction 으로 파일이 지워져도 끝까지 읽힘 (OSError 는 호출한 쪽에서 프록시로)
+        f = open(entry.path, "rb")
+        return StreamingResponse(self._iter_disk(f, start, end), status_code=status, headers=headers)
+
+    @staticmethod
+    def _iter_disk(f, start: int, end: int) -> Iterator[bytes]:
+        # sync iterator → starlette 가 threadpool 에서 chunk 단위로 읽음 (page cache 에서 바로)
+        with f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset in range(start, end + 1, settings.ASSET_PROXY_CHUNK_SIZE):
+                yield mm[offset:min(offset + settings.ASSET_PROXY_CHUNK_SIZE, end + 1)]
+
+    def start(self):
+        """프로세스 startup hook (API / worker) 에서 1회: 디스크 tier 디렉토리 준비 + 종료된 worker 디렉토리 정리"""
+        if self.disk_root and self.disk_dir is None:
+            self.disk_dir = _prepare_disk_dir(self.disk_root)
+            logger.info(f"[ASSET_CACHE] disk tier dir={self.disk_dir}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses + self.coalesced
+            return {
+                "enabled": settings.ASSET_CACHE_ENABLED,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "max_bytes": self.max_bytes,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_bytes,
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                # MinIO 를 직접 조회하지 않고 응답한 비율 (single-flight 로 기다린 요청 포함)
+                "hit_ratio": round((hits + self.coalesced) / lookups, 4) if lookups else None,
+                "uncacheable": self.uncacheable,
+                "pushes": self.pushes,
+                "evictions": self.evictions,
+                "bytes_served": self.bytes_served,
+                "bytes_fetched": self.bytes_fetched,
+            }
+
+
+asset_cache = HotAssetCache(
+    max_bytes=settings.ASSET_CACHE_MAX_BYTES,
+    max_object_bytes=settings.ASSET_CACHE_MAX_OBJECT_BYTES,
+    disk_dir=settings.ASSET_CACHE_DISK_DIR,
+    disk_max_bytes=settings.ASSET_CACHE_DISK_MAX_BYTES,
+)
@@ -0,0 +1,110 @@
+import logging
+import threading
+from collections import Counter
+from pathlib import PurePosixPath
+from typing import AsyncIterator, Dict
+from uuid import UUID
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 클라이언트 → MinIO 로 그대로 넘기는 요청 헤더 (부분 요청 / 조건부 GET)
+FORWARD_REQUEST_HEADERS = ("range", "if-range", "if-none-match", "if-modified-since")
+# MinIO → 클라이언트 로 그대로 넘기는 응답 헤더
+FORWARD_RESPONSE_HEADERS = (
+    "content-type", "content-length", "content-range", "accept-ranges", "etag", "last-modified",
+)
+# 클라이언트에 그대로 돌려주는 MinIO 상태 코드 (나머지는 404 / 502 로)
+PASS_THROUGH_STATUS = (200, 206, 304, 412, 416)
+
+
+def is_immutable_key(object_key: str) -> bool:
+    """
+    업로드 경로(object_store.new_asset_key / meshy GLB)는 항상 uuid4 파일명으로 새 object 를 만들고 덮어쓰지 않음
+    → 파일명이 UUID 면 내용이 바뀌지 않는 key
+    """
+    try:
+        UUID(PurePosixPath(object_key).stem)
+        return True
+    except ValueError:
+        return False
+
+
+def cache_control_for(object_key: str) -> str:
+    if is_immutable_key(object_key):
+        return f"public, max-age={settings.ASSET_IMMUTABLE_MAX_AGE_SEC}, immutable"
+    return "no-cache"  # 매번 ETag 로 재검증 (304)
+
+
+class AssetProxy:
+    """
+    /nodexr-assets/... → MinIO 프록시용 공유 HTTP 클라이언트.
+    - 커넥션 풀 1개를 프로세스 전체가 공유 (요청마다 AsyncClient / TCP 연결을 만들지 않음)
+    - 응답 body 는 메모리에 모으지 않고 chunk 단위로 그대로 흘려보냄
+    - Range / If-None-Match 등은 MinIO 로 넘겨서 206 / 304 를 MinIO 가 판단
+    """
+
+    def __init__(self, upstream: str, client: httpx.AsyncClient | None = None):
+        self.upstream = upstream.rstrip("/")
+        self.client = client or httpx.AsyncClient(
+            timeout=settings.ASSET_PROXY_TIMEOUT_SEC,
+            limits=httpx.Limits(
+                max_connections=settings.ASSET_PROXY_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.ASSET_PROXY_MAX_CONNECTIONS,
+            ),
+        )
+        self._lock = threading.Lock()
+        self.status_counts: Counter = Counter()
+        self.bytes_streamed = 0
+        self.upstream_errors = 0
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def open(self, method: str, object_key: str, request_headers: Dict[str, str]) -> httpx.Response:
+        """
+        MinIO 요청을 보내고 헤더까지만 받은 응답 (body 는 아직 안 읽음).
+        호출한 쪽이 stream() 으로 다 읽거나 aclose() 해야 커넥션이 풀로 돌아감.
+        """
+        headers = {
+            name: request_headers[name]
+            for name in FORWARD_REQUEST_HEADERS
+            if name in request_headers
+        }
+        request = self.client.build_request(method, f"{self.upstream}/{object_key}", headers=headers)
+        try:
+            response = await self.client.send(request, stream=True)
+        except httpx.HTTPError:
+            with self._lock:
+                self.upstream_errors += 1
+            raise
+        with self._lock:
+            self.status_counts[response.status_code] += 1
+        return response
+
+    async def stream(self, response: httpx.Response) -> AsyncIterator[bytes]:
+        """MinIO body 를 chunk 단위로 전달, 클라이언트가 끊겨도 커넥션은 반납"""
+        sent = 0
+        try:
+            async for chunk in response.aiter_raw(settings.ASSET_PROXY_CHUNK_SIZE):
+                sent += len(chunk)
+                yield chunk
+        finally:
+            await response.aclose()
+            with self._lock:
+                self.bytes_streamed += sent
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "upstream": self.upstream,
+                "status_counts": dict(self.status_counts),
+                "bytes_streamed": self.bytes_streamed,
+                "upstream_errors": self.upstream_errors,
+            }
+
+
+asset_proxy = AssetProxy(upstream=settings.MINIO_PROXY_UPSTREAM)
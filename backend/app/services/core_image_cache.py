@@ -0,0 +1,150 @@
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Dict, Tuple
+from uuid import UUID
+
+from google.genai import types
+from PIL import Image
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.storage.object_store import object_store, to_object_key
+from app.utils.image_format import sniff_image_format
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CoreImage:
+    asset_id: UUID
+    img_url: str
+    data: bytes       # Gemini 에 그대로 보내는 인코딩된 bytes
+    mime_type: str
+    part: types.Part  # 카테고리 이미지 n 장 요청이 같이 쓰는 Part
+
+
+class CoreImageCache:
+    """
+    room 별 CURR_2D_CORE 이미지 캐시 (asset_id 기준).
+    - 카테고리 이미지 생성이 MinIO 왕복 / PIL 디코딩 없이 바로 Gemini 요청을 시작하도록
+      인코딩된 bytes 와 types.Part 를 들고 있음
+    - /api/2d/select 에서 invalidate + 새 core 를 미리 적재 (warm)
+    - 다른 프로세스(external worker)는 select 를 못 보지만, 조회 시 asset_id 가 다르면 다시 적재하므로 stale 없음
+    - 같은 room / asset 을 동시에 적재하면 MinIO 조회는 1번 (single-flight)
+      적재 실패는 기다리던 쪽에도 같은 예외로 전달, 적재하던 쪽이 취소되면 기다리던 쪽이 다시 적재
+    """
+
+    def __init__(self, max_rooms: int):
+        self.max_rooms = max_rooms
+        self._entries: "OrderedDict[UUID, CoreImage]" = OrderedDict()
+        self._loading: Dict[Tuple[UUID, UUID], asyncio.Future] = {}  # event loop 에서만
+        self._lock = threading.Lock()  # select endpoint (threadpool) 의 invalidate 와 공유
+
+        self.hits = 0
+        self.misses = 0
+        self.warms = 0
+        self.invalidations = 0
+        self.load_errors = 0
+
+    async def get(self, room_id: UUID, asset_id: UUID, img_url: str) -> CoreImage:
+        with self._lock:
+            entry = self._entries.get(room_id)
+            if entry is not None and entry.asset_id == asset_id and entry.img_url == img_url:
+                self._entries.move_to_end(room_id)
+                self.hits += 1
+                return entry
+            self.misses += 1
+        return await self._load(room_id, asset_id, img_url)
+
+    async def warm(self, room_id: UUID, asset_id: UUID, img_url: str):
+        """새 core 선택 직후 미리 적재 (BackgroundTasks 에서 호출, 실패하면 다음 get 에서 다시 적재)"""
+        with self._lock:
+            self.warms += 1
+            entry = self._entries.get(room_id)
+            if entry is not None and entry.asset_id == asset_id:
+                return
+        try:
+            await self._load(room_id, asset_id, img_url)
+        except Exception:
+            pass  # _load 에서 기록됨
+
+    def invalidate(self, room_id: UUID):
+        with self._lock:
+            if self._entries.pop(room_id, None) is not None:
+                self.invalidations += 1
+
+    async def _load(self, room_id: UUID, asset_id: UUID, img_url: str) -> CoreImage:
+        key = (room_id, asset_id)
+        while (pending := self._loading.get(key)) is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise  # 기다리던 쪽 자신이 취소됨
+                # 적재하던 쪽이 취소됨 → 이어서 직접 적재
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            data = await object_store.get(to_object_key(img_url))
+            entry = await run_in_threadpool(self._build, asset_id, img_url, data)
+            with self._lock:
+                self._entries[room_id] = entry
+                self._entries.move_to_end(room_id)
+                while len(self._entries) > self.max_rooms:
+                    self._entries.popitem(last=False)
+            logger.info(f"[CORE_IMAGE] loaded room={room_id} asset={asset_id} bytes={len(entry.data)}")
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            with self._lock:
+                self.load_errors += 1
+            logger.error(f"[CORE_IMAGE] load failed room={room_id} asset={asset_id}: {e}")
+            future.set_exception(e)
+            future.exception()  # 기다리는 쪽이 없어도 "never retrieved" 경고가 남지 않도록
+            raise
+        else:
+            future.set_result(entry)
+        finally:
+            self._loading.pop(key, None)
+        return entry
+
+    @staticmethod
+    def _build(asset_id: UUID, img_url: str, data: bytes) -> CoreImage:
+        fmt = sniff_image_format(data)
+        if fmt is None:
+            # 헤더로 포맷을 모르면 한 번만 PNG 로 변환해서 보관
+            buf = BytesIO()
+            Image.open(BytesIO(data)).save(buf, format="PNG")
+            data, fmt = buf.getvalue(), ("image/png", "png")
+        mime_type = fmt[0]
+        return CoreImage(
+            asset_id=asset_id,
+            img_url=img_url,
+            data=data,
+            mime_type=mime_type,
+            part=types.Part.from_bytes(data=data, mime_type=mime_type),
+        )
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "rooms": len(self._entries),
+                "max_rooms": self.max_rooms,
+                "bytes": sum(len(e.data) for e in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "warms": self.warms,
+                "invalidations": self.invalidations,
+                "load_errors": self.load_errors,
+            }
+
+
+core_image_cache = CoreImageCache(max_rooms=settings.CORE_IMAGE_CACHE_MAX_ROOMS)
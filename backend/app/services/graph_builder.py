@@ -1,57 +1,102 @@
 from uuid import UUID
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
 from app.db.models.node import Node
 from app.db.models.edge import Edge
 from app.db.models.asset import Asset
 from app.db.models.category_detail import CategoryDetail
 from app.utils.asset_url import build_asset_url
 
-def build_graph_state(db: Session, graph_snapshot_id: UUID | None, room_id: UUID) -> dict:
-    # CATEGORY 노드: CategoryDetail에서 label/order 구성
-    # ASSET 노드: Asset에서 img_url, parent_category_id 구성 (parent는 CategoryDetail.node_id)
+
+# =================================================
+# graph_state 원소 (full state / delta 공용)
+# =================================================
+def category_node_item(node_id: UUID, label: str | None, order: int | None) -> dict:
+    return {
+        "node_id": node_id,
+        "node_type": "CATEGORY",
+        "label": label if label is not None else "",
+        "order": order if order is not None else 0,
+    }
+
+
+def asset_node_item(node_id: UUID, img_url: str | None, parent_category_id: UUID | None) -> dict:
+    return {
+        "node_id": node_id,
+        "node_type": "ASSET",
+        "img_url": build_asset_url(img_url),
+        "parent_category_id": parent_category_id,
+    }
+
+
+def edge_item(edge_id: UUID, from_node_id: UUID, to_node_id: UUID) -> dict:
+    return {
+        "edge_id": edge_id,
+        "from_node_id": from_node_id,
+        "to_node_id": to_node_id,
+    }
+
+
+def load_room_nodes(db: Session, room_id: UUID) -> list[dict]:
+    """
+    room 의 CATEGORY / ASSET 노드를 쿼리 1번으로 구성.
+    - CATEGORY: CategoryDetail 에서 label/order
+    - ASSET: Asset 에서 img_url, parent_category_id (parent 는 CategoryDetail.node_id)
+    """
+    ParentDetail = aliased(CategoryDetail)
+
+    rows = (
+        db.query(
+            Node.node_id,
+            Node.node_type,
+            CategoryDetail.detail_text,
+            CategoryDetail.order,
+            Asset.img_url,
+            ParentDetail.node_id,
+        )
+        .outerjoin(CategoryDetail, CategoryDetail.node_id == Node.node_id)
+        .outerjoin(Asset, Asset.node_id == Node.node_id)
+        .outerjoin(ParentDetail, ParentDetail.category_detail_id == Asset.category_detail_id)
+        .filter(Node.room_id == room_id)
+        # 노드 하나에 detail 이 여러 개면 order 가 가장 큰(마지막으로 추가된) detail 이 먼저 오도록
+        # (기존 구현의 node_id → detail dict 에서 마지막 detail 이 남던 것과 같은 label)
+        .order_by(Node.node_id, CategoryDetail.order.desc(), Asset.asset_id)
+        .all()
+    )
+
     nodes_out = []
-    edges_out = []
-
-    # category node label mapping
-    details = db.query(CategoryDetail).join(Node, Node.node_id == CategoryDetail.node_id)\
-        .filter(Node.room_id == room_id).all()
-
-    detail_by_node = {d.node_id: d for d in details}
-
-    # nodes (CATEGORY + ASSET)
-    nodes = db.query(Node).filter(Node.room_id == room_id).all()
-    for n in nodes:
-        if n.node_type == "CATEGORY":
-            d = detail_by_node.get(n.node_id)
-            nodes_out.append({
-                "node_id": n.node_id,
-                "node_type": "CATEGORY",
-                "label": d.detail_text if d else "",
-                "order": d.order if d else 0,
-            })
+    seen = set()
+    for node_id, node_type, label, order, img_url, parent_node_id in rows:
+        # 노드 하나에 detail/asset 이 여러 개면 join 결과가 중복됨 → 정렬상 첫 행만 사용
+        if node_id in seen:
+            continue
+        seen.add(node_id)
+
+        if node_type == "CATEGORY":
+            nodes_out.append(category_node_item(node_id, label, order))
         else:
-            a = db.query(Asset).filter(Asset.node_id == n.node_id).first()
-            parent_category_id = None
-            if a:
-                parent_detail = db.query(CategoryDetail).filter(CategoryDetail.category_detail_id == a.category_detail_id).first()
-                parent_category_id = parent_detail.node_id if parent_detail else None
-            nodes_out.append({
-                "node_id": n.node_id,
-                "node_type": "ASSET",
-                "img_url": build_asset_url(a.img_url) if a else None,
-                "parent_category_id": parent_category_id,
-            })
-
-    edges = db.query(Edge).all()
-    for e in edges:
-        edges_out.append({
-            "edge_id": e.edge_id,
-            "from_node_id": e.from_node_id,
-            "to_node_id": e.to_node_id,
-        })
+            nodes_out.append(asset_node_item(node_id, img_url, parent_node_id))
+
+    return nodes_out
 
+
+def load_room_edges(db: Session, room_id: UUID) -> list[dict]:
+    """
+    room 에 속한 edge 만 조회 (from 노드의 room 기준).
+    """
+    rows = (
+        db.query(Edge.edge_id, Edge.from_node_id, Edge.to_node_id)
+        .join(Node, Node.node_id == Edge.from_node_id)
+        .filter(Node.room_id == room_id)
+        .all()
+    )
+
+    return [edge_item(*row) for row in rows]
+
+
+def build_graph_state(db: Session, graph_snapshot_id: UUID | None, room_id: UUID) -> dict:
+    # room 크기와 무관하게 쿼리 2번 (nodes + edges)
     return {
         "graph_snapshot_id": graph_snapshot_id,
-        "nodes": nodes_out,
-        "edges": edges_out
-    }
\ No newline at end of file
+        "nodes": load_room_nodes(db, room_id),
+        "edges": load_room_edges(db, room_id),
+    }
@@ -0,0 +1,171 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable
+from uuid import UUID
+
+from sqlalchemy.orm import Session
+
+from app.core.broadcast_bus import BroadcastBus, broadcast_bus
+from app.core.config import settings
+from app.db.models.asset import Asset
+from app.db.models.node import Node
+from app.db.models.room import Room
+from app.services.graph_builder import load_room_nodes, load_room_edges
+
+logger = logging.getLogger(__name__)
+
+
+class RoomGraph:
+    """
+    room 하나의 materialized graph (nodes / edges + core).
+    nodes, edges 는 id → graph_state 원소 dict 로 insert 순서를 유지한다.
+    """
+
+    def __init__(self, room_id: UUID):
+        self.room_id = room_id
+        self.nodes: Dict[UUID, dict] = {}
+        self.edges: Dict[UUID, dict] = {}
+        self.core_node_id: UUID | None = None
+        self.version = 0               # 로드 시점의 rooms.graph_version
+        # graph_snapshots 체인 상태 (app.services.graph_snapshots)
+        self.last_snapshot = None      # 이 프로세스가 마지막으로 기록한 SnapshotBase
+        self.last_access = time.monotonic()
+
+    def apply(self, nodes: Iterable[dict] = (), edges: Iterable[dict] = ()):
+        for n in nodes:
+            self.nodes[n["node_id"]] = n
+        for e in edges:
+            self.edges[e["edge_id"]] = e
+
+    @property
+    def core_img_url(self) -> str | None:
+        core = self.nodes.get(self.core_node_id) if self.core_node_id else None
+        return core.get("img_url") if core else None
+
+    def to_state(self, graph_snapshot_id: UUID | None = None) -> dict:
+        return {
+            "graph_snapshot_id": graph_snapshot_id,
+            "nodes": list(self.nodes.values()),
+            "edges": list(self.edges.values()),
+        }
+
+
+class GraphCache:
+    """
+    프로세스 내 room graph 캐시.
+    - 최초 접근 시 DB 에서 한 번 로드 (lazy)
+    - 파이프라인 / 2D select / category select 가 커밋 후 write-through 로 갱신
+    - LRU(max_rooms) 또는 idle TTL 초과 시 evict → 다음 접근에서 다시 로드
+    파이프라인 DB 구간(threadpool)과 event loop 양쪽에서 접근하므로 room 목록 / core 변경은 lock 안에서.
+    (room 하나의 RoomGraph 는 room_serial 로 파이프라인 하나만 갱신)
+    노드 / 엣지는 GRAPH_DELTA 로 다른 worker 캐시에도 반영되지만 core 변경 같은 delta 없는 변경은
+    publish_invalidate() 로 bus 를 통해 다른 worker 의 캐시에서 room 을 내림 (다음 접근에서 DB 재로드).
+    """
+
+    CHANNEL = "graph_cache"
+
+    def __init__(self, max_rooms: int, idle_ttl_sec: float, bus: BroadcastBus = broadcast_bus):
+        self.max_rooms = max_rooms
+        self.idle_ttl_sec = idle_ttl_sec
+        self._rooms: "OrderedDict[UUID, RoomGraph]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bus = bus
+        bus.set_channel_handler(self.CHANNEL, self._on_bus_message)
+
+    def get(self, db: Session, room_id: UUID) -> RoomGraph:
+        with self._lock:
+            self._evict_idle()
+            graph = self._rooms.get(room_id)
+
+        if graph is None:
+            # DB 로드는 lock 밖에서 (다른 room 접근을 막지 않도록)
+            loaded = self._load(db, room_id)
+            with self._lock:
+                graph = self._rooms.setdefault(room_id, loaded)
+                self._evict_lru()
+
+        with self._lock:
+            if room_id in self._rooms:
+                self._rooms.move_to_end(room_id)
+        graph.last_access = time.monotonic()
+        return graph
+
+    def peek(self, room_id: UUID) -> RoomGraph | None:
+        with self._lock:
+            return self._rooms.get(room_id)
+
+    def apply(
+        self,
+        room_id: UUID,
+        nodes: Iterable[dict] = (),
+        edges: Iterable[dict] = (),
+    ) -> RoomGraph | None:
+        # 커밋된 변경만 반영 (롤백될 수 있는 행이 캐시에 남지 않도록).
+        # 미로드 room 은 건너뜀 → 다음 get 에서 커밋된 행을 그대로 로드, 로드와 겹쳐 중복 적용돼도 upsert 라 무해
+        graph = self.peek(room_id)
+        if graph is not None:
+            graph.apply(nodes, edges)
+        return graph
+
+    def set_core(self, room_id: UUID, node_id: UUID):
+        with self._lock:
+            graph = self._rooms.get(room_id)
+            if graph:
+                graph.core_node_id = node_id
+
+    def invalidate(self, room_id: UUID):
+        with self._lock:
+            graph = self._rooms.pop(room_id, None)
+        if graph is not None:
+            logger.info(f"[GRAPH:CACHE] invalidate room={room_id}")
+
+    async def publish_invalidate(self, room_id: UUID):
+        """다른 worker 캐시의 room graph 무효화 (이 worker 는 이미 write-through 로 반영된 상태)"""
+        await self.bus.publish(self.CHANNEL, room_id, "invalidate")
+
+    async def _on_bus_message(self, channel: str, room_id: UUID, text: str, local: bool, version: int | None):
+        if not local:
+            self.invalidate(room_id)
+
+    def _load(self, db: Session, room_id: UUID) -> RoomGraph:
+        graph = RoomGraph(room_id)
+        # version 을 노드보다 먼저 읽음 → 로드한 state 가 version 보다 뒤처지지 않음 (사이에 온 delta 는 다시 받음)
+        graph.version = db.query(Room.graph_version).filter(Room.room_id == room_id).scalar() or 0
+        graph.apply(load_room_nodes(db, room_id), load_room_edges(db, room_id))
+
+        graph.core_node_id = (
+            db.query(Asset.node_id)
+            .join(Node, Node.node_id == Asset.node_id)
+            .filter(Node.room_id == room_id, Asset.type == "CURR_2D_CORE")
+            .limit(1)
+            .scalar()
+        )
+
+        logger.info(
+            f"[GRAPH:CACHE] load room={room_id} "
+            f"nodes={len(graph.nodes)} edges={len(graph.edges)}"
+        )
+        return graph
+
+    def _evict_lru(self):
+        while len(self._rooms) > self.max_rooms:
+            room_id, _ = self._rooms.popitem(last=False)
+            logger.info(f"[GRAPH:CACHE] evict(lru) room={room_id}")
+
+    def _evict_idle(self):
+        deadline = time.monotonic() - self.idle_ttl_sec
+        # OrderedDict 앞쪽이 가장 오래 접근 안 된 room
+        while self._rooms:
+            room_id, graph = next(iter(self._rooms.items()))
+            if graph.last_access >= deadline:
+                break
+            self._rooms.popitem(last=False)
+            logger.info(f"[GRAPH:CACHE] evict(idle) room={room_id}")
+
+
+graph_cache = GraphCache(
+    max_rooms=settings.GRAPH_CACHE_MAX_ROOMS,
+    idle_ttl_sec=settings.GRAPH_CACHE_IDLE_TTL_SEC,
+)
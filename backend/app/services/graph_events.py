@@ -0,0 +1,215 @@
+import logging
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Iterable, List, Tuple
+from uuid import UUID
+
+import orjson
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.ws_manager import WSRoomManager, graph_ws_manager
+from app.db.models.room import Room
+from app.services.graph_cache import graph_cache
+from app.storage.presigned import presigned_urls
+from app.utils.asset_url import asset_key_from_url, build_asset_url, client_asset_url, client_graph_state
+
+logger = logging.getLogger(__name__)
+
+
+class ReplayBuffer:
+    """
+    room 별 최근 GRAPH_DELTA 프레임 (version, 인코딩된 text, 받은 시각) ring buffer.
+    재접속한 클라이언트에게 놓친 프레임을 재인코딩 없이 그대로 다시 보낸다.
+    max_age_sec 가 있으면 그보다 오래된 프레임은 replay 하지 않음 (presigned URL 이 만료됐을 수 있음 → full state).
+    """
+
+    def __init__(self, size: int, max_rooms: int, max_age_sec: float | None = None):
+        self.size = size
+        self.max_rooms = max_rooms
+        self.max_age_sec = max_age_sec
+        self._rooms: "OrderedDict[UUID, Deque[Tuple[int, str, float]]]" = OrderedDict()
+
+    def append(self, room_id: UUID, version: int, text: str):
+        frames = self._rooms.get(room_id)
+        if frames is None:
+            frames = self._rooms[room_id] = deque(maxlen=self.size)
+            while len(self._rooms) > self.max_rooms:
+                self._rooms.popitem(last=False)
+        self._rooms.move_to_end(room_id)
+
+        # bus 재전송 등으로 같은 version 이 다시 오면 무시
+        if frames and frames[-1][0] >= version:
+            return
+        frames.append((version, text, time.monotonic()))
+
+    def since(self, room_id: UUID, last_version: int, current_version: int) -> List[str] | None:
+        """
+        last_version 이후 ~ current_version 까지 연속된 프레임. 버퍼로 메울 수 없으면 None.
+        """
+        oldest = time.monotonic() - self.max_age_sec if self.max_age_sec is not None else None
+        frames = [
+            (v, text) for v, text, received in self._rooms.get(room_id, ())
+            if last_version < v <= current_version and (oldest is None or received >= oldest)
+        ]
+        expected = list(range(last_version + 1, current_version + 1))
+        if [v for v, _ in frames] != expected:
+            return None
+        return [text for _, text in frames]
+
+
+class GraphEventPublisher:
+    """
+    room 별 graph version 을 관리하고 GRAPH_DELTA / GRAPH_STATE 이벤트를 만든다.
+    - version 은 rooms.graph_version 에서 DB 변경과 같은 트랜잭션으로 발급 → 재시작 / 다른 worker 와 겹치지 않음
+    - 파이프라인 단계마다 추가/변경된 노드·엣지만 GRAPH_DELTA 로 broadcast
+    - full graph_state 는 클라이언트 요청(GRAPH_SYNC, REST) 시에만 전송 (graph_cache 기준)
+    """
+
+    def __init__(self, manager: WSRoomManager):
+        self._manager = manager
+        self._versions: Dict[UUID, int] = {}
+        self._replay = ReplayBuffer(
+            size=settings.GRAPH_REPLAY_BUFFER_SIZE,
+            max_rooms=settings.GRAPH_CACHE_MAX_ROOMS,
+            # presigned 모드: 프레임에 담긴 URL 은 publish 시점에 남은 시간이 refresh margin 이상인 것만 보장됨
+            max_age_sec=presigned_urls.refresh_margin_sec if settings.ASSET_DELIVERY_MODE == "presigned" else None,
+        )
+        manager.add_listener(self._on_delivery)
+
+    def current_version(self, room_id: UUID) -> int:
+        # 이 worker 가 publish / 수신한 version 과 캐시 로드 시점의 rooms.graph_version 중 큰 것
+        graph = graph_cache.peek(room_id)
+        loaded = graph.version if graph else 0
+        return max(self._versions.get(room_id, 0), loaded)
+
+    @staticmethod
+    def next_version(db: Session, room_id: UUID) -> int:
+        """
+        rooms.graph_version 을 호출한 쪽 트랜잭션 안에서 1 증가시켜 발급.
+        delta 를 만드는 DB 변경과 함께 커밋되므로 재시작 후에도 이미 보낸 version 을 다시 쓰지 않고,
+        롤백되면 발급도 없던 일이 된다 (room row lock 으로 worker 간 직렬화)
+        """
+        db.query(Room).filter(Room.room_id == room_id).update(
+            {Room.graph_version: Room.graph_version + 1}, synchronize_session=False,
+        )
+        return db.query(Room.graph_version).filter(Room.room_id == room_id).scalar()
+
+    async def publish_delta(
+        self,
+        room_id: UUID,
+        cause: str,
+        version: int,
+        nodes: Iterable[dict] = (),
+        edges: Iterable[dict] = (),
+        graph_snapshot_id: UUID | None = None,
+        core_img_url: str | None = None,
+    ) -> int:
+        # version 은 DB 구간에서 next_version() 으로 발급해 커밋된 것
+        self._versions[room_id] = max(self._versions.get(room_id, 0), version)
+        delta = client_graph_state({"nodes": list(nodes), "edges": list(edges)})
+        payload = {
+            "event": "GRAPH_DELTA",
+            "cause": cause,
+            "version": version,
+            "base_version": version - 1,
+            "core_img_url": client_asset_url(core_img_url),
+            "delta": {
+                "graph_snapshot_id": graph_snapshot_id,
+                "nodes": delta["nodes"],
+                "edges": delta["edges"],
+            },
+        }
+        await self._manager.broadcast(room_id, payload, version=version)
+        logger.info(
+            f"[GRAPH:DELTA] room={room_id} cause={cause} version={version} "
+            f"nodes={len(payload['delta']['nodes'])} edges={len(payload['delta']['edges'])}"
+        )
+        return version
+
+    def full_state_event(self, db: Session, room_id: UUID) -> dict:
+        # 이 worker 의 version 은 load 전에 읽어야 build 도중 들어온 delta 를 클라이언트가 다시 받고,
+        # rooms.graph_version 은 load 한 뒤에야 알 수 있다 (재시작 직후 캐시가 비어 있으면 0 이 아님)
+        local_version = self._versions.get(room_id, 0)
+        graph = graph_cache.get(db, room_id)
+        return self._state_event(graph, max(local_version, graph.version))
+
+    def replay_frames(self, room_id: UUID, last_version: int | None) -> List[str] | None:
+        """
+        재접속 시 last_version 이후 놓친 GRAPH_DELTA 프레임.
+        None 이면 full state 로 맞춰야 함 (최초 접속 / 버퍼 범위 밖 / 서버 재시작 / gap 이 너무 큼).
+        """
+        if last_version is None:
+            return None
+
+        current = self.current_version(room_id)
+        if last_version > current:
+            return None
+        if current - last_version > settings.GRAPH_REPLAY_MAX_FRAMES:
+            return None
+        return self._replay.since(room_id, last_version, current)
+
+    def cached_full_state_event(self, room_id: UUID) -> dict | None:
+        # 캐시에 있으면 DB 없이 바로 (event loop 에서 await 없이 만들어야 프레임 순서가 보장됨)
+        graph = graph_cache.peek(room_id)
+        if graph is None:
+            return None
+        return self._state_event(graph, self.current_version(room_id))
+
+    @staticmethod
+    def _state_event(graph, version: int) -> dict:
+        # 캐시 / snapshot 에는 만료 없는 URL, presigned 서명은 클라이언트로 나갈 때
+        return {
+            "event": "GRAPH_STATE",
+            "version": version,
+            "core_img_url": client_asset_url(graph.core_img_url),
+            "graph_state": client_graph_state(graph.to_state()),
+        }
+
+    def _on_delivery(self, room_id: UUID, text: str, local: bool, version: int | None):
+        """
+        이 worker 에 도착한 GRAPH_DELTA 를 replay buffer 에 기록하고,
+        다른 worker 가 publish 한 것이면 version / graph_cache 에도 반영.
+        version 은 bus 메시지에 함께 실려 오므로 프레임을 다시 파싱하는 건 다른 worker 의 delta 를 캐시에 적용할 때뿐.
+        """
+        if version is None:
+            return  # GRAPH_DELTA 가 아닌 프레임
+
+        self._replay.append(room_id, version, text)
+        if local:
+            return
+
+        self._versions[room_id] = max(self._versions.get(room_id, 0), version)
+        graph = graph_cache.peek(room_id)
+        if graph:
+            delta = orjson.loads(text)["delta"]
+            graph.apply(
+                [_parse_node(n) for n in delta["nodes"]],
+                [_parse_edge(e) for e in delta["edges"]],
+            )
+
+
+def _parse_uuid(value: str | None) -> UUID | None:
+    return UUID(value) if value else None
+
+
+def _parse_node(n: dict) -> dict:
+    n = dict(n)
+    n["node_id"] = UUID(n["node_id"])
+    if n.get("img_url"):
+        # 다른 worker 가 보낸 프레임의 URL 은 클라이언트용 (presigned) → 캐시에는 저장 형태로
+        n["img_url"] = build_asset_url(asset_key_from_url(n["img_url"])) or n["img_url"]
+    if "parent_category_id" in n:
+        n["parent_category_id"] = _parse_uuid(n["parent_category_id"])
+    return n
+
+
+def _parse_edge(e: dict) -> dict:
+    return {
+        "edge_id": UUID(e["edge_id"]),
+        "from_node_id": UUID(e["from_node_id"]),
+        "to_node_id": UUID(e["to_node_id"]),
+    }
+
+
+graph_event_publisher = GraphEventPublisher(graph_ws_manager)
@@ -0,0 +1,178 @@
+import logging
+from dataclasses import dataclass
+from typing import Dict
+from uuid import UUID, uuid4
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.graph_snapshot import GraphSnapshot
+from app.services.graph_cache import RoomGraph
+from app.utils.serialize import stringify_uuids
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SnapshotBase:
+    """RoomGraph 가 마지막으로 기록한 snapshot (다음 DELTA 의 기준)"""
+    snapshot_id: UUID
+    keyframe_id: UUID
+    keyframe_version: int
+    nodes: Dict[UUID, dict]
+    edges: Dict[UUID, dict]
+
+
+# =================================================
+# diff
+# =================================================
+def diff_graph(
+    prev_nodes: Dict,
+    prev_edges: Dict,
+    nodes: Dict,
+    edges: Dict,
+) -> dict:
+    """
+    prev → curr 로 가는 diff (추가/변경된 노드·엣지 + 삭제된 id)
+    """
+    return {
+        "nodes": [n for nid, n in nodes.items() if prev_nodes.get(nid) != n],
+        "edges": [e for eid, e in edges.items() if prev_edges.get(eid) != e],
+        "removed_node_ids": [nid for nid in prev_nodes if nid not in nodes],
+        "removed_edge_ids": [eid for eid in prev_edges if eid not in edges],
+    }
+
+
+def apply_diff(nodes: Dict, edges: Dict, diff: dict):
+    for nid in diff.get("removed_node_ids", []):
+        nodes.pop(nid, None)
+    for eid in diff.get("removed_edge_ids", []):
+        edges.pop(eid, None)
+    for n in diff.get("nodes", []):
+        nodes[n["node_id"]] = n
+    for e in diff.get("edges", []):
+        edges[e["edge_id"]] = e
+
+
+def index_state(state: dict) -> tuple[Dict, Dict]:
+    return (
+        {n["node_id"]: n for n in state.get("nodes", [])},
+        {e["edge_id"]: e for e in state.get("edges", [])},
+    )
+
+
+# =================================================
+# write
+# =================================================
+def write_snapshot(db: Session, graph: RoomGraph, version: int) -> GraphSnapshot:
+    """
+    RoomGraph 현재 상태를 snapshot 으로 1회 저장.
+    - room 의 DB 상 최신 snapshot 을 이 프로세스가 기록했고 keyframe 이후 version 차이가 N 미만이면 DELTA
+    - 그 외(최초, 캐시 재로드, N 초과, 다른 worker 가 그 뒤에 기록)는 full KEYFRAME
+    """
+    snapshot_id = uuid4()
+    base: SnapshotBase | None = graph.last_snapshot
+    interval = settings.GRAPH_SNAPSHOT_KEYFRAME_INTERVAL
+
+    if base is not None and version - base.keyframe_version < interval:
+        # multi-worker: 다른 worker 가 같은 room 에 snapshot 을 기록했으면 이 프로세스의 base 는 최신이 아님
+        # version 이 없는 legacy row 는 제외 (Postgres 는 DESC 에서 NULL 을 먼저 정렬)
+        latest = (
+            db.query(GraphSnapshot.graph_snapshot_id)
+            .filter(GraphSnapshot.room_id == graph.room_id, GraphSnapshot.version.isnot(None))
+            .order_by(GraphSnapshot.version.desc())
+            .limit(1)
+            .scalar()
+        )
+        if latest != base.snapshot_id:
+            base = None
+
+    if base is None or version - base.keyframe_version >= interval:
+        snap = GraphSnapshot(
+            graph_snapshot_id=snapshot_id,
+            room_id=graph.room_id,
+            kind="KEYFRAME",
+            version=version,
+            graph_state=stringify_uuids(graph.to_state(snapshot_id)),
+        )
+        keyframe_id, keyframe_version = snapshot_id, version
+    else:
+        diff = diff_graph(base.nodes, base.edges, graph.nodes, graph.edges)
+        snap = GraphSnapshot(
+            graph_snapshot_id=snapshot_id,
+            room_id=graph.room_id,
+            kind="DELTA",
+            version=version,
+            keyframe_snapshot_id=base.keyframe_id,
+            graph_state=stringify_uuids({
+                "graph_snapshot_id": snapshot_id,
+                "base_snapshot_id": base.snapshot_id,
+                **diff,
+            }),
+        )
+        keyframe_id, keyframe_version = base.keyframe_id, base.keyframe_version
+
+    db.add(snap)
+    db.flush()
+
+    graph.last_snapshot = SnapshotBase(
+        snapshot_id=snapshot_id,
+        keyframe_id=keyframe_id,
+        keyframe_version=keyframe_version,
+        nodes=dict(graph.nodes),
+        edges=dict(graph.edges),
+    )
+    logger.info(f"[GRAPH:SNAPSHOT] room={graph.room_id} kind={snap.kind} version={version}")
+    return snap
+
+
+# =================================================
+# reconstruction
+# =================================================
+def load_snapshot_state(db: Session, graph_snapshot_id: UUID) -> dict | None:
+    """
+    snapshot 하나를 full graph_state 로 복원 (keyframe + delta 체인 적용).
+    """
+    snap = db.get(GraphSnapshot, graph_snapshot_id)
+    if not snap:
+        return None
+    if snap.kind != "DELTA":
+        return snap.graph_state
+
+    keyframe = db.get(GraphSnapshot, snap.keyframe_snapshot_id) if snap.keyframe_snapshot_id else None
+    if keyframe is None:
+        raise ValueError(f"broken snapshot chain: {graph_snapshot_id}")
+    chain = {
+        str(row.graph_snapshot_id): row
+        for row in (
+            db.query(GraphSnapshot)
+            .filter(
+                GraphSnapshot.keyframe_snapshot_id == snap.keyframe_snapshot_id,
+                GraphSnapshot.kind == "DELTA",
+                GraphSnapshot.version <= snap.version,
+            )
+            .all()
+        )
+    }
+
+    # target → keyframe 방향으로 base_snapshot_id 를 따라간 뒤 역순 적용
+    path = []
+    cursor = snap
+    while cursor.kind == "DELTA":
+        path.append(cursor)
+        base_id = cursor.graph_state.get("base_snapshot_id")
+        if base_id == str(keyframe.graph_snapshot_id):
+            break
+        cursor = chain.get(base_id)
+        if cursor is None:
+            raise ValueError(f"broken snapshot chain: {graph_snapshot_id}")
+
+    nodes, edges = index_state(keyframe.graph_state)
+    for row in reversed(path):
+        apply_diff(nodes, edges, row.graph_state)
+
+    return {
+        "graph_snapshot_id": str(snap.graph_snapshot_id),
+        "nodes": list(nodes.values()),
+        "edges": list(edges.values()),
+    }
@@ -1,79 +1,126 @@
 import io
 import logging
 import asyncio
+import threading
+import time
+from collections import deque
 from uuid import UUID
-from typing import List
+from typing import AsyncIterator, Awaitable, Dict, List, Tuple
 from io import BytesIO
 from PIL import Image
 
 from google import genai
 from google.genai import types
-from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
-from app.db.models.node import Node
-from app.db.models.asset import Asset
-from app.storage.minio import upload_generated_image, get_object_bytes
+from app.core.config import settings
+from app.services.asset_cache import asset_cache
+from app.services.core_image_cache import core_image_cache
+from app.services.image_upload import image_upload_pool
+from app.storage.object_store import new_asset_key, object_store, to_img_url, to_object_key
+from app.utils.image_format import OUTPUT_FORMATS, ImageInfo, probe_image, transcode_image
+from app.utils.timing import StageTimer, percentiles
 
 logger = logging.getLogger(__name__)
 
 
+_IMAGE_CONFIG = types.GenerateContentConfig(
+    candidate_count=1,
+    response_modalities=["IMAGE"],
+)
+
+
 class ImageService:
-    def __init__(self):
-        self.client = genai.Client()
+    """
+    Gemini 호출은 SDK 의 async API (client.aio) 로 → n 장이 실제로 동시에 생성되고 event loop 를 막지 않는다.
+    - 프로세스 전체 동시 호출 수는 IMAGE_MAX_CONCURRENCY 로 제한 (여러 room 의 파이프라인이 공유)
+    - 요청마다 IMAGE_TIMEOUT_SEC 타임아웃, 파이프라인이 취소되면 진행 중인 요청도 같이 취소
+    - 생성된 이미지는 header 만 확인하고 Gemini bytes 그대로 업로드 (IMAGE_OUTPUT_FORMAT 이 다른 포맷일 때만 변환)
+    - header 확인 / 변환은 threadpool, 업로드는 image_upload_pool (생성과 분리된 업로드 worker) 에서
+    - iter_* 는 n 장 중 준비된 순서대로 object key 를 내보냄 (파이프라인이 한 장씩 바로 반영)
+      _release_before_upload() 면 key 예약 + hot 캐시 적재까지만 하고 업로드 완료는 기다리지 않음
+    - 단계별 소요시간(generate / encode / upload_wait) 은 timer(pipeline_jobs.stage_timings) 와 stage_stats() 로
+    """
+
+    def __init__(
+        self,
+        client: genai.Client | None = None,
+        max_concurrency: int = settings.IMAGE_MAX_CONCURRENCY,
+        timeout: float = settings.IMAGE_TIMEOUT_SEC,
+    ):
+        self.client = client or genai.Client()
+        self.model = settings.IMAGE_MODEL
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(max_concurrency)
+
+        self.output_format = settings.IMAGE_OUTPUT_FORMAT.lower()
+        if self.output_format != "original" and self.output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"unknown IMAGE_OUTPUT_FORMAT: {settings.IMAGE_OUTPUT_FORMAT}")
+        self._stats_lock = threading.Lock()  # _store_image_bytes 는 threadpool 에서
+        self.passthrough = 0
+        self.transcoded = 0
+        self.rejected = 0
+        self._stage_ms: Dict[str, deque] = {
+            name: deque(maxlen=1024) for name in ("generate", "encode", "upload_wait")
+        }
+
+    def _record(self, stage: str, ms: float, timer: StageTimer | None):
+        # timer 는 n 장 합산 (동시에 진행되므로 wall time 아님), stage_stats 는 이미지 1장 기준
+        self._stage_ms[stage].append(ms)
+        if timer is not None:
+            timer.add(f"image_{stage}", ms)
+
+    async def _generate_content(self, contents: list, timer: StageTimer | None = None) -> types.GenerateContentResponse:
+        async with self._slots:
+            t0 = time.perf_counter()
+            try:
+                return await asyncio.wait_for(
+                    self.client.aio.models.generate_content(
+                        model=self.model,
+                        contents=contents,
+                        config=_IMAGE_CONFIG,
+                    ),
+                    timeout=self.timeout,
+                )
+            finally:
+                self._record("generate", (time.perf_counter() - t0) * 1000, timer)
+
+    @staticmethod
+    async def _as_completed(jobs: List[Awaitable[str]], label: str) -> AsyncIterator[str]:
+        # 끝난 순서대로 성공한 key 만, 소비하는 쪽이 중간에 멈추면(취소 / aclose) 남은 요청도 취소
+        tasks = [asyncio.ensure_future(job) for job in jobs]
+        try:
+            for done in asyncio.as_completed(tasks):
+                key = await done
+                if key:
+                    logger.info(f"[IMAGE][STEP 3] {label} image generated → {key}")
+                    yield key
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
 
     # =========================================================
     # BASIC DISCUSS: prompt만으로 이미지 n개 생성
     # =========================================================
-    async def generate_images(
-        self,
-        prompt: str,
-        n: int = 3,
-        db: Session | None = None,
-        node_id: UUID | None = None,
-    ) -> List[str]:
-        logger.info(f"[IMAGE][START] BASIC image generation (n={n})")
+    def iter_images(self, prompt: str, n: int = 3, timer: StageTimer | None = None) -> AsyncIterator[str]:
+        logger.info(f"[IMAGE][START] BASIC image generation (n={n}, progressive)")
         logger.info(f"[IMAGE][STEP 0] Prompt: {prompt}")
+        return self._as_completed([self._generate_single_image(prompt, idx=i, timer=timer) for i in range(n)], "BASIC")
 
-        tasks = [self._generate_single_image(prompt, idx=i) for i in range(n)]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        urls: List[str] = []
-        for idx, res in enumerate(results):
-            if isinstance(res, str) and res:
-                logger.info(f"[IMAGE][STEP 3] Image #{idx} generated successfully")
-                urls.append(res)
-
-                if db and node_id:
-                    self._save_asset_to_db(db, node_id, res, "2D_ROOT_CANDIDATE")
-            else:
-                logger.error(f"[IMAGE][FAIL] Image #{idx} generation failed: {res}")
-
-        if db:
-            db.commit()
-            logger.info("[IMAGE][DB] Assets committed")
-
-        logger.info("[IMAGE][END] BASIC image generation finished")
-        return urls
-
-    async def _generate_single_image(self, prompt: str, idx: int = 0) -> str:
+    async def _generate_single_image(self, prompt: str, idx: int = 0, timer: StageTimer | None = None) -> str:
         try:
             logger.info(f"[IMAGE][STEP 1] Request Gemini image #{idx}")
 
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash-image",
-                contents=[prompt],
-                config=types.GenerateContentConfig(
-                    candidate_count=1,
-                    response_modalities=["IMAGE"],
-                ),
-            )
+            response = await self._generate_content([prompt], timer)
 
             part = response.candidates[0].content.parts[0]
-            image = Image.open(BytesIO(part.inline_data.data))
-
             logger.info(f"[IMAGE][STEP 2] Gemini image #{idx} received")
-            return self._save_image_to_minio(image, idx)
+            return await self._store_image(part.inline_data.data, idx, timer)
 
+        except asyncio.TimeoutError:
+            logger.error(f"[IMAGE][FAIL] SINGLE_GEN #{idx}: timeout after {self.timeout}s")
+            return ""
         except Exception as e:
             logger.error(f"[IMAGE][FAIL] SINGLE_GEN #{idx}: {e}")
             return ""
@@ -81,74 +128,58 @@ class ImageService:
     # =========================================================
     # CATEGORY DISCUSS: CORE 이미지 + prompt로 이미지 n개 생성
     # =========================================================
-    async def generate_category_images(
+    async def iter_category_images(
         self,
-        db: Session,
         prompt: str,
         n: int,
         room_id: UUID,
-    ) -> List[str]:
-        logger.info("[IMAGE][START] CATEGORY image generation")
-        logger.info(f"[IMAGE][STEP 0] room_id={room_id}, n={n}")
+        core_img_url: str,
+        core_asset_id: UUID | None = None,
+        timer: StageTimer | None = None,
+    ) -> AsyncIterator[str]:
+        logger.info(f"[IMAGE][START] CATEGORY image generation (progressive) room_id={room_id}, n={n}")
         logger.info(f"[IMAGE][STEP 0] Prompt: {prompt}")
 
-        core_image = self._load_core_image(db, room_id)
-        if not core_image:
+        # core asset 을 알면 room 별 core 이미지 캐시 (MinIO / PIL 없이 바로, 적재 실패는 그대로 올림)
+        if core_asset_id is not None and core_img_url:
+            core_part = (await core_image_cache.get(room_id, core_asset_id, core_img_url)).part
+        else:
+            core_part = await run_in_threadpool(self._load_core_image_part, core_img_url)
+        if not core_part:
             logger.warning("[IMAGE][STOP] CORE image not found")
-            return []
-
-        tasks = [
-            self._generate_single_category_image(prompt, core_image, idx=i)
-            for i in range(n)
-        ]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        urls: List[str] = []
-        for idx, res in enumerate(results):
-            if isinstance(res, str) and res:
-                logger.info(f"[IMAGE][STEP 3] Category image #{idx} generated")
-                urls.append(res)
-            else:
-                logger.error(f"[IMAGE][FAIL] Category image #{idx}: {res}")
+            return
 
-        logger.info("[IMAGE][END] CATEGORY image generation finished")
-        return urls
+        keys = self._as_completed(
+            [self._generate_single_category_image(prompt, core_part, idx=i, timer=timer) for i in range(n)], "CATEGORY",
+        )
+        try:
+            async for key in keys:
+                yield key
+        finally:
+            await keys.aclose()
 
     async def _generate_single_category_image(
         self,
         prompt: str,
-        core_image: Image.Image,
+        core_part: types.Part,
         idx: int = 0,
+        timer: StageTimer | None = None,
     ) -> str:
         try:
             logger.info(f"[IMAGE][STEP 1] Request Gemini category image #{idx}")
 
-            buf = BytesIO()
-            core_image.save(buf, format="PNG")
-            buf.seek(0)
-
-            image_part = types.Part.from_bytes(
-                data=buf.read(),
-                mime_type="image/png",
-            )
-
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash-image",
-                contents=[prompt, image_part],
-                config=types.GenerateContentConfig(
-                    candidate_count=1,
-                    response_modalities=["IMAGE"],
-                ),
-            )
+            response = await self._generate_content([prompt, core_part], timer)
 
             for part in response.candidates[0].content.parts:
                 if part.inline_data:
-                    image = Image.open(BytesIO(part.inline_data.data))
                     logger.info(f"[IMAGE][STEP 2] Category image #{idx} received")
-                    return self._save_image_to_minio(image, idx)
+                    return await self._store_image(part.inline_data.data, idx, timer)
 
             return ""
 
+        except asyncio.TimeoutError:
+            logger.error(f"[IMAGE][FAIL] SINGLE_CATEGORY #{idx}: timeout after {self.timeout}s")
+            return ""
         except Exception as e:
             logger.error(f"[IMAGE][FAIL] SINGLE_CATEGORY #{idx}: {e}")
             return ""
@@ -156,23 +187,29 @@ class ImageService:
     # =========================================================
     # CORE IMAGE LOAD (MinIO → bytes → PIL)
     # =========================================================
-    def _load_core_image(self, db: Session, room_id: UUID) -> Image.Image | None:
-        logger.info("[IMAGE][CORE] Load core image from DB/MinIO")
-
-        asset = (
-            db.query(Asset)
-            .join(Node, Asset.node_id == Node.node_id)
-            .filter(Node.room_id == room_id)
-            .filter(Asset.type == "CURR_2D_CORE")
-            .first()
+    def _load_core_image_part(self, core_img_url: str | None) -> types.Part | None:
+        # n 장 요청이 같이 쓰도록 PNG 인코딩은 1번만
+        core_image = self._load_core_image(core_img_url)
+        if not core_image:
+            return None
+
+        buf = BytesIO()
+        core_image.save(buf, format="PNG")
+        return types.Part.from_bytes(
+            data=buf.getvalue(),
+            mime_type="image/png",
         )
 
-        if not asset:
+    def _load_core_image(self, core_img_url: str | None) -> Image.Image | None:
+        # CURR_2D_CORE asset 조회는 파이프라인의 DB 구간에서 (여기서는 DB 세션을 잡지 않음)
+        logger.info("[IMAGE][CORE] Load core image from MinIO")
+
+        if not core_img_url:
             logger.warning("[IMAGE][CORE] No core image asset found")
             return None
 
         try:
-            data = get_object_bytes(asset.img_url)
+            data = object_store.backend.get(to_object_key(core_img_url))  # 이미 threadpool 안
             logger.info("[IMAGE][CORE] Core image loaded from MinIO")
             return Image.open(BytesIO(data))
 
@@ -183,32 +220,87 @@ class ImageService:
     # =========================================================
     # MinIO + DB
     # =========================================================
-    def _save_image_to_minio(self, image: Image.Image, idx: int = 0) -> str:
-        logger.info(f"[IMAGE][STEP 2] Upload image #{idx} to MinIO")
+    async def _store_image(self, data: bytes, idx: int = 0, timer: StageTimer | None = None) -> str:
+        t0 = time.perf_counter()
+        data, info = await run_in_threadpool(self._prepare_image, data)
+        self._record("encode", (time.perf_counter() - t0) * 1000, timer)
+        return await self._save_image_to_minio(data, info.ext, info.mime_type, idx, timer)
+
+    @staticmethod
+    def _release_before_upload() -> bool:
+        """
+        업로드 완료 전에 key 를 넘겨도 되는 구성인지.
+        NODE_IMAGE_UPDATE 를 받은 클라이언트가 같은 프로세스의 /nodexr-assets 로 받아 가야
+        hot 캐시 / 업로드 대기(image_upload_pool.wait)가 보장됨 → 단일 프로세스 + proxy 전달일 때만.
+        """
+        return (
+            settings.IMAGE_UPLOAD_EARLY_RELEASE
+            and settings.PIPELINE_WORKER_MODE == "inprocess"
+            and settings.BROADCAST_BUS == "inprocess"
+            and settings.ASSET_DELIVERY_MODE == "proxy"
+        )
 
-        buf = BytesIO()
-        image.save(buf, format="PNG")
-        buf.seek(0)
+    def _prepare_image(self, data: bytes) -> Tuple[bytes, ImageInfo]:
+        # header(포맷 / 크기)만 확인, 픽셀 디코딩 없음
+        try:
+            info = probe_image(data)
+            if info.width * info.height > settings.IMAGE_MAX_PIXELS:
+                raise ValueError(f"image too large: {info.width}x{info.height}")
+        except ValueError:
+            with self._stats_lock:
+                self.rejected += 1
+            raise
+
+        transcoded = self.output_format != "original" and info.ext != OUTPUT_FORMATS[self.output_format][2]
+        if transcoded:
+            data, info = transcode_image(data, self.output_format, settings.IMAGE_OUTPUT_QUALITY)
+
+        with self._stats_lock:
+            if transcoded:
+                self.transcoded += 1
+            else:
+                self.passthrough += 1
+        return data, info
 
-        object_key = upload_generated_image(image_bytes=buf.getvalue())
-        logger.info(f"[IMAGE][STEP 2] Uploaded image #{idx} → {object_key}")
+    async def _save_image_to_minio(
+        self,
+        data: bytes,
+        ext: str,
+        content_type: str,
+        idx: int = 0,
+        timer: StageTimer | None = None,
+    ) -> str:
+        # key 먼저 예약 → 곧 room 의 헤드셋들이 동시에 받아 갈 이미지라 프록시 캐시에 먼저 올리고 업로드는 worker 에
+        object_key = new_asset_key(ext)
+        await run_in_threadpool(asset_cache.put, object_key, data, content_type)  # ETag = md5 (single part 업로드와 같음)
+        # 먼저 내보낸 key 는 asset 행이 생기므로 업로드가 끝내 실패해도 bytes 를 spool 에 남겨 다시 올림
+        release = self._release_before_upload()
+        uploaded = await image_upload_pool.submit(object_key, data, content_type, spool_on_failure=release)
+        logger.info(f"[IMAGE][STEP 2] Queued upload image #{idx} → {object_key} ({content_type}, {len(data)} bytes)")
+
+        if not release:
+            t0 = time.perf_counter()
+            await asyncio.shield(uploaded)  # 파이프라인이 취소돼도 업로드는 끝까지
+            self._record("upload_wait", (time.perf_counter() - t0) * 1000, timer)
 
         # ❗ 절대 URL 아님
-        return object_key
+        return to_img_url(object_key)
+
+    def output_stats(self) -> dict:
+        with self._stats_lock:
+            return {
+                "output_format": self.output_format,
+                "passthrough": self.passthrough,
+                "transcoded": self.transcoded,
+                "rejected": self.rejected,
+            }
+
+    def stage_stats(self) -> dict:
+        """이미지 1장 기준 단계별 소요시간(ms): generate (Gemini) / encode (header 확인·변환) / upload_wait"""
+        return {
+            "release_before_upload": self._release_before_upload(),
+            **{name: percentiles(list(values)) for name, values in self._stage_ms.items()},
+        }
+
 
-    def _save_asset_to_db(
-        self,
-        db: Session,
-        node_id: UUID,
-        url: str,
-        asset_type: str,
-    ):
-        logger.info(f"[IMAGE][DB] Save asset (type={asset_type})")
-        db.add(
-            Asset(
-                node_id=node_id,
-                img_url=url,
-                type=asset_type,
-            )
-        )
 image_service = ImageService()
\ No newline at end of file
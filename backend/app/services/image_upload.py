@@ -0,0 +1,270 @@
+import asyncio
+import logging
+import mimetypes
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List
+from urllib.parse import quote, unquote
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.storage.object_store import object_store
+from app.utils.timing import percentiles
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _UploadJob:
+    object_key: str
+    data: bytes
+    content_type: str
+    done: asyncio.Future
+    spool_on_failure: bool = False  # 최종 실패 / 종료 시 남으면 spool 에 보관 (이미 key 를 내보낸 업로드)
+    from_spool: bool = False        # spool 에서 다시 올리는 업로드 (성공하면 spool 파일 삭제)
+    enqueued: float = field(default_factory=time.perf_counter)
+
+
+class ImageUploadPool:
+    """
+    생성된 이미지 업로드 전용 worker pool (asyncio.Queue + worker N개, 프로세스당 1개).
+    - 생성 쪽은 object key 를 예약해서 submit 만 하고 바로 다음 단계로 (완료를 기다릴지는 호출한 쪽이 결정)
+    - worker 들이 object_store 전용 thread pool 로 동시에 업로드, 실패하면 backoff 후 retries 번 재시도
+    - 업로드 중인 key 는 wait() 로 완료를 기다릴 수 있음 (/nodexr-assets 가 캐시 miss 로 MinIO 에 가기 전에)
+    - queue 가 가득 차면 submit 이 기다림 (생성이 업로드보다 빠를 때 메모리 상한)
+    - worker 는 start() 또는 처음 submit 할 때 현재 event loop 에서 시작
+    - spool_on_failure 로 넣은 업로드 (key 를 먼저 내보내서 asset 행이 이미 있을 수 있음) 는
+      재시도를 다 써도 / 종료 drain 에서 남아도 bytes 를 spool_dir 에 보관 → spool_retry_sec 마다 다시 업로드,
+      그 사이 /nodexr-assets 는 spooled_path() 의 파일로 응답
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int,
+        retries: int,
+        retry_backoff_sec: float,
+        spool_dir: str | None = None,
+        spool_retry_sec: float = 60.0,
+    ):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.retries = retries
+        self.retry_backoff_sec = retry_backoff_sec
+        self.spool_dir = spool_dir or None
+        self.spool_retry_sec = spool_retry_sec
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue | None = None
+        self._tasks: List[asyncio.Task] = []
+        self._pending: Dict[str, _UploadJob] = {}
+
+        # metrics (event loop 안에서만 갱신)
+        self.submitted = 0
+        self.uploaded = 0
+        self.failed = 0
+        self.retried = 0
+        self.spooled = 0
+        self.recovered = 0
+        self._uploading = 0
+        self._queue_wait_ms: deque = deque(maxlen=1024)
+        self._upload_ms: deque = deque(maxlen=1024)
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self._queue = asyncio.Queue(self.max_queue)
+        self._pending = {}
+        self._tasks = [loop.create_task(self._worker()) for _ in range(self.workers)]
+        if self.spool_dir:
+            os.makedirs(self.spool_dir, exist_ok=True)
+            self._tasks.append(loop.create_task(self._retry_spooled()))
+        logger.info(f"[UPLOAD:POOL] start workers={self.workers} queue={self.max_queue} spool={self.spool_dir}")
+
+    async def start(self):
+        """시작 시 호출 → 이전 실행이 spool 에 남긴 업로드도 바로 재시도 대상"""
+        self._ensure_started()
+
+    async def submit(
+        self, object_key: str, data: bytes, content_type: str, spool_on_failure: bool = False,
+    ) -> asyncio.Future:
+        """업로드 예약. 반환된 future 는 업로드가 끝나면 ETag (실패하면 마지막 예외)."""
+        return await self._enqueue(object_key, data, content_type, spool_on_failure, from_spool=False)
+
+    async def _enqueue(
+        self, object_key: str, data: bytes, content_type: str, spool_on_failure: bool, from_spool: bool,
+    ) -> asyncio.Future:
+        self._ensure_started()
+        done = self._loop.create_future()
+        # 아무도 await 하지 않는 실패도 "exception was never retrieved" 로 남지 않게
+        done.add_done_callback(lambda f: f.cancelled() or f.exception())
+        job = _UploadJob(object_key, data, content_type, done, spool_on_failure, from_spool)
+        self._pending[object_key] = job
+        try:
+            await self._queue.put(job)
+        except BaseException:
+            self._pending.pop(object_key, None)
+            done.cancel()
+            raise
+        self.submitted += 1
+        return done
+
+    async def wait(self, object_key: str) -> None:
+        """object_key 가 업로드 중이면 끝날 때까지 (실패는 여기서 올리지 않음, 없는 object 로 처리)"""
+        job = self._pending.get(object_key) if self._loop is asyncio.get_running_loop() else None
+        if job is not None:
+            await asyncio.wait({job.done})
+
+    # =================================================
+    # spool (업로드하지 못한 bytes 보관 → 주기적으로 다시 업로드)
+    # =================================================
+    def _spool_path(self, object_key: str) -> str:
+        return os.path.join(self.spool_dir, quote(object_key, safe=""))
+
+    def spooled_path(self, object_key: str) -> str | None:
+        """아직 object storage 에 없고 spool 에만 있는 업로드의 파일 경로"""
+        if not self.spool_dir:
+            return None
+        path = self._spool_path(object_key)
+        return path if os.path.isfile(path) else None
+
+    def _write_spool(self, job: _UploadJob) -> bool:
+        path = self._spool_path(job.object_key)
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(job.data)
+            os.replace(tmp, path)
+            return True
+        except OSError as e:
+            logger.error(f"[UPLOAD:SPOOL] write failed {job.object_key}: {e}")
+            return False
+
+    def _spool(self, job: _UploadJob):
+        # event loop 밖(종료 drain 이후)에서도 호출되므로 동기
+        if not (self.spool_dir and job.spool_on_failure) or job.from_spool:
+            return
+        if self._write_spool(job):
+            self.spooled += 1
+            logger.warning(f"[UPLOAD:SPOOL] {job.object_key} kept in {self.spool_dir} for retry")
+
+    def _remove_spool(self, object_key: str):
+        try:
+            os.remove(self._spool_path(object_key))
+        except OSError:
+            pass
+
+    def _read_spooled(self) -> List[tuple]:
+        out = []
+        for name in os.listdir(self.spool_dir):
+            if name.endswith(".tmp"):
+                continue
+            object_key = unquote(name)
+            if object_key in self._pending:
+                continue
+            try:
+                with open(os.path.join(self.spool_dir, name), "rb") as f:
+                    data = f.read()
+            except OSError:
+                continue  # 다른 프로세스가 방금 올리고 지움
+            out.append((object_key, data, mimetypes.guess_type(object_key)[0] or "application/octet-stream"))
+        return out
+
+    async def _retry_spooled(self):
+        while True:
+            try:
+                for object_key, data, content_type in await run_in_threadpool(self._read_spooled):
+                    await self._enqueue(object_key, data, content_type, spool_on_failure=False, from_spool=True)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("[UPLOAD:SPOOL] retry scan failed")
+            await asyncio.sleep(self.spool_retry_sec)
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._upload(job)
+            finally:
+                self._queue.task_done()
+
+    async def _upload(self, job: _UploadJob):
+        self._queue_wait_ms.append((time.perf_counter() - job.enqueued) * 1000)
+        self._uploading += 1
+        t0 = time.perf_counter()
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    etag = await object_store.put(job.object_key, job.data, job.content_type)
+                    break
+                except Exception as e:
+                    if attempt == self.retries:
+                        self.failed += 1
+                        logger.error(f"[UPLOAD:FAIL] {job.object_key} after {attempt + 1} attempts: {e}")
+                        await run_in_threadpool(self._spool, job)
+                        if not job.done.done():
+                            job.done.set_exception(e)
+                        return
+                    self.retried += 1
+                    logger.warning(f"[UPLOAD:RETRY] {job.object_key} attempt={attempt + 1}: {e}")
+                    await asyncio.sleep(self.retry_backoff_sec * 2 ** attempt)
+
+            self.uploaded += 1
+            self._upload_ms.append((time.perf_counter() - t0) * 1000)
+            if job.from_spool:
+                self.recovered += 1
+                await run_in_threadpool(self._remove_spool, job.object_key)
+                logger.info(f"[UPLOAD:SPOOL] {job.object_key} uploaded from spool")
+            if not job.done.done():
+                job.done.set_result(etag)
+        finally:
+            self._uploading -= 1
+            self._pending.pop(job.object_key, None)
+
+    async def drain(self, timeout: float):
+        """종료 시: 대기 / 진행 중인 업로드를 timeout 까지 마치고 worker 정리 (남은 업로드는 spool 로)"""
+        if self._queue is None or self._loop is not asyncio.get_running_loop():
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"[UPLOAD:POOL] drain timeout, {len(self._pending)} uploads abandoned")
+        abandoned = list(self._pending.values())  # worker 를 취소하면 진행 중이던 job 은 _pending 에서 빠짐
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for job in abandoned:
+            self._spool(job)
+            job.done.cancel()
+        self._loop, self._queue, self._tasks, self._pending = None, None, [], {}
+        logger.info("[UPLOAD:POOL] stop")
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "uploading": self._uploading,
+            "submitted": self.submitted,
+            "uploaded": self.uploaded,
+            "failed": self.failed,
+            "retried": self.retried,
+            "spooled": self.spooled,
+            "recovered": self.recovered,
+            "queue_wait_ms": percentiles(list(self._queue_wait_ms)),
+            "upload_ms": percentiles(list(self._upload_ms)),
+        }
+
+
+image_upload_pool = ImageUploadPool(
+    workers=settings.IMAGE_UPLOAD_WORKERS,
+    max_queue=settings.IMAGE_UPLOAD_QUEUE_SIZE,
+    retries=settings.IMAGE_UPLOAD_RETRIES,
+    retry_backoff_sec=settings.IMAGE_UPLOAD_RETRY_BACKOFF_SEC,
+    spool_dir=settings.IMAGE_UPLOAD_SPOOL_DIR,
+    spool_retry_sec=settings.IMAGE_UPLOAD_SPOOL_RETRY_SEC,
+)
@@ -0,0 +1,287 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Sequence
+from uuid import UUID
+
+from sqlalchemy import and_, case, func, null, text as sql
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.pipeline_job import PipelineJob
+from app.db.session import SessionLocal
+from app.utils.timing import percentiles
+
+logger = logging.getLogger(__name__)
+
+# claim 을 전역 직렬화하는 advisory lock key (두 worker 가 같은 room 의 job 을 동시에 가져가지 않도록)
+_CLAIM_LOCK_KEY = 0x6E6F6465  # "node"
+
+# 클러스터 전체 동시 실행 상한: advisory lock 안에서 RUNNING 수를 세므로 여러 worker 가 동시에 넘지 않음
+# (micro-batch follower 는 대표 job 과 같이 실행되므로 batch_job_id 가 없는 것만 센다)
+_CLAIM_SQL = sql("""
+    UPDATE pipeline_jobs
+    SET status = 'RUNNING', attempts = attempts + 1, started_at = now(), heartbeat_at = now(), worker = :worker
+    WHERE job_id = (
+        SELECT j.job_id FROM pipeline_jobs j
+        WHERE j.status = 'PENDING'
+          AND (:max_running <= 0 OR (
+            SELECT count(*) FROM pipeline_jobs x
+            WHERE x.status = 'RUNNING' AND x.batch_job_id IS NULL
+          ) < :max_running)
+          AND NOT EXISTS (
+            SELECT 1 FROM pipeline_jobs r
+            WHERE r.room_id = j.room_id AND r.status = 'RUNNING'
+          )
+        ORDER BY j.created_at
+        LIMIT 1
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING job_id, room_id, phase, text, attempts, created_at, started_at
+""")
+
+
+# micro-batch: 대표 job 과 같은 room 의 다음 PENDING CATEGORY_DISCUSS 들을 같이 RUNNING 으로
+# (다른 phase job 이 끼어 있으면 그 앞까지만 → room 안 순서 유지)
+_CLAIM_BATCH_SQL = sql("""
+    UPDATE pipeline_jobs
+    SET status = 'RUNNING', attempts = attempts + 1, started_at = now(), heartbeat_at = now(), worker = :worker,
+        batch_job_id = :batch_job_id
+    WHERE job_id IN (
+        SELECT j.job_id FROM pipeline_jobs j
+        WHERE j.room_id = :room_id
+          AND j.status = 'PENDING'
+          AND j.phase = 'CATEGORY_DISCUSS'
+          AND j.created_at < COALESCE((
+            SELECT min(o.created_at) FROM pipeline_jobs o
+            WHERE o.room_id = :room_id AND o.status = 'PENDING' AND o.phase <> 'CATEGORY_DISCUSS'
+          ), 'infinity'::timestamp)
+        ORDER BY j.created_at
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING job_id, room_id, phase, text, attempts, created_at, started_at
+""")
+
+
+@dataclass
+class ClaimedJob:
+    job_id: UUID
+    room_id: UUID
+    phase: str
+    text: str
+    attempts: int
+    created_at: datetime
+    started_at: datetime
+
+    @property
+    def wait_ms(self) -> float:
+        return round((self.started_at - self.created_at).total_seconds() * 1000, 2)
+
+
+# =================================================
+# enqueue
+# =================================================
+def enqueue_job(db: Session, room_id: UUID, phase: str, text: str, utterance_id: UUID | None = None) -> PipelineJob:
+    """
+    호출한 쪽의 트랜잭션에 job insert (utterance 와 같이 커밋되어야 유실되지 않음).
+    """
+    job = PipelineJob(room_id=room_id, utterance_id=utterance_id, phase=phase, text=text)
+    db.add(job)
+    db.flush()
+    return job
+
+
+# =================================================
+# worker 쪽 (각 함수가 자체 세션 / 짧은 트랜잭션)
+# =================================================
+def claim_job(worker: str) -> ClaimedJob | None:
+    """
+    가장 오래된 PENDING job 하나를 RUNNING 으로 전환.
+    RUNNING job 이 없는 room 의 job 만 가져간다 → room 안에서는 created_at 순서대로 하나씩,
+    room 끼리는 worker 별 concurrency 만큼, 전체로는 PIPELINE_MAX_RUNNING_JOBS 까지 병렬.
+    """
+    db = SessionLocal()
+    try:
+        db.execute(sql("SELECT pg_advisory_xact_lock(:key)"), {"key": _CLAIM_LOCK_KEY})
+        row = db.execute(
+            _CLAIM_SQL,
+            {"worker": worker, "max_running": settings.PIPELINE_MAX_RUNNING_JOBS},
+        ).first()
+        db.commit()
+        return ClaimedJob(**row._mapping) if row else None
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def claim_batch(leader: ClaimedJob, worker: str, limit: int) -> List[ClaimedJob]:
+    """
+    leader(RUNNING) 와 같은 room 에서 이어서 대기 중인 CATEGORY_DISCUSS job 을 최대 limit 개 같이 claim.
+    leader 가 RUNNING 인 동안 그 room 의 job 은 다른 worker 가 가져갈 수 없으므로 경합 없음.
+    """
+    if limit <= 0:
+        return []
+    db = SessionLocal()
+    try:
+        rows = db.execute(
+            _CLAIM_BATCH_SQL,
+            {"worker": worker, "room_id": leader.room_id, "batch_job_id": leader.job_id, "limit": limit},
+        ).all()
+        db.commit()
+        return sorted((ClaimedJob(**row._mapping) for row in rows), key=lambda job: job.created_at)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def heartbeat(job_ids: Sequence[UUID]):
+    """실행 중인 job 의 lease 연장 (worker 가 살아 있는 동안 recover_stale_jobs 가 회수하지 않음)"""
+    db = SessionLocal()
+    try:
+        db.query(PipelineJob).filter(
+            PipelineJob.job_id.in_(job_ids), PipelineJob.status == "RUNNING",
+        ).update({"heartbeat_at": func.now()}, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def record_committed(db: Session, job_ids: Sequence[UUID], phases: List[str]):
+    """
+    호출한 쪽 트랜잭션(파이프라인 DB 단계)에 커밋된 단계 목록을 같이 기록.
+    단계와 원자적으로 남으므로 worker 가 죽어도 recover_stale_jobs 가 재실행하지 않고 FAILED 처리.
+    """
+    db.query(PipelineJob).filter(PipelineJob.job_id.in_(job_ids)).update(
+        {"committed_phases": phases}, synchronize_session=False,
+    )
+
+
+def _finish(job_id: UUID, values: dict):
+    db = SessionLocal()
+    try:
+        db.query(PipelineJob).filter(PipelineJob.job_id == job_id).update(values)
+        db.commit()
+    finally:
+        db.close()
+
+
+def mark_done(job_id: UUID, stage_timings: Dict[str, float]):
+    _finish(job_id, {
+        "status": "DONE",
+        "stage_timings": stage_timings,
+        "finished_at": func.now(),
+        "error": None,
+    })
+
+
+def mark_failed(job: ClaimedJob, error: str, stage_timings: Dict[str, float], retryable: bool = True):
+    # 재시도 가능하면 PENDING 으로 되돌림 (created_at 유지 → 같은 room 의 다음 job 보다 먼저 실행)
+    # retryable=False: 이미 커밋된 단계가 있어 다시 실행하면 노드 / 엣지 / delta 가 중복되는 경우 → 바로 FAILED
+    retry = retryable and job.attempts < settings.PIPELINE_MAX_ATTEMPTS
+    _finish(job.job_id, {
+        "status": "PENDING" if retry else "FAILED",
+        "stage_timings": stage_timings,
+        "finished_at": None if retry else func.now(),
+        "error": error[:2000],
+    })
+    logger.warning(
+        f"[JOB:FAILED] job={job.job_id} room={job.room_id} "
+        f"attempt={job.attempts} retry={retry} error={error}"
+    )
+
+
+def release_job(job_id: UUID):
+    """worker 종료로 중단된 job 을 시도 횟수 차감 없이 되돌림 (커밋된 단계가 없을 때만 호출)"""
+    _finish(job_id, {
+        "status": "PENDING",
+        "attempts": PipelineJob.attempts - 1,
+        "started_at": None,
+        "worker": None,
+    })
+
+
+def recover_stale_jobs() -> int:
+    """
+    lease(PIPELINE_JOB_LEASE_SEC) 동안 heartbeat 가 없는 RUNNING job (worker crash 등) 을 재시도 / 실패 처리.
+    오래 걸려도 heartbeat 중인 job 은 건드리지 않고, 커밋된 단계가 있으면 재실행하지 않고 FAILED.
+    """
+    db = SessionLocal()
+    try:
+        now = db.query(func.localtimestamp()).scalar()  # heartbeat_at 등과 같은 naive timestamp
+        committed = PipelineJob.committed_phases.isnot(None)
+        retry = and_(PipelineJob.committed_phases.is_(None), PipelineJob.attempts < settings.PIPELINE_MAX_ATTEMPTS)
+        count = db.query(PipelineJob).filter(
+            PipelineJob.status == "RUNNING",
+            func.coalesce(PipelineJob.heartbeat_at, PipelineJob.started_at)
+            < now - timedelta(seconds=settings.PIPELINE_JOB_LEASE_SEC),
+        ).update({
+            "status": case((retry, "PENDING"), else_="FAILED"),
+            "finished_at": case((retry, null()), else_=func.now()),
+            "error": case((committed, "lease expired: worker lost after commit"), else_="lease expired: worker lost"),
+        }, synchronize_session=False)
+        db.commit()
+        if count:
+            logger.warning(f"[JOB:RECOVER] stale running jobs={count}")
+        return count
+    finally:
+        db.close()
+
+
+# =================================================
+# metrics
+# =================================================
+def queue_stats(db: Session, window_sec: float = 900, limit: int = 1000) -> dict:
+    """
+    상태별 job 수, 가장 오래 기다린 PENDING job 나이,
+    최근 window 안에 끝난 job 의 대기 / 실행 / 단계별 소요시간 분포 (ms) 와 합쳐진 중복 발화 수.
+    """
+    depth = dict(
+        db.query(PipelineJob.status, func.count())
+        .group_by(PipelineJob.status)
+        .all()
+    )
+    oldest_pending = (
+        db.query(func.min(PipelineJob.created_at))
+        .filter(PipelineJob.status == "PENDING")
+        .scalar()
+    )
+    now = db.query(func.localtimestamp()).scalar()  # created_at 등과 같은 naive timestamp
+
+    finished = (
+        db.query(
+            PipelineJob.created_at, PipelineJob.started_at, PipelineJob.finished_at,
+            PipelineJob.stage_timings, PipelineJob.coalesced,
+        )
+        .filter(
+            PipelineJob.status == "DONE",
+            PipelineJob.finished_at >= now - timedelta(seconds=window_sec),
+        )
+        .order_by(PipelineJob.finished_at.desc())
+        .limit(limit)
+        .all()
+    )
+
+    wait, run = [], []
+    stages: Dict[str, List[float]] = {}
+    coalesced = 0
+    for created_at, started_at, finished_at, timings, job_coalesced in finished:
+        coalesced += job_coalesced or 0
+        wait.append((started_at - created_at).total_seconds() * 1000)
+        run.append((finished_at - started_at).total_seconds() * 1000)
+        for name, ms in (timings or {}).items():
+            stages.setdefault(name, []).append(ms)
+
+    return {
+        "depth": {status: depth.get(status, 0) for status in ("PENDING", "RUNNING", "DONE", "FAILED")},
+        "oldest_pending_sec": round((now - oldest_pending).total_seconds(), 1) if oldest_pending else None,
+        "window_sec": window_sec,
+        "wait_ms": percentiles(wait),
+        "run_ms": percentiles(run),
+        "stages_ms": {name: percentiles(values) for name, values in stages.items()},
+        "coalesced_utterances": coalesced,
+    }
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.dialects.postgresql import insert
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.models.llm_cache import LLMCacheEntry
+from app.db.session import SessionLocal
+from app.utils.text_similarity import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+def template_hash(template: str) -> str:
+    return hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+
+
+class LLMCache:
+    """
+    LLM 응답 캐시 (파싱된 JSON dict 단위).
+    - 1차: 프로세스 memory LRU (LLM_CACHE_MAX_ENTRIES)
+    - 2차: LLM_CACHE_BACKEND=postgres 면 llm_cache 테이블 (여러 프로세스 / 재시작 간 공유)
+    - key = sha256(kind, 프롬프트 템플릿 hash, model, temperature, 정규화된 입력들)
+      → 프롬프트 파일이나 모델이 바뀌면 자연히 다른 key
+    - 모든 entry 는 LLM_CACHE_TTL_SEC 후 만료
+    event loop 에서만 호출 (DB tier 는 threadpool).
+    """
+
+    _PURGE_INTERVAL_SEC = 300
+
+    def __init__(self, max_entries: int, ttl_sec: int, backend: str):
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.backend = backend
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()  # key -> (expires_at, json)
+        self._last_purge = 0.0
+
+        self.hits_memory = 0
+        self.hits_db = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.errors = 0
+
+    @staticmethod
+    def make_key(kind: str, template: str, model: str, temperature: float, *inputs: str) -> str:
+        raw = json.dumps(
+            [kind, template_hash(template), model, temperature, [normalize_text(v) for v in inputs]],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, body = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits_memory += 1
+                return json.loads(body)
+            del self._entries[key]
+
+        if self.backend == "postgres":
+            try:
+                found = await run_in_threadpool(self._db_get, key)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"[LLM:CACHE] db get 실패: {e!r}")
+                found = None
+            if found is not None:
+                response, expires_at = found
+                self._remember(key, response, expires_at.timestamp())
+                self.hits_db += 1
+                return response
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, kind: str, model: str, response: dict):
+        expires_at = time.time() + self.ttl_sec
+        self._remember(key, response, expires_at)
+        self.stores += 1
+
+        if self.backend == "postgres":
+            try:
+                await run_in_threadpool(self._db_set, key, kind, model, response)
+            except Exception as e:
+                self.errors += 1
+                logger.warning(f"[LLM:CACHE] db set 실패: {e!r}")
+
+    def _remember(self, key: str, response: dict, expires_at: float):
+        self._entries[key] = (expires_at, json.dumps(response, ensure_ascii=False))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    # =================================================
+    # postgres tier (threadpool)
+    # =================================================
+    def _db_get(self, key: str):
+        db = SessionLocal()
+        try:
+            row = (
+                db.query(LLMCacheEntry.response, LLMCacheEntry.expires_at)
+                .filter(LLMCacheEntry.cache_key == key, LLMCacheEntry.expires_at > datetime.now())
+                .first()
+            )
+            return (row.response, row.expires_at) if row else None
+        finally:
+            db.close()
+
+    def _db_set(self, key: str, kind: str, model: str, response: dict):
+        now = datetime.now()
+        values = {
+            "cache_key": key,
+            "kind": kind,
+            "model": model,
+            "response": response,
+            "created_at": now,
+            "expires_at": now + timedelta(seconds=self.ttl_sec),
+        }
+        stmt = insert(LLMCacheEntry).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[LLMCacheEntry.cache_key],
+            set_={k: stmt.excluded[k] for k in ("response", "created_at", "expires_at")},
+        )
+        db = SessionLocal()
+        try:
+            db.execute(stmt)
+            if time.monotonic() - self._last_purge > self._PURGE_INTERVAL_SEC:
+                self._last_purge = time.monotonic()
+                db.query(LLMCacheEntry).filter(LLMCacheEntry.expires_at <= now).delete(synchronize_session=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def stats(self) -> dict:
+        lookups = self.hits_memory + self.hits_db + self.misses
+        return {
+            "enabled": settings.LLM_CACHE_ENABLED,
+            "backend": self.backend,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_sec": self.ttl_sec,
+            "hits_memory": self.hits_memory,
+            "hits_db": self.hits_db,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits_memory + self.hits_db) / lookups, 4) if lookups else None,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
+
+
+llm_cache = LLMCache(
+    max_entries=settings.LLM_CACHE_MAX_ENTRIES,
+    ttl_sec=settings.LLM_CACHE_TTL_SEC,
+    backend=settings.LLM_CACHE_BACKEND,
+)
@@ -1,60 +1,287 @@
+import asyncio
 import json
+import logging
+import random
+import time
 from pathlib import Path
-from typing import List, Tuple
-from openai import OpenAI
+from typing import Any, AsyncIterator, Dict, Iterable, List, Tuple
+
+import httpx
+import openai
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 import os
-from pathlib import Path
 from app.core.config import settings
+from app.services.llm_cache import llm_cache
+from app.utils.json_stream import JsonFieldStream
+
+logger = logging.getLogger(__name__)
 
 PROJECT_DIR = Path(os.path.dirname(os.path.abspath(__file__))).parent.parent  # nodexr-server 폴더 기준
 PROMPT_DIR = PROJECT_DIR / "app/core/llm/prompts"  # 프롬프트 파일 경로
 
+# 재시도하면 성공할 수 있는 오류 (타임아웃 / 연결 / 429 / 5xx)
+RETRYABLE_ERRORS = (
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+BASIC_FIELDS = ("root_label", "categories", "sketch_prompt")
+CATEGORY_FIELDS = ("keyword", "image_prompt")
+CATEGORY_BATCH_FIELDS = ("keywords", "image_prompt")
+
 
 def load_prompt(filename: str) -> str:
     return (PROMPT_DIR / filename).read_text(encoding="utf-8")
 
 
+class LLMFields:
+    """
+    LLM 응답 JSON 의 최상위 필드를 완성되는 대로 받는 핸들.
+
+        fields = llm_service.category_discuss_fields(...)
+        try:
+            keyword = await fields.get("keyword")        # 나머지 필드는 계속 받는 중
+            ...
+            prompt = await fields.get("image_prompt")
+        finally:
+            await fields.aclose()
+
+    응답이 실패하거나 필드가 빠지면 아직 완성되지 않은 필드의 get() 에서 예외.
+    """
+
+    def __init__(self, source: AsyncIterator[Tuple[str, Any]], names: Iterable[str]):
+        loop = asyncio.get_running_loop()
+        self._futures: Dict[str, asyncio.Future] = {name: loop.create_future() for name in names}
+        self._task = asyncio.create_task(self._consume(source))
+
+    async def _consume(self, source: AsyncIterator[Tuple[str, Any]]):
+        try:
+            async for key, value in source:
+                future = self._futures.get(key)
+                if future and not future.done():
+                    future.set_result(value)
+            missing = [name for name, future in self._futures.items() if not future.done()]
+            if missing:
+                raise ValueError(f"LLM 응답에 필드 없음: {missing}")
+        except asyncio.CancelledError:
+            for future in self._futures.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in self._futures.values():
+                if not future.done():
+                    future.set_exception(e)
+                    future.exception()  # get() 하지 않은 필드로 "never retrieved" 경고가 나지 않도록
+
+    async def get(self, name: str) -> Any:
+        return await asyncio.shield(self._futures[name])
+
+    async def aclose(self):
+        # 필드를 다 받았으면 스트림 마무리(캐시 저장 등)는 끝까지 기다리고, 아니면 취소
+        if not self._task.done() and not all(future.done() for future in self._futures.values()):
+            self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
 class LLMService:
-    def __init__(self):
-        self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    """
+    AsyncOpenAI 기반 LLM 호출 (event loop 를 막지 않음).
+    - HTTP 커넥션 풀 1개를 프로세스 전체가 공유
+    - 동시 요청 수는 LLM_MAX_CONCURRENCY 로 제한
+    - LLM_DEADLINE_SEC 안에서 요청마다 남은 시간만큼만 기다리고, 일시적 오류는 jitter 백오프로 재시도
+    - LLM_STREAMING 이면 *_fields() 가 스트리밍으로 받아 필드가 완성되는 즉시 넘겨줌
+    - 같은 템플릿 / 모델 / 정규화된 입력의 응답은 llm_cache 에서 (bypass_cache=True 면 항상 새로 생성)
+    """
+
+    def __init__(self, client: AsyncOpenAI | None = None):
+        self.client = client or AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            max_retries=0,  # 재시도는 deadline 안에서 직접
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.LLM_HTTP_MAX_CONNECTIONS,
+                ),
+            ),
+        )
         self.model = settings.OPENAI_MODEL
+        self.temperature = 0.7
+        self._slots = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
 
         self.basic_prompt_tpl = load_prompt("basic_discuss.txt")
         self.category_prompt_tpl = load_prompt("category_discuss.txt")
+        self.category_batch_prompt_tpl = load_prompt("category_discuss_batch.txt")
 
-    def _call_openai(self, prompt: str) -> dict:
-        print("_call_openai 호출")
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": settings.GRAPH_SYSTEM_PROMPT},
-                {"role": "user", "content": prompt},
-            ],
-            temperature=0.7,
-        )
+    async def aclose(self):
+        await self.client.close()
+
+    async def _create(self, deadline: float, **kwargs):
+        """chat.completions.create + deadline 안에서 일시적 오류 재시도 (slot 은 호출한 쪽에서)"""
+        attempt = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"LLM deadline exceeded ({settings.LLM_DEADLINE_SEC}s)")
+
+            try:
+                return await self.client.chat.completions.create(
+                    model=self.model,
+                    temperature=self.temperature,
+                    timeout=min(settings.LLM_REQUEST_TIMEOUT_SEC, remaining),
+                    **kwargs,
+                )
+            except RETRYABLE_ERRORS as e:
+                attempt += 1
+                if attempt > settings.LLM_MAX_RETRIES:
+                    raise
+                delay = self._backoff(attempt, e)
+                if time.monotonic() + delay >= deadline:
+                    raise
+                logger.warning(f"[LLM:RETRY] attempt={attempt} delay={delay:.2f}s error={e!r}")
+                await asyncio.sleep(delay)
+
+    @staticmethod
+    def _messages(prompt: str) -> list:
+        return [
+            {"role": "system", "content": settings.GRAPH_SYSTEM_PROMPT},
+            {"role": "user", "content": prompt},
+        ]
+
+    async def _call_openai(self, prompt: str) -> dict:
+        deadline = time.monotonic() + settings.LLM_DEADLINE_SEC
+        async with self._slots:
+            response = await self._create(deadline, messages=self._messages(prompt))
 
         content = response.choices[0].message.content
 
         try:
-            print("openai 응답", content)
+            logger.info(f"[LLM] openai 응답 {content}")
             return json.loads(content)
         except json.JSONDecodeError:
             raise ValueError(f"OpenAI 응답 JSON 파싱 실패:\n{content}")
 
+    async def _stream_openai(self, prompt: str) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        stream=True 로 받으면서 최상위 JSON 필드가 완성될 때마다 (key, value) 를 내보낸다.
+        재시도는 스트림이 열리기 전까지만 (이미 내보낸 필드를 되돌릴 수 없으므로).
+        """
+        deadline = time.monotonic() + settings.LLM_DEADLINE_SEC
+        async with self._slots:
+            stream = await self._create(deadline, messages=self._messages(prompt), stream=True)
+            parser = JsonFieldStream()
+            content = []
+            chunks = stream.__aiter__()
+            try:
+                while not parser.done:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"LLM deadline exceeded ({settings.LLM_DEADLINE_SEC}s)")
+                    try:
+                        chunk = await asyncio.wait_for(anext(chunks), timeout=remaining)
+                    except StopAsyncIteration:
+                        break
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        content.append(delta)
+                        for field in parser.feed(delta):
+                            yield field
+            finally:
+                close = getattr(stream, "close", None)
+                if close:
+                    await close()
+
+        logger.info(f"[LLM] openai 응답(stream) {''.join(content)}")
+        if not parser.done:
+            raise ValueError(f"OpenAI 응답 JSON 파싱 실패 (stream):\n{''.join(content)}")
+
+    async def _result_fields(self, prompt: str) -> AsyncIterator[Tuple[str, Any]]:
+        for field in (await self._call_openai(prompt)).items():
+            yield field
+
+    def _cache_key(self, kind: str, template: str, *inputs: str) -> str:
+        return llm_cache.make_key(kind, template, self.model, self.temperature, *inputs)
+
+    def _use_cache(self, bypass_cache: bool) -> bool:
+        return settings.LLM_CACHE_ENABLED and not bypass_cache
+
+    async def _cached_fields(
+        self, kind: str, key: str, prompt: str, names: Tuple[str, ...], bypass_cache: bool,
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        use_cache = self._use_cache(bypass_cache)
+        if use_cache:
+            cached = await llm_cache.get(key)
+            if cached is not None:
+                for field in cached.items():
+                    yield field
+                return
+
+        source = self._stream_openai(prompt) if settings.LLM_STREAMING else self._result_fields(prompt)
+        result = {}
+        async for name, value in source:
+            result[name] = value
+            yield name, value
+
+        if use_cache and all(name in result for name in names):
+            await llm_cache.set(key, kind, self.model, result)
+
+    async def _complete(
+        self, kind: str, key: str, prompt: str, names: Tuple[str, ...], bypass_cache: bool,
+    ) -> dict:
+        use_cache = self._use_cache(bypass_cache)
+        if use_cache:
+            cached = await llm_cache.get(key)
+            if cached is not None:
+                return cached
+
+        result = await self._call_openai(prompt)
+        if use_cache and all(name in result for name in names):
+            await llm_cache.set(key, kind, self.model, result)
+        return result
+
+    @staticmethod
+    def _backoff(attempt: int, error: Exception) -> float:
+        # 429 에 Retry-After 가 있으면 그만큼, 아니면 full jitter 지수 백오프
+        response = getattr(error, "response", None)
+        retry_after = response.headers.get("retry-after") if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), settings.LLM_RETRY_MAX_SEC)
+            except ValueError:
+                pass
+        cap = min(settings.LLM_RETRY_MAX_SEC, settings.LLM_RETRY_BASE_SEC * 2 ** (attempt - 1))
+        return random.uniform(0, cap)
+
     # =================================================
     # 1️⃣ BASIC_DISCUSS
     # =================================================
-    def basic_discuss(
+    def _basic_prompt(self, room_topic: str, utterance: str) -> str:
+        return self.basic_prompt_tpl \
+            .replace("{{ROOM_TOPIC}}", room_topic) \
+            .replace("{{UTTERANCE}}", utterance)
+
+    def basic_discuss_fields(self, room_topic: str, utterance: str, bypass_cache: bool = False) -> "LLMFields":
+        """root_label → categories → sketch_prompt 순으로 완성되는 대로 받기"""
+        key = self._cache_key("basic_discuss", self.basic_prompt_tpl, room_topic, utterance)
+        source = self._cached_fields(
+            "basic_discuss", key, self._basic_prompt(room_topic, utterance), BASIC_FIELDS, bypass_cache,
+        )
+        return LLMFields(source, BASIC_FIELDS)
+
+    async def basic_discuss(
         self,
         room_topic: str,
-        utterance: str
+        utterance: str,
+        bypass_cache: bool = False,
     ) -> Tuple[str, List[str], str]:
 
-        prompt = self.basic_prompt_tpl \
-            .replace("{{ROOM_TOPIC}}", room_topic) \
-            .replace("{{UTTERANCE}}", utterance)
-
-        result = self._call_openai(prompt)
+        key = self._cache_key("basic_discuss", self.basic_prompt_tpl, room_topic, utterance)
+        result = await self._complete(
+            "basic_discuss", key, self._basic_prompt(room_topic, utterance), BASIC_FIELDS, bypass_cache,
+        )
 
         return (
             result["root_label"],
@@ -65,22 +292,55 @@ class LLMService:
     # =================================================
     # 2️⃣ CATEGORY_DISCUSS
     # =================================================
-    def category_discuss(
+    def _category_prompt(self, category_name: str, utterance: str) -> str:
+        return self.category_prompt_tpl \
+            .replace("{{CATEGORY_NAME}}", category_name) \
+            .replace("{{UTTERANCE}}", utterance)
+
+    def category_discuss_fields(self, category_name: str, utterance: str, bypass_cache: bool = False) -> "LLMFields":
+        """keyword → image_prompt 순으로 완성되는 대로 받기"""
+        key = self._cache_key("category_discuss", self.category_prompt_tpl, category_name, utterance)
+        source = self._cached_fields(
+            "category_discuss", key, self._category_prompt(category_name, utterance), CATEGORY_FIELDS, bypass_cache,
+        )
+        return LLMFields(source, CATEGORY_FIELDS)
+
+    async def category_discuss(
         self,
         category_name: str,
-        utterance: str
+        utterance: str,
+        bypass_cache: bool = False,
     ) -> Tuple[str, str]:
 
-        prompt = self.category_prompt_tpl \
-            .replace("{{CATEGORY_NAME}}", category_name) \
-            .replace("{{UTTERANCE}}", utterance)
-
-        result = self._call_openai(prompt)
+        key = self._cache_key("category_discuss", self.category_prompt_tpl, category_name, utterance)
+        result = await self._complete(
+            "category_discuss", key, self._category_prompt(category_name, utterance), CATEGORY_FIELDS, bypass_cache,
+        )
 
         return (
             result["keyword"],
             result["image_prompt"],
         )
 
+    # =================================================
+    # 3️⃣ CATEGORY_DISCUSS (micro-batch: 발화 여러 개 → LLM 1회)
+    # =================================================
+    def _category_batch_prompt(self, category_name: str, utterances: List[str]) -> str:
+        lines = "\n".join(f"{i}. {u}" for i, u in enumerate(utterances, start=1))
+        return self.category_batch_prompt_tpl \
+            .replace("{{CATEGORY_NAME}}", category_name) \
+            .replace("{{UTTERANCES}}", lines)
+
+    def category_discuss_batch_fields(
+        self, category_name: str, utterances: List[str], bypass_cache: bool = False,
+    ) -> "LLMFields":
+        """keywords(1개 이상) → image_prompt(공유) 순으로 완성되는 대로 받기"""
+        key = self._cache_key("category_discuss_batch", self.category_batch_prompt_tpl, category_name, *utterances)
+        source = self._cached_fields(
+            "category_discuss_batch", key, self._category_batch_prompt(category_name, utterances),
+            CATEGORY_BATCH_FIELDS, bypass_cache,
+        )
+        return LLMFields(source, CATEGORY_BATCH_FIELDS)
+
 
-llm_service = LLMService()
\ No newline at end of file
+llm_service = LLMService()
@@ -13,7 +13,7 @@ from uuid import UUID
 from sqlalchemy.orm import Session
 
 from app.db.models.asset import Asset
-from app.storage.minio import get_object_bytes, upload_image_bytes
+from app.storage.object_store import object_store, to_object_key
 
 logger = logging.getLogger(__name__)
 
@@ -49,7 +49,7 @@ def _minio_image_to_data_uri(
     logger.info("[MESHY][STEP 1] Load image from MinIO")
     logger.info(f"[MESHY][STEP 1] img_url={img_url}")
 
-    data = get_object_bytes(img_url)
+    data = object_store.backend.get(to_object_key(img_url))  # 동기 endpoint (threadpool)
     size = len(data)
     logger.info(f"[MESHY][STEP 1] Image bytes loaded (size={size})")
 
@@ -206,11 +206,8 @@ def generate_3d(asset_id: UUID, db: Session) -> str:
     object_key = f"nodexr-assets/3d/{uuid.uuid4()}.glb"
     logger.info(f"[MESHY][STEP 5] Upload GLB to MinIO object_key={object_key}")
 
-    upload_image_bytes(
-        data=glb_bytes,
-        object_key=object_key,
-        content_type="model/gltf-binary",
-    )
+    # part_size 보다 큰 GLB 는 multipart 병렬 업로드
+    object_store.backend.put(object_key, glb_bytes, "model/gltf-binary")
 
     # 6️⃣ Unity용 plain URL
     plain_url = _build_plain_url(object_key)
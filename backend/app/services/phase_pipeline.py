@@ -0,0 +1,507 @@
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, List, Sequence, Tuple, TypeVar
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.db.session import SessionLocal
+from app.schemas.utterance import PhaseType
+from app.db.models.room import Room
+from app.db.models.category import Category
+from app.db.models.node import Node
+from app.db.models.category_detail import CategoryDetail
+from app.db.models.asset import Asset
+from app.db.models.edge import Edge
+
+from app.services.llm_service import llm_service
+from app.services.image_service import image_service
+from app.services.graph_builder import category_node_item, asset_node_item, edge_item
+from app.services.graph_cache import graph_cache
+from app.services.graph_events import graph_event_publisher
+from app.services.graph_snapshots import write_snapshot
+from app.services.job_queue import record_committed
+from app.utils.keyed_lock import KeyedLock
+from app.utils.timing import StageTimer
+
+logger = logging.getLogger(__name__)
+
+# 같은 room 의 파이프라인은 발화 순서대로 하나씩 (category order / ACTIVE category / CURR_2D_CORE 를
+# 읽고 쓰는 구간이 겹치지 않도록), 다른 room 은 병렬
+room_serial = KeyedLock()
+
+T = TypeVar("T")
+
+# 현재 파이프라인 실행에서 커밋까지 끝난 DB 단계 (db_read 제외).
+# 하나라도 있으면 재실행 시 CATEGORY 노드 / 엣지 / delta 가 중복되므로 호출한 쪽이 재시도하지 않는다
+_committed_phases: ContextVar[List[str] | None] = ContextVar("committed_phases", default=None)
+# 이 실행을 맡은 pipeline_jobs (있으면 커밋된 단계를 같은 트랜잭션에서 job row 에도 기록)
+_pipeline_job_ids: ContextVar[Sequence[UUID]] = ContextVar("pipeline_job_ids", default=())
+
+
+def _get_active_category(db: Session, room_id: UUID) -> Category | None:
+    return db.query(Category).filter(Category.room_id == room_id, Category.phase == "ACTIVE").first()
+
+
+async def run_phase_pipeline(
+    room_id: UUID,
+    phase: PhaseType,
+    text: str | List[str],
+    timer: StageTimer | None = None,
+    committed: List[str] | None = None,
+    job_ids: Sequence[UUID] = (),
+):
+    """
+    3) BASIC_DISCUSS / CATEGORY_DISCUSS 흐름 구현
+    같은 room 은 호출 순서대로 직렬 실행된다.
+    timer 를 넘기면 단계별 소요시간(ms)을 기록한다 (pipeline_jobs.stage_timings).
+    committed 를 넘기면 커밋된 DB 단계 이름을 순서대로 기록한다 (실패 / 취소 후 재시도 가능 여부 판단용).
+    job_ids 를 넘기면 같은 목록을 각 단계와 같은 트랜잭션으로 pipeline_jobs.committed_phases 에도 남긴다
+    (worker 가 죽은 뒤 recover_stale_jobs 가 판단할 수 있도록).
+    CATEGORY_DISCUSS 는 text 로 발화 여러 개(micro-batch)를 넘기면 LLM 1회로 키워드 1개 이상을 만들고
+    이미지 후보 1세트를 그 키워드 노드들이 공유한다.
+    """
+    timer = timer or StageTimer()
+    token = _committed_phases.set(committed if committed is not None else [])
+    jobs_token = _pipeline_job_ids.set(tuple(job_ids))
+    t0 = time.perf_counter()
+    try:
+        async with room_serial.hold(room_id):
+            timer.add("room_wait", (time.perf_counter() - t0) * 1000)
+            await _run_phase_pipeline(room_id, phase, text, timer)
+    finally:
+        _pipeline_job_ids.reset(jobs_token)
+        _committed_phases.reset(token)
+
+
+async def _db_phase(room_id: UUID, timer: StageTimer, stage: str, fn: Callable[..., T], *args) -> T:
+    """
+    외부 호출(LLM / 이미지) 사이의 짧은 DB 구간: fn(db, *args) 를 한 트랜잭션으로 실행하고 커밋.
+    - LLM / 이미지를 기다리는 동안에는 커넥션도 트랜잭션도 잡고 있지 않는다
+    - threadpool 에서 실행 → 풀이 비어 checkout 을 기다려도 event loop 는 막히지 않는다
+    실패하면 롤백하고, 이 구간에서 갱신한 캐시 상태(last_snapshot 등)가 있을 수 있으므로 graph_cache 무효화.
+    커밋되면 (db_read 가 아닌 경우) stage 를 _committed_phases 에 기록 (job row 에는 같은 트랜잭션으로).
+    graph_cache 노드 / 엣지 반영과 delta 전송은 호출한 쪽에서 커밋 이후에.
+    """
+    committed = _committed_phases.get()
+    job_ids = _pipeline_job_ids.get() if stage != "db_read" else ()
+
+    def run() -> T:
+        db = SessionLocal()
+        try:
+            with timer.stage(stage):
+                result = fn(db, *args)
+                if job_ids:
+                    record_committed(db, job_ids, [*(committed or ()), stage])
+                db.commit()
+            return result
+        except Exception:
+            db.rollback()
+            graph_cache.invalidate(room_id)
+            raise
+        finally:
+            db.close()
+
+    result = await run_in_threadpool(run)
+    if committed is not None and stage != "db_read":
+        committed.append(stage)
+    return result
+
+
+async def _run_phase_pipeline(room_id: UUID, phase: PhaseType, text: str | List[str], timer: StageTimer):
+    texts = [text] if isinstance(text, str) else list(text)
+    logger.info(f"[PIPELINE START] run_phase_pipeline room={room_id}, phase={phase}, utterances={len(texts)}")
+    room_topic = await _db_phase(room_id, timer, "db_read", _load_room_topic, room_id)
+    if room_topic is None:
+        return
+
+    if phase == PhaseType.BASIC_DISCUSS:
+        await _pipeline_basic_discuss(room_id, room_topic, "\n".join(texts), timer)
+    else:
+        await _pipeline_category_discuss(room_id, texts, timer)
+
+
+async def _pipeline_basic_discuss(room_id: UUID, room_topic: str, text: str, timer: StageTimer):
+    logger.info(f"[PIPELINE START] _pipeline_basic_discuss")
+
+    # 3-1) LLM: 루트 라벨 + 카테고리들 + 스케치 프롬프트 (스트리밍, 완성된 필드부터 처리)
+    fields = llm_service.basic_discuss_fields(room_topic, text)
+    try:
+        with timer.stage("llm"):
+            root_label = await fields.get("root_label")
+            categories = await fields.get("categories")
+
+        # 3-2~4) categories / 루트 CATEGORY 노드 / category_details
+        root = await _db_phase(room_id, timer, "db_keyword", _insert_root_keyword, room_id, root_label, categories)
+        graph_cache.apply(room_id, nodes=root.nodes)
+        logger.info(f"DB update 완료 - nodes, categories, category_details")
+
+        # 3-5) 루트 노드 delta WS 전송 (커밋된 뒤, sketch_prompt 는 아직 받는 중일 수 있음)
+        with timer.stage("broadcast_keyword"):
+            await graph_event_publisher.publish_delta(
+                room_id,
+                "NODE_KEYWORD_UPDATE",
+                root.version,
+                nodes=root.nodes,
+            )
+        logger.info(f"NODE_KEYWORD_UPDATE ws 전송")
+
+        with timer.stage("llm_rest"):
+            sketch_prompt = await fields.get("sketch_prompt")
+    finally:
+        await fields.aclose()
+
+    # 3-6~12) NanoBanana: 이미지 후보군 3개 생성, 완성되는 대로 한 장씩
+    #         ASSET 노드 + assets + edges insert → NODE_IMAGE_UPDATE 전송, 마지막에 graph_snapshot 저장
+    await _deliver_images(
+        room_id, timer, image_service.iter_images(sketch_prompt, n=3, timer=timer),
+        root.node_id, root.category_detail_id, "2D_ROOT_CANDIDATE",
+    )
+
+
+async def _pipeline_category_discuss(room_id: UUID, texts: List[str], timer: StageTimer):
+    logger.info(f"_pipeline_category_discuss utterances={len(texts)}")
+    # -------------------------------------------------
+    # 1. 현재 ACTIVE 카테고리 조회
+    # -------------------------------------------------
+    active = await _db_phase(room_id, timer, "db_read", _load_active_category, room_id)
+    if not active:
+        return
+    active_id, active_name = active
+    logger.info(f"ACTIVE 카테고리 조회")
+
+    # -------------------------------------------------
+    # 2. LLM 호출 (카테고리 발화, 스트리밍)
+    #    keyword 가 완성되면 image_prompt 를 기다리지 않고 바로 3~6 진행
+    #    발화가 여러 개(micro-batch)면 LLM 1회로 keywords 1개 이상
+    # -------------------------------------------------
+    if len(texts) == 1:
+        fields = llm_service.category_discuss_fields(active_name, texts[0])
+    else:
+        fields = llm_service.category_discuss_batch_fields(active_name, texts)
+    try:
+        with timer.stage("llm"):
+            if len(texts) == 1:
+                keywords = [await fields.get("keyword")]
+            else:
+                keywords = _clean_keywords(await fields.get("keywords"), limit=len(texts))
+        logger.info(f"llm keyword 수신 - {keywords}")
+
+        # -------------------------------------------------
+        # 3~5. CATEGORY 노드 / core → category 엣지 / category_details (키워드마다)
+        # -------------------------------------------------
+        categories = await _db_phase(
+            room_id, timer, "db_keyword", _insert_category_keywords, room_id, active_id, keywords,
+        )
+        keyword_nodes = [n for c in categories for n in c.nodes]
+        keyword_edges = [e for c in categories for e in c.edges]
+        graph_cache.apply(room_id, nodes=keyword_nodes, edges=keyword_edges)
+        logger.info(f"DB update 완료 - categories, category_details")
+
+        # -------------------------------------------------
+        # 6. 노드 키워드 업데이트 WS 전송
+        #    (새 CATEGORY 노드 + core → category 엣지만 delta 로)
+        # -------------------------------------------------
+        with timer.stage("broadcast_keyword"):
+            await graph_event_publisher.publish_delta(
+                room_id,
+                "NODE_KEYWORD_UPDATE",
+                categories[0].version,
+                nodes=keyword_nodes,
+                edges=keyword_edges,
+            )
+        logger.info(f"NODE_KEYWORD_UPDATE ws 전송")
+
+        with timer.stage("llm_rest"):
+            prompt = await fields.get("image_prompt")
+        logger.info(f"llm 호출 완료 - {keywords}, {prompt}")
+    finally:
+        await fields.aclose()
+
+    # -------------------------------------------------
+    # 7. 카테고리 이미지 생성 (의미 분리된 함수, batch 여도 1세트)
+    # 8~10. 완성되는 대로 한 장씩 ASSET 노드 / asset / edge insert → NODE_IMAGE_UPDATE 전송,
+    #       마지막에 graph_snapshot 생성
+    #       (asset 은 첫 키워드 소속, 나머지 키워드 노드에서도 엣지 연결)
+    # -------------------------------------------------
+    category = categories[0]
+    logger.info(f"나노바나나 호출")
+    await _deliver_images(
+        room_id, timer,
+        image_service.iter_category_images(
+            prompt=prompt,
+            n=3,
+            room_id=room_id,
+            core_img_url=category.core_img_url,
+            core_asset_id=category.core_asset_id,
+            timer=timer,
+        ),
+        category.node_id, category.category_detail_id, "2D_CATEGORY_CANDIDATE",
+        [c.node_id for c in categories[1:]],
+    )
+
+
+async def _deliver_images(
+    room_id: UUID,
+    timer: StageTimer,
+    keys: AsyncIterator[str],
+    parent_node_id: UUID,
+    category_detail_id: UUID,
+    asset_type: str,
+    shared_parent_node_ids: Sequence[UUID] = (),
+):
+    """
+    이미지가 업로드되는 대로 한 장씩 DB 반영 + NODE_IMAGE_UPDATE delta 전송 (가장 느린 후보를 기다리지 않음).
+    다 끝나면 graph_snapshot 1회 저장 → snapshot id 를 담은 빈 NODE_IMAGE_UPDATE 로 마무리.
+    timer: image = 생성 시작 ~ 마지막 이미지 반영, image_first = 첫 이미지 도착까지
+    """
+    t0 = time.perf_counter()
+    delivered = 0
+    try:
+        with timer.stage("image"):
+            async for key in keys:
+                if not delivered:
+                    timer.add("image_first", (time.perf_counter() - t0) * 1000)
+                assets = await _db_phase(
+                    room_id, timer, "db_image", _insert_assets,
+                    room_id, [key], parent_node_id, category_detail_id, asset_type, shared_parent_node_ids,
+                )
+                graph_cache.apply(room_id, nodes=assets.nodes, edges=assets.edges)
+                with timer.stage("broadcast_image"):
+                    await graph_event_publisher.publish_delta(
+                        room_id,
+                        "NODE_IMAGE_UPDATE",
+                        assets.version,
+                        nodes=assets.nodes,
+                        edges=assets.edges,
+                    )
+                delivered += 1
+                logger.info(f"NODE_IMAGE_UPDATE ws 전송 ({delivered})")
+    finally:
+        await keys.aclose()
+
+    snapshot = await _db_phase(room_id, timer, "db_snapshot", _write_graph_snapshot, room_id)
+    logger.info(f"DB 업데이트 완료 - nodes, edges, assets ({delivered}), graph_snapshots")
+
+    with timer.stage("broadcast_image"):
+        await graph_event_publisher.publish_delta(
+            room_id,
+            "NODE_IMAGE_UPDATE",
+            snapshot.version,
+            graph_snapshot_id=snapshot.graph_snapshot_id,
+        )
+
+
+def _clean_keywords(keywords, limit: int) -> List[str]:
+    # batch 응답의 keywords: 문자열 배열이 아니거나 비어 있으면 실패 (job 재시도)
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    cleaned = []
+    for keyword in keywords or []:
+        keyword = str(keyword).strip()
+        if keyword and keyword not in cleaned:
+            cleaned.append(keyword)
+    if not cleaned:
+        raise ValueError(f"LLM batch 응답에 keywords 없음: {keywords!r}")
+    return cleaned[:limit]
+
+
+# =================================================
+# DB 구간 (_db_phase 로 threadpool 에서 실행, 커밋 후 ORM 객체 대신 id / delta 만 반환)
+# delta 를 만드는 구간은 같은 트랜잭션에서 graph version 을 발급해 함께 반환
+# =================================================
+@dataclass
+class KeywordRows:
+    node_id: UUID
+    category_detail_id: UUID
+    nodes: List[dict]
+    edges: List[dict] = field(default_factory=list)
+    core_img_url: str | None = None
+    core_asset_id: UUID | None = None
+    version: int = 0
+
+
+@dataclass
+class AssetRows:
+    nodes: List[dict]
+    edges: List[dict]
+    version: int
+
+
+@dataclass
+class SnapshotRows:
+    graph_snapshot_id: UUID
+    version: int
+
+
+def _load_room_topic(db: Session, room_id: UUID) -> str | None:
+    room = db.query(Room).filter(Room.room_id == room_id).first()
+    return room.room_topic if room else None
+
+
+def _load_active_category(db: Session, room_id: UUID) -> Tuple[UUID, str] | None:
+    active = _get_active_category(db, room_id)
+    return (active.category_id, active.category_name) if active else None
+
+
+def _insert_root_keyword(db: Session, room_id: UUID, root_label: str, categories: List[str]) -> KeywordRows:
+    # categories insert: ROOT + categories(INACTIVE), 그리고 ROOT 카테고리 ACTIVE
+    root_cat = Category(room_id=room_id, category_name="ROOT", phase="ACTIVE")
+    db.add(root_cat)
+    db.flush()
+
+    for c in categories:
+        db.add(Category(room_id=room_id, category_name=c, phase="INACTIVE"))
+    db.flush()
+
+    # Nodes: 루트 CATEGORY 노드 1개
+    root_node = Node(room_id=room_id, node_type="CATEGORY")
+    db.add(root_node)
+    db.flush()
+
+    # category_details: ROOT 카테고리에 루트 라벨 저장
+    root_detail = CategoryDetail(
+        category_id=root_cat.category_id,
+        node_id=root_node.node_id,
+        detail_text=root_label,
+        order=1
+    )
+    db.add(root_detail)
+    db.flush()
+
+    return KeywordRows(
+        node_id=root_node.node_id,
+        category_detail_id=root_detail.category_detail_id,
+        nodes=[category_node_item(root_node.node_id, root_label, root_detail.order)],
+        version=graph_event_publisher.next_version(db, room_id),
+    )
+
+
+def _insert_category_keyword(db: Session, room_id: UUID, active_id: UUID, keyword: str) -> KeywordRows:
+    # CATEGORY 노드 생성
+    category_node = Node(
+        room_id=room_id,
+        node_type="CATEGORY"
+    )
+    db.add(category_node)
+    db.flush()
+
+    core_asset = db.query(Node.node_id, Asset.asset_id, Asset.img_url).join(
+        Asset, Asset.node_id == Node.node_id
+    ).filter(
+        Node.room_id == room_id,
+        Node.node_type == "ASSET",
+        Asset.type == "CURR_2D_CORE"
+    ).first()
+
+    edge = Edge(
+        from_node_id=core_asset.node_id,
+        to_node_id=category_node.node_id
+    )
+    db.add(edge)
+    db.flush()
+
+    # 전역 CATEGORY order 계산 (room 기준)
+    next_order = get_next_category_order(db, room_id)
+
+    # category_details insert
+    detail = CategoryDetail(
+        category_id=active_id,
+        node_id=category_node.node_id,
+        detail_text=keyword,
+        order=next_order
+    )
+    db.add(detail)
+    db.flush()
+
+    return KeywordRows(
+        node_id=category_node.node_id,
+        category_detail_id=detail.category_detail_id,
+        nodes=[category_node_item(category_node.node_id, keyword, next_order)],
+        edges=[edge_item(edge.edge_id, edge.from_node_id, edge.to_node_id)],
+        core_img_url=core_asset.img_url,
+        core_asset_id=core_asset.asset_id,
+    )
+
+
+def _insert_category_keywords(
+    db: Session, room_id: UUID, active_id: UUID, keywords: Sequence[str],
+) -> List[KeywordRows]:
+    # 키워드마다 CATEGORY 노드 (같은 트랜잭션, order 는 키워드 순서대로), delta 는 하나로 묶어 전송
+    rows = [_insert_category_keyword(db, room_id, active_id, keyword) for keyword in keywords]
+    version = graph_event_publisher.next_version(db, room_id)
+    for row in rows:
+        row.version = version
+    return rows
+
+
+def _insert_assets(
+    db: Session,
+    room_id: UUID,
+    urls: List[str],
+    parent_node_id: UUID,
+    category_detail_id: UUID,
+    asset_type: str,
+    shared_parent_node_ids: Sequence[UUID] = (),
+) -> AssetRows:
+    # ASSET 노드 + assets + (parent CATEGORY → ASSET) edges insert
+    # shared_parent_node_ids: 같은 이미지를 공유하는 다른 CATEGORY 노드들 (micro-batch) → ASSET 엣지 추가
+    asset_rows = []
+    shared_edges = []
+    for url in urls:
+        asset_node = Node(room_id=room_id, node_type="ASSET")
+        db.add(asset_node)
+        db.flush()
+
+        db.add(Asset(
+            node_id=asset_node.node_id,
+            category_detail_id=category_detail_id,
+            img_url=url,
+            type=asset_type
+        ))
+
+        asset_edge = Edge(from_node_id=parent_node_id, to_node_id=asset_node.node_id)
+        db.add(asset_edge)
+
+        asset_rows.append((asset_node, asset_edge, url))
+
+        for shared_parent_id in shared_parent_node_ids:
+            shared_edge = Edge(from_node_id=shared_parent_id, to_node_id=asset_node.node_id)
+            db.add(shared_edge)
+            shared_edges.append(shared_edge)
+
+    db.flush()
+    delta_nodes = [asset_node_item(n.node_id, url, parent_node_id) for n, _, url in asset_rows]
+    delta_edges = [edge_item(e.edge_id, e.from_node_id, e.to_node_id) for _, e, _ in asset_rows]
+    delta_edges += [edge_item(e.edge_id, e.from_node_id, e.to_node_id) for e in shared_edges]
+
+    return AssetRows(nodes=delta_nodes, edges=delta_edges, version=graph_event_publisher.next_version(db, room_id))
+
+
+def _write_graph_snapshot(db: Session, room_id: UUID) -> SnapshotRows:
+    # graph_snapshot 저장 (메모리 graph 기준 keyframe / delta, 이미지 후보 세트당 1회)
+    graph = graph_cache.get(db, room_id)
+    version = graph_event_publisher.next_version(db, room_id)
+    snapshot = write_snapshot(db, graph, version)
+    return SnapshotRows(graph_snapshot_id=snapshot.graph_snapshot_id, version=version)
+
+
+def get_next_category_order(db, room_id: UUID) -> int:
+    """
+    room 전체에서 CATEGORY 노드들의 최대 order + 1
+    """
+    last_order = (
+        db.query(func.max(CategoryDetail.order))
+        .join(Node, Node.node_id == CategoryDetail.node_id)
+        .filter(
+            Node.room_id == room_id,
+            Node.node_type == "CATEGORY"
+        )
+        .scalar()
+    )
+
+    return 0 if last_order is None else last_order + 1
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+import os
+import socket
+from typing import List, Set
+from uuid import UUID
+
+from app.core.config import settings
+from app.schemas.utterance import PhaseType
+from app.services import job_queue
+from app.services.job_queue import ClaimedJob
+from app.services.phase_pipeline import room_serial, run_phase_pipeline
+from app.utils.timing import StageTimer
+
+logger = logging.getLogger(__name__)
+
+
+class PipelineWorkerPool:
+    """
+    pipeline_jobs 를 claim 해서 실행하는 worker pool (프로세스당 1개).
+    - 이 프로세스의 동시 실행 수는 concurrency 로 제한, 전체 worker 합산은 claim 쿼리가 PIPELINE_MAX_RUNNING_JOBS 로 제한
+      (room 당 1개 · 순서 보장은 claim 쿼리 + room_serial)
+    - 새 job 이 들어오면 notify() 로 즉시 깨우고, 그 외에는 poll_interval 마다 확인
+    - 실행 중인 job 은 PIPELINE_HEARTBEAT_INTERVAL_SEC 마다 heartbeat_at 갱신 → 오래 걸려도 다른 worker 가 회수하지 않음
+    - 멈추면 실행 중이던 job 은 PENDING 으로 되돌림
+    - DB 단계가 하나라도 커밋된 뒤 실패 / 중단된 job 은 재시도하지 않고 FAILED (재실행하면 그래프가 중복됨)
+    - PIPELINE_BATCH_WINDOW_SEC > 0 이면 CATEGORY_DISCUSS job 은 window 동안 같은 room 의 뒤 발화들을 모아
+      한 번에 실행 (LLM 1회 / 이미지 1세트, 각 job 은 같은 결과로 DONE)
+    """
+
+    # 이 횟수만큼 poll 할 때마다 stale RUNNING job 회수
+    RECOVER_EVERY_POLLS = 30
+
+    def __init__(self, concurrency: int, poll_interval: float):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._runner: asyncio.Task | None = None
+        self._heartbeat: asyncio.Task | None = None
+        self._running: Set[asyncio.Task] = set()
+        self._leased: Set[UUID] = set()  # heartbeat 대상 (실행 중인 job + micro-batch follower)
+        self._stopped = False
+
+        # metrics
+        self.completed = 0
+        self.failed = 0
+        self.batches = 0
+        self.batched_jobs = 0
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._stopped = False
+        self._runner = asyncio.create_task(self._run())
+        self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+        logger.info(f"[JOB:POOL] start worker={self.worker_id} concurrency={self.concurrency}")
+
+    def notify(self):
+        # 요청 스레드(threadpool)에서도 호출되므로 loop 에 위임
+        if self._loop is not None and not self._stopped:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self):
+        polls = 0
+        while not self._stopped:
+            await self._slots.acquire()
+            try:
+                if polls % self.RECOVER_EVERY_POLLS == 0:
+                    await self._loop.run_in_executor(None, job_queue.recover_stale_jobs)
+                polls += 1
+                job = await self._loop.run_in_executor(None, job_queue.claim_job, self.worker_id)
+            except Exception:
+                logger.exception("[JOB:POOL] claim failed")
+                job = None
+
+            if job is None:
+                self._slots.release()
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._execute(job))
+            self._running.add(task)
+            task.add_done_callback(self._on_done)
+
+    async def _heartbeat_loop(self):
+        while not self._stopped:
+            await asyncio.sleep(settings.PIPELINE_HEARTBEAT_INTERVAL_SEC)
+            if not self._leased:
+                continue
+            try:
+                await self._loop.run_in_executor(None, job_queue.heartbeat, list(self._leased))
+            except Exception:
+                logger.exception("[JOB:POOL] heartbeat failed")
+
+    def _on_done(self, task: asyncio.Task):
+        self._running.discard(task)
+        self._slots.release()
+
+    async def _execute(self, job: ClaimedJob):
+        batch = [job]  # micro-batch follower 가 붙으면 늘어남
+        self._leased.add(job.job_id)
+        try:
+            await self._execute_batch(job, batch)
+        finally:
+            self._leased.difference_update(j.job_id for j in batch)
+
+    async def _execute_batch(self, job: ClaimedJob, batch: List[ClaimedJob]):
+        timer = StageTimer()
+        timer.add("queue_wait", job.wait_ms)
+        logger.info(f"[JOB:START] job={job.job_id} room={job.room_id} phase={job.phase} attempt={job.attempts}")
+        committed: List[str] = []  # 커밋된 DB 단계 (있으면 재실행 시 노드 / 엣지 / delta 중복)
+        try:
+            batch += await self._gather_batch(job, timer)
+            self._leased.update(j.job_id for j in batch)
+            texts = [j.text for j in batch]
+            await run_phase_pipeline(
+                job.room_id, PhaseType(job.phase), texts if len(texts) > 1 else job.text, timer, committed,
+                [j.job_id for j in batch],
+            )
+        except asyncio.CancelledError:
+            for j in batch:
+                if committed:
+                    error = f"cancelled (committed: {', '.join(committed)})"
+                    await self._loop.run_in_executor(
+                        None, job_queue.mark_failed, j, error, timer.as_dict(), False,
+                    )
+                else:
+                    await self._loop.run_in_executor(None, job_queue.release_job, j.job_id)
+            raise
+        except Exception as e:
+            self.failed += len(batch)
+            logger.exception(f"[JOB:ERROR] job={job.job_id} batch={len(batch)} committed={committed}")
+            error = f"{e!r} (committed: {', '.join(committed)})" if committed else repr(e)
+            for j in batch:
+                await self._loop.run_in_executor(
+                    None, job_queue.mark_failed, j, error, timer.as_dict(), not committed,
+                )
+            return
+
+        self.completed += len(batch)
+        timings = timer.as_dict()
+        for j in batch:
+            await self._loop.run_in_executor(None, job_queue.mark_done, j.job_id, timings)
+        logger.info(f"[JOB:DONE] job={job.job_id} room={job.room_id} batch={len(batch)} timings={timings}")
+
+    async def _gather_batch(self, job: ClaimedJob, timer: StageTimer) -> List[ClaimedJob]:
+        """micro-batch window 가 남아 있으면 기다렸다가 같은 room 의 뒤 CATEGORY_DISCUSS 들을 같이 claim"""
+        window = settings.PIPELINE_BATCH_WINDOW_SEC
+        if window <= 0 or job.phase != PhaseType.CATEGORY_DISCUSS.value:
+            return []
+
+        with timer.stage("batch_window"):
+            # window 는 첫 발화 도착 시점부터 (queue 에서 이미 기다린 시간은 제외)
+            remaining = window - job.wait_ms / 1000
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+            followers = await self._loop.run_in_executor(
+                None, job_queue.claim_batch, job, self.worker_id, settings.PIPELINE_BATCH_MAX_SIZE - 1,
+            )
+
+        if followers:
+            self.batches += 1
+            self.batched_jobs += len(followers)
+            logger.info(f"[JOB:BATCH] job={job.job_id} room={job.room_id} followers={[f.job_id for f in followers]}")
+        return followers
+
+    async def stop(self, grace_sec: float = 10.0):
+        self._stopped = True
+        if self._runner:
+            self._runner.cancel()
+        if self._heartbeat:
+            self._heartbeat.cancel()
+        if self._running:
+            _, pending = await asyncio.wait(set(self._running), timeout=grace_sec)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        logger.info(f"[JOB:POOL] stop worker={self.worker_id}")
+
+    def stats(self) -> dict:
+        return {
+            "worker": self.worker_id,
+            "concurrency": self.concurrency,
+            "max_running_jobs": settings.PIPELINE_MAX_RUNNING_JOBS,  # 전체 worker 합산 상한
+            "in_flight": len(self._running),
+            "completed": self.completed,
+            "failed": self.failed,
+            "batch_window_sec": settings.PIPELINE_BATCH_WINDOW_SEC,
+            "batches": self.batches,
+            "batched_jobs": self.batched_jobs,  # 대표 job 에 묶여 LLM / 이미지 호출을 아낀 job 수
+            "room_locks": room_serial.stats(),
+        }
+
+
+pipeline_worker_pool = PipelineWorkerPool(
+    concurrency=settings.PIPELINE_MAX_CONCURRENCY,
+    poll_interval=settings.PIPELINE_POLL_INTERVAL_SEC,
+)
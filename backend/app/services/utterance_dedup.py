@@ -0,0 +1,118 @@
+import logging
+import threading
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.models.pipeline_job import PipelineJob
+from app.utils.text_similarity import jaccard, normalize_text, shingles
+
+logger = logging.getLogger(__name__)
+
+# 병합된 발화 1건이 아끼는 외부 호출 수 (LLM 1회 + 이미지 후보 3장)
+_IMAGES_PER_JOB = 3
+
+
+class UtteranceDedup:
+    """
+    같은 room / phase 에서 아직 끝나지 않은(PENDING / RUNNING) 최근 job 과
+    문자 3-gram Jaccard 유사도가 UTTERANCE_DEDUP_THRESHOLD 이상인 발화는 새 job 을 만들지 않고 그 job 에 합친다.
+    - 비교 대상 = pipeline_jobs 의 진행 중 job (room 당 몇 개 안 됨, 여러 API 프로세스가 같은 기준을 봄)
+    - 합쳐진 job 이 아직 PENDING 이고 새 발화가 더 길면 job text 를 새 발화로 교체 (STT partial → final)
+    - 동시에 들어온 두 요청이 서로를 못 보고 둘 다 enqueue 될 수는 있음 (그 경우 기존처럼 둘 다 실행)
+    """
+
+    _MAX_CANDIDATES = 20
+
+    def __init__(self, threshold: float, window_sec: float):
+        self.threshold = threshold
+        self.window_sec = window_sec
+        self._lock = threading.Lock()  # 동기 endpoint (threadpool) 에서 호출
+
+        self.checked = 0
+        self.coalesced = 0
+        self.text_upgraded = 0
+
+    def coalesce(self, db: Session, room_id: UUID, phase: str, text: str) -> Optional[UUID]:
+        """
+        합칠 진행 중 job 이 있으면 그 job_id (호출한 쪽 트랜잭션에서 coalesced 증가), 없으면 None.
+        """
+        if not settings.UTTERANCE_DEDUP_ENABLED:
+            return None
+
+        candidates = (
+            db.query(
+                PipelineJob.job_id, PipelineJob.text, PipelineJob.status, PipelineJob.created_at,
+                func.localtimestamp().label("now"),  # created_at 과 같은 DB 시계
+            )
+            .filter(
+                PipelineJob.room_id == room_id,
+                PipelineJob.phase == phase,
+                PipelineJob.status.in_(("PENDING", "RUNNING")),
+            )
+            .order_by(PipelineJob.created_at.desc())
+            .limit(self._MAX_CANDIDATES)
+            .all()
+        )
+
+        target = shingles(text)
+        best, best_score = None, 0.0
+        for candidate in candidates:
+            if (candidate.now - candidate.created_at).total_seconds() > self.window_sec:
+                continue
+            score = jaccard(target, shingles(candidate.text))
+            if score > best_score:
+                best, best_score = candidate, score
+
+        with self._lock:
+            self.checked += 1
+        if best is None or best_score < self.threshold:
+            return None
+
+        updated = (
+            db.query(PipelineJob)
+            .filter(PipelineJob.job_id == best.job_id, PipelineJob.status.in_(("PENDING", "RUNNING")))
+            .update({"coalesced": PipelineJob.coalesced + 1}, synchronize_session=False)
+        )
+        if not updated:
+            return None  # 그 사이 끝난 job → 새로 enqueue
+
+        upgraded = 0
+        if best.status == "PENDING" and len(normalize_text(text)) > len(normalize_text(best.text)):
+            upgraded = (
+                db.query(PipelineJob)
+                .filter(PipelineJob.job_id == best.job_id, PipelineJob.status == "PENDING")
+                .update({"text": text}, synchronize_session=False)
+            )
+
+        with self._lock:
+            self.coalesced += 1
+            self.text_upgraded += upgraded
+        logger.info(
+            f"[UTTERANCE:DEDUP] room={room_id} job={best.job_id} "
+            f"score={best_score:.2f} status={best.status} text_upgraded={bool(upgraded)}"
+        )
+        return best.job_id
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": settings.UTTERANCE_DEDUP_ENABLED,
+                "threshold": self.threshold,
+                "window_sec": self.window_sec,
+                "checked": self.checked,
+                "coalesced": self.coalesced,
+                "coalesce_ratio": round(self.coalesced / self.checked, 4) if self.checked else None,
+                "text_upgraded": self.text_upgraded,
+                "saved_llm_calls": self.coalesced,
+                "saved_image_generations": self.coalesced * _IMAGES_PER_JOB,
+            }
+
+
+utterance_dedup = UtteranceDedup(
+    threshold=settings.UTTERANCE_DEDUP_THRESHOLD,
+    window_sec=settings.UTTERANCE_DEDUP_WINDOW_SEC,
+)
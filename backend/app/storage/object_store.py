@@ -0,0 +1,293 @@
+import asyncio
+import hashlib
+import io
+import logging
+import mimetypes
+import os
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import AsyncIterator, BinaryIO, Callable
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+mimetypes.add_type("model/gltf-binary", ".glb")
+mimetypes.add_type("image/webp", ".webp")
+
+# DB 의 img_url 은 "minio:9000/{bucket}/{name}" 형태 (절대 URL 아님)
+IMG_URL_PREFIX = "minio:9000/"
+
+
+def to_object_key(img_url: str) -> str:
+    """img_url → object key ({bucket}/{name})"""
+    if img_url.startswith(IMG_URL_PREFIX):
+        img_url = img_url[len(IMG_URL_PREFIX):]
+    return img_url.lstrip("/")
+
+
+def to_img_url(object_key: str) -> str:
+    return f"{IMG_URL_PREFIX}{object_key}"
+
+
+def new_asset_key(ext: str, prefix: str = "nodexr-assets") -> str:
+    # 항상 uuid4 파일명 → 덮어쓰지 않는 immutable key (asset_proxy.is_immutable_key)
+    return f"{prefix}/{uuid.uuid4()}.{ext}"
+
+
+# =================================================
+# 동기 backend (AsyncObjectStore 의 thread pool 에서만 호출)
+# =================================================
+@dataclass
+class ObjectReader:
+    stream: BinaryIO   # readinto 지원
+    size: int
+    content_type: str
+    release: Callable[[], None] | None = None
+
+    def close(self):
+        self.stream.close()
+        if self.release:
+            self.release()
+
+
+class ObjectStore(ABC):
+    """object storage backend 공통 인터페이스 (blocking)"""
+
+    @abstractmethod
+    def ensure_bucket(self, bucket: str) -> None:
+        ...
+
+    @abstractmethod
+    def put(self, object_key: str, data: bytes, content_type: str) -> str:
+        """업로드 후 ETag"""
+
+    @abstractmethod
+    def open(self, object_key: str) -> ObjectReader:
+        ...
+
+    def get(self, object_key: str) -> bytes:
+        reader = self.open(object_key)
+        try:
+            return reader.stream.read()
+        finally:
+            reader.close()
+
+
+class MinioObjectStore(ObjectStore):
+    """
+    MinIO / S3. part_size 보다 큰 object 는 multipart 로 나눠서 parallel_uploads 개씩 동시에 업로드.
+    """
+
+    def __init__(self, client, part_size: int, parallel_uploads: int):
+        self.client = client
+        self.part_size = part_size
+        self.parallel_uploads = parallel_uploads
+
+    def ensure_bucket(self, bucket: str) -> None:
+        if not self.client.bucket_exists(bucket):
+            self.client.make_bucket(bucket)
+
+    def put(self, object_key: str, data: bytes, content_type: str) -> str:
+        bucket, object_name = object_key.split("/", 1)
+        result = self.client.put_object(
+            bucket_name=bucket,
+            object_name=object_name,
+            data=io.BytesIO(data),
+            length=len(data),
+            content_type=content_type,
+            part_size=self.part_size,
+            num_parallel_uploads=self.parallel_uploads,
+        )
+        return f'"{result.etag.strip(chr(34))}"'  # GET 응답의 ETag 헤더와 같은 형태
+
+    def open(self, object_key: str) -> ObjectReader:
+        bucket, object_name = object_key.split("/", 1)
+        resp = self.client.get_object(bucket, object_name)
+        return ObjectReader(
+            stream=resp,
+            size=int(resp.headers.get("content-length") or 0),
+            content_type=resp.headers.get("content-type", "application/octet-stream"),
+            release=resp.release_conn,
+        )
+
+
+class LocalObjectStore(ObjectStore):
+    """로컬 파일시스템 (테스트 / 단일 노드). {root}/{bucket}/{name}, 쓰기는 임시 파일 → rename."""
+
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+
+    def path_for(self, object_key: str) -> str:
+        path = os.path.abspath(os.path.join(self.root, object_key))
+        if not path.startswith(self.root + os.sep):
+            raise ValueError(f"invalid object key: {object_key}")
+        return path
+
+    def ensure_bucket(self, bucket: str) -> None:
+        os.makedirs(self.path_for(bucket), exist_ok=True)
+
+    def put(self, object_key: str, data: bytes, content_type: str) -> str:
+        path = self.path_for(object_key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return f'"{hashlib.md5(data).hexdigest()}"'
+
+    def open(self, object_key: str) -> ObjectReader:
+        f = open(self.path_for(object_key), "rb")
+        return ObjectReader(
+            stream=f,
+            size=os.fstat(f.fileno()).st_size,
+            content_type=mimetypes.guess_type(object_key)[0] or "application/octet-stream",
+        )
+
+
+# =================================================
+# async 인터페이스
+# =================================================
+class BufferPool:
+    """streaming read 용 고정 크기 chunk 버퍼 재사용 (object 마다 새로 할당하지 않음)"""
+
+    def __init__(self, size: int, max_free: int):
+        self.size = size
+        self.max_free = max_free
+        self._free: deque = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bytearray:
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+        return bytearray(self.size)
+
+    def release(self, buf: bytearray):
+        with self._lock:
+            if len(self._free) < self.max_free:
+                self._free.append(buf)
+
+
+class AsyncObjectStore:
+    """
+    blocking backend 를 전용 thread pool(OBJECT_STORE_MAX_WORKERS)에서 실행하는 async 인터페이스.
+    - starlette 기본 threadpool(동기 endpoint / DB 구간과 공유)을 쓰지 않아 업로드가 몰려도 API 가 밀리지 않음
+    - stream() 은 재사용 버퍼에 chunk 단위로 읽어서 넘김 (object 전체를 한 번에 메모리에 올리지 않음)
+    """
+
+    def __init__(self, backend: ObjectStore, max_workers: int, chunk_size: int):
+        self.backend = backend
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="object-store")
+        self._buffers = BufferPool(chunk_size, max_free=max_workers * 2)
+        self._lock = threading.Lock()
+
+        self.inflight = 0
+        self.puts = 0
+        self.gets = 0
+        self.errors = 0
+        self.bytes_put = 0
+        self.bytes_read = 0
+        self.put_ms = 0.0
+        self.get_ms = 0.0
+
+    async def _run(self, fn, *args):
+        with self._lock:
+            self.inflight += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self.inflight -= 1
+
+    async def ensure_bucket(self, bucket: str = settings.MINIO_BUCKET) -> None:
+        await self._run(self.backend.ensure_bucket, bucket)
+
+    async def put(self, object_key: str, data: bytes, content_type: str) -> str:
+        t0 = time.perf_counter()
+        etag = await self._run(self.backend.put, object_key, data, content_type)
+        with self._lock:
+            self.puts += 1
+            self.bytes_put += len(data)
+            self.put_ms += (time.perf_counter() - t0) * 1000
+        return etag
+
+    async def get(self, object_key: str) -> bytes:
+        t0 = time.perf_counter()
+        data = await self._run(self.backend.get, object_key)
+        with self._lock:
+            self.gets += 1
+            self.bytes_read += len(data)
+            self.get_ms += (time.perf_counter() - t0) * 1000
+        return data
+
+    async def stream(self, object_key: str) -> AsyncIterator[memoryview]:
+        """
+        chunk 단위 읽기. 넘겨주는 memoryview 는 다음 chunk 를 요청하기 전까지만 유효 (버퍼 재사용).
+        """
+        reader = await self._run(self.backend.open, object_key)
+        buf = self._buffers.acquire()
+        view = memoryview(buf)
+        try:
+            while True:
+                n = await self._run(reader.stream.readinto, view)
+                if not n:
+                    break
+                with self._lock:
+                    self.bytes_read += n
+                yield view[:n]
+        finally:
+            view.release()
+            self._buffers.release(buf)
+            await self._run(reader.close)
+            with self._lock:
+                self.gets += 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "backend": type(self.backend).__name__,
+                "max_workers": self.max_workers,
+                "inflight": self.inflight,
+                "puts": self.puts,
+                "gets": self.gets,
+                "errors": self.errors,
+                "bytes_put": self.bytes_put,
+                "bytes_read": self.bytes_read,
+                "avg_put_ms": round(self.put_ms / self.puts, 2) if self.puts else None,
+                "avg_get_ms": round(self.get_ms / self.gets, 2) if self.gets else None,
+            }
+
+
+def _create_backend() -> ObjectStore:
+    if settings.OBJECT_STORE_BACKEND == "local":
+        return LocalObjectStore(settings.OBJECT_STORE_LOCAL_DIR)
+    if settings.OBJECT_STORE_BACKEND != "minio":
+        raise ValueError(f"unknown OBJECT_STORE_BACKEND: {settings.OBJECT_STORE_BACKEND}")
+
+    from app.storage.minio import minio_client
+    return MinioObjectStore(
+        minio_client,
+        part_size=settings.OBJECT_STORE_PART_SIZE,
+        parallel_uploads=settings.OBJECT_STORE_PARALLEL_UPLOADS,
+    )
+
+
+object_store = AsyncObjectStore(
+    _create_backend(),
+    max_workers=settings.OBJECT_STORE_MAX_WORKERS,
+    chunk_size=settings.OBJECT_STORE_CHUNK_SIZE,
+)
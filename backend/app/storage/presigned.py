@@ -0,0 +1,82 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from app.core.config import settings
+from app.storage.minio import generate_presigned_url
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PresignedUrl:
+    url: str
+    expires_at: float  # time.monotonic 기준
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+
+class PresignedUrlCache:
+    """
+    object key → presigned GET URL 캐시.
+    - 만료까지 refresh_margin_sec 넘게 남은 동안은 같은 URL 재사용 (서명 비용 절약 + 클라이언트 HTTP 캐시 key 가 안 바뀜)
+    - graph 빌드(threadpool) / asset route(event loop) 양쪽에서 호출
+    """
+
+    def __init__(self, expires_sec: int, refresh_margin_sec: int, max_entries: int):
+        self.expires_sec = expires_sec
+        self.refresh_margin_sec = min(refresh_margin_sec, expires_sec // 2)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, PresignedUrl]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.signed = 0
+
+    def get(self, object_key: str) -> PresignedUrl:
+        with self._lock:
+            entry = self._entries.get(object_key)
+            if entry is not None and entry.remaining() > self.refresh_margin_sec:
+                self._entries.move_to_end(object_key)
+                self.hits += 1
+                return entry
+
+        bucket, object_name = object_key.split("/", 1)
+        signed_at = time.monotonic()
+        entry = PresignedUrl(
+            url=generate_presigned_url(bucket, object_name, expires_sec=self.expires_sec),
+            expires_at=signed_at + self.expires_sec,
+        )
+        with self._lock:
+            self.signed += 1
+            self._entries[object_key] = entry
+            self._entries.move_to_end(object_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.signed
+            return {
+                "mode": settings.ASSET_DELIVERY_MODE,
+                "entries": len(self._entries),
+                "expires_sec": self.expires_sec,
+                "hits": self.hits,
+                "signed": self.signed,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+presigned_urls = PresignedUrlCache(
+    expires_sec=(
+        settings.ASSET_PRESIGN_INLINE_EXPIRES_SEC
+        if settings.ASSET_DELIVERY_MODE == "presigned"
+        else settings.ASSET_PRESIGN_EXPIRES_SEC
+    ),
+    refresh_margin_sec=settings.ASSET_PRESIGN_REFRESH_MARGIN_SEC,
+    max_entries=settings.ASSET_PRESIGN_CACHE_MAX_ENTRIES,
+)
@@ -1,5 +1,9 @@
 # app/utils/asset_url.py
 import os
+from urllib.parse import urlsplit
+
+from app.core.config import settings
+from app.storage.presigned import presigned_urls
 
 ASSET_BASE_URL = os.getenv("ASSET_BASE_URL", "").rstrip("/")
 
@@ -23,4 +27,47 @@ def build_asset_url(object_key: str | None) -> str | None:
     # 앞에 / 하나 정리
     object_key = object_key.lstrip("/")
 
-    return f"{ASSET_BASE_URL}/{object_key}"
\ No newline at end of file
+    # graph_state / snapshot 에 저장되는 값이므로 항상 만료 없는 URL (presigned 는 client_asset_url 에서)
+    return f"{ASSET_BASE_URL}/{object_key}"
+
+
+def asset_key_from_url(url: str | None) -> str | None:
+    """build_asset_url 결과 (또는 예전에 저장된 presigned URL) → object key. 우리 asset 이 아니면 None"""
+    if not url:
+        return None
+    if "X-Amz-Signature=" in url:
+        return urlsplit(url).path.lstrip("/") or None
+    if ASSET_BASE_URL and url.startswith(f"{ASSET_BASE_URL}/"):
+        return url[len(ASSET_BASE_URL) + 1:]
+    if url.startswith("http://") or url.startswith("https://"):
+        return None
+    if url.startswith("minio:9000/"):
+        url = url.replace("minio:9000/", "", 1)
+    return url.lstrip("/") or None
+
+
+def client_asset_url(url: str | None) -> str | None:
+    """
+    클라이언트로 나가는 순간의 img_url.
+    presigned 모드면 이 시점에 서명 (presigned_urls 캐시) → 저장된 state / replay 에는 만료되는 URL 이 남지 않음.
+    그 외에는 저장된 URL 그대로 (예전에 presigned 로 저장된 snapshot 은 만료 없는 URL 로 되돌림).
+    """
+    object_key = asset_key_from_url(url)
+    if object_key is None:
+        return url
+    if settings.ASSET_DELIVERY_MODE == "presigned" and settings.OBJECT_STORE_BACKEND == "minio":
+        return presigned_urls.get(object_key).url
+    if "X-Amz-Signature=" in url:
+        return build_asset_url(object_key)
+    return url
+
+
+def client_graph_state(state: dict) -> dict:
+    """graph_state / delta 의 ASSET 노드 img_url 을 client_asset_url 로 바꾼 사본 (원본은 그대로)"""
+    return {
+        **state,
+        "nodes": [
+            {**node, "img_url": client_asset_url(node["img_url"])} if node.get("img_url") else node
+            for node in state.get("nodes", ())
+        ],
+    }
\ No newline at end of file
@@ -0,0 +1,78 @@
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Tuple
+
+from PIL import Image
+
+# 매직 바이트 → (mime type, 확장자)
+_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", ("image/png", "png")),
+    (b"\xff\xd8\xff", ("image/jpeg", "jpg")),
+    (b"GIF87a", ("image/gif", "gif")),
+    (b"GIF89a", ("image/gif", "gif")),
+)
+
+
+def sniff_image_format(data: bytes) -> Tuple[str, str] | None:
+    """
+    이미지 bytes 의 실제 포맷 (mime type, 확장자). 헤더 몇 바이트만 보고 디코딩은 하지 않는다.
+    모르는 포맷이면 None.
+    """
+    for signature, fmt in _SIGNATURES:
+        if data.startswith(signature):
+            return fmt
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp", "webp"
+    return None
+
+
+@dataclass
+class ImageInfo:
+    mime_type: str
+    ext: str
+    width: int
+    height: int
+
+
+# IMAGE_OUTPUT_FORMAT → (PIL 포맷, mime type, 확장자)
+OUTPUT_FORMATS = {
+    "png": ("PNG", "image/png", "png"),
+    "jpeg": ("JPEG", "image/jpeg", "jpg"),
+    "webp": ("WEBP", "image/webp", "webp"),
+}
+
+
+def probe_image(data: bytes) -> ImageInfo:
+    """
+    PIL lazy open 으로 header(포맷 / 크기)만 확인. 픽셀은 디코딩하지 않는다.
+    이미지가 아니거나 크기가 이상하면 ValueError.
+    """
+    try:
+        with Image.open(BytesIO(data)) as image:
+            width, height = image.size
+            pil_format = image.format
+    except Exception as e:
+        raise ValueError(f"invalid image bytes: {e}") from e
+
+    if width <= 0 or height <= 0:
+        raise ValueError(f"invalid image size: {width}x{height}")
+
+    fmt = sniff_image_format(data)
+    if fmt is None:
+        if not pil_format or pil_format not in Image.MIME:
+            raise ValueError(f"unsupported image format: {pil_format}")
+        fmt = Image.MIME[pil_format], pil_format.lower()
+    return ImageInfo(mime_type=fmt[0], ext=fmt[1], width=width, height=height)
+
+
+def transcode_image(data: bytes, output_format: str, quality: int) -> Tuple[bytes, ImageInfo]:
+    """output_format (OUTPUT_FORMATS 키) 로 디코딩 + 재인코딩"""
+    pil_format, mime_type, ext = OUTPUT_FORMATS[output_format]
+    with Image.open(BytesIO(data)) as image:
+        if pil_format == "JPEG" and image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        buf = BytesIO()
+        options = {} if pil_format == "PNG" else {"quality": quality}
+        image.save(buf, format=pil_format, **options)
+        width, height = image.size
+    return buf.getvalue(), ImageInfo(mime_type=mime_type, ext=ext, width=width, height=height)
@@ -0,0 +1,118 @@
+import json
+from typing import Any, List, Tuple
+
+
+class JsonFieldStream:
+    """
+    스트리밍으로 들어오는 JSON 객체 텍스트에서 최상위 필드가 완성되는 즉시 꺼내는 증분 파서.
+
+        parser = JsonFieldStream()
+        for chunk in chunks:
+            for key, value in parser.feed(chunk):
+                ...
+
+    - 최상위 '{' 이전의 텍스트(공백, ```json 등)는 무시
+    - 값은 완성된 구간만 json.loads → 문자열 escape / 중첩 배열·객체 모두 표준 JSON 규칙 그대로
+    """
+
+    def __init__(self):
+        self._buf = ""
+        self._pos = 0
+        self._started = False
+        self._done = False
+
+        self._key: str | None = None
+        self._expect = "key"            # key / colon / value / comma
+        self._token_start = -1          # 현재 스캔 중인 key / value 의 시작 위치
+        self._depth = 0                 # value 안의 [ { 깊이
+        self._in_string = False
+        self._escape = False
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self._buf += chunk
+        out: List[Tuple[str, Any]] = []
+        buf = self._buf
+
+        while self._pos < len(buf) and not self._done:
+            ch = buf[self._pos]
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                self._pos += 1
+                continue
+
+            if self._token_start >= 0:
+                self._scan_token(ch, out)
+                continue
+
+            if ch.isspace():
+                pass
+            elif self._expect == "key":
+                if ch == '"':
+                    self._token_start = self._pos
+                    self._in_string = True
+                elif ch == "}":
+                    self._done = True
+            elif self._expect == "colon":
+                if ch == ":":
+                    self._expect = "value"
+            elif self._expect == "value":
+                self._token_start = self._pos
+                self._depth = 0
+                self._in_string = False
+                continue  # 같은 문자부터 value 스캔
+            elif self._expect == "comma":
+                if ch == ",":
+                    self._expect = "key"
+                elif ch == "}":
+                    self._done = True
+            self._pos += 1
+
+        return out
+
+    def _scan_token(self, ch: str, out: List[Tuple[str, Any]]):
+        buf = self._buf
+        start = self._token_start
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"' and self._pos != start:
+                self._in_string = False
+                if self._expect == "key":
+                    self._key = json.loads(buf[start:self._pos + 1])
+                    self._token_start = -1
+                    self._expect = "colon"
+                elif self._depth == 0:
+                    self._emit(out, buf[start:self._pos + 1])
+            self._pos += 1
+            return
+
+        if ch == '"':
+            self._in_string = True
+        elif ch in "[{":
+            self._depth += 1
+        elif ch in "]}" and self._depth > 0:
+            self._depth -= 1
+            if self._depth == 0:
+                self._pos += 1
+                self._emit(out, buf[start:self._pos])
+                return
+        elif self._depth == 0 and (ch in ",}" or ch.isspace()):
+            # 숫자 / true / false / null 은 구분자를 만나야 끝
+            self._emit(out, buf[start:self._pos].strip())
+            return  # 구분자는 comma 상태에서 다시 처리
+        self._pos += 1
+
+    def _emit(self, out: List[Tuple[str, Any]], raw: str):
+        out.append((self._key, json.loads(raw)))
+        self._key = None
+        self._token_start = -1
+        self._expect = "comma"
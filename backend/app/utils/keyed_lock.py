@@ -0,0 +1,36 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Hashable
+
+
+class KeyedLock:
+    """
+    key 별 asyncio.Lock.
+    - 같은 key 는 도착한 순서(FIFO)대로 하나씩, 다른 key 끼리는 병렬로 실행
+    - 보유자 / 대기자가 없는 key 의 lock 은 바로 제거 (room 수만큼 쌓이지 않음)
+    """
+
+    def __init__(self):
+        self._locks: Dict[Hashable, asyncio.Lock] = {}
+        self._holders: Dict[Hashable, int] = {}  # 보유 + 대기 수
+
+    @asynccontextmanager
+    async def hold(self, key: Hashable):
+        lock = self._locks.get(key)
+        if lock is None:
+            lock = self._locks[key] = asyncio.Lock()
+        self._holders[key] = self._holders.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._holders[key] -= 1
+            if self._holders[key] == 0:
+                del self._holders[key]
+                del self._locks[key]
+
+    def stats(self) -> dict:
+        return {
+            "keys": len(self._locks),
+            "waiting": sum(n - 1 for n in self._holders.values()),
+        }
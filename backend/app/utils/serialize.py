@@ -0,0 +1,23 @@
+import uuid
+
+import orjson
+
+
+def stringify_uuids(obj):
+    """
+    WS payload / JSONB 저장 시 UUID 직렬화 문제 방지용.
+    """
+    if isinstance(obj, dict):
+        return {k: stringify_uuids(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [stringify_uuids(v) for v in obj]
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    return obj
+
+
+def dumps_json(obj) -> str:
+    """
+    WS 프레임용 JSON 인코딩 (UUID / datetime 을 orjson 이 직접 처리 → 사전 순회 불필요).
+    """
+    return orjson.dumps(obj).decode("utf-8")
@@ -0,0 +1,24 @@
+import re
+import unicodedata
+from typing import FrozenSet
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(value: str) -> str:
+    """비교 / 캐시 key 용 정규화: NFKC + 공백 정리 + casefold"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", value)).strip().casefold()
+
+
+def shingles(value: str, k: int = 3) -> FrozenSet[str]:
+    """정규화된 문자열의 문자 k-gram 집합 (k 보다 짧으면 문자열 전체 하나)"""
+    text = normalize_text(value)
+    if len(text) <= k:
+        return frozenset([text])
+    return frozenset(text[i:i + k] for i in range(len(text) - k + 1))
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
@@ -0,0 +1,41 @@
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable
+
+
+class StageTimer:
+    """
+    파이프라인 단계별 소요시간(ms) 기록. 같은 단계가 여러 번 실행되면 합산.
+    """
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - t0) * 1000)
+
+    def add(self, name: str, ms: float):
+        self.stages[name] = round(self.stages.get(name, 0.0) + ms, 2)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            **self.stages,
+            "total": round((time.perf_counter() - self._started) * 1000, 2),
+        }
+
+
+def percentiles(values: Iterable[float]) -> dict:
+    values = sorted(values)
+    if not values:
+        return {"count": 0}
+
+    def pct(p: float) -> float:
+        return round(values[min(len(values) - 1, int(len(values) * p))], 2)
+
+    return {"count": len(values), "p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99), "max": round(values[-1], 2)}
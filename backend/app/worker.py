@@ -0,0 +1,48 @@
+"""
+발화 파이프라인 전용 worker 프로세스.
+
+    python -m app.worker
+
+PIPELINE_WORKER_MODE=external 로 웹 프로세스에서는 job 을 실행하지 않고 적재만 하게 한 뒤 사용.
+WS 로 연결된 클라이언트에게 graph 이벤트가 가려면 BROADCAST_BUS=postgres 여야 한다.
+"""
+import asyncio
+import logging
+import signal
+
+from app.core.broadcast_bus import broadcast_bus
+from app.core.config import settings
+from app.db.schema import ensure_schema
+from app.services.asset_cache import asset_cache
+from app.services.image_upload import image_upload_pool
+from app.services.llm_service import llm_service
+from app.services.pipeline_worker import pipeline_worker_pool
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    ensure_schema()
+    if settings.BROADCAST_BUS == "inprocess":
+        logger.warning("[WORKER] BROADCAST_BUS=inprocess: graph events will not reach web workers")
+
+    asset_cache.start()
+    await broadcast_bus.start()
+    await image_upload_pool.start()
+    await pipeline_worker_pool.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    await pipeline_worker_pool.stop()
+    await image_upload_pool.drain(settings.IMAGE_UPLOAD_DRAIN_TIMEOUT_SEC)
+    await broadcast_bus.stop()
+    await llm_service.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
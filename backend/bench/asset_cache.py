@@ -0,0 +1,137 @@
+"""
+hot asset 캐시 벤치마크: graph 갱신마다 room 의 헤드셋 N 대가 새 이미지 3장을 동시에 받는 상황
+
+    python -m bench.asset_cache
+    python -m bench.asset_cache --headsets 12 --updates 20 --budget-mb 8 --disk
+
+fake MinIO (bench.asset_proxy 의 로컬 HTTP 서버) 앞에서 FastAPI 앱의 /nodexr-assets 를 in-process 로 호출한다.
+- off   : 캐시 없이 프록시만 (요청마다 MinIO GET)
+- miss  : 캐시 on, 업로드 시 push 없음 (첫 요청들이 single-flight 로 1번만 MinIO GET)
+- push  : 캐시 on, 업로드 시점에 put (MinIO GET 0번)
+마지막으로 늦게 들어온 헤드셋이 graph 전체(지금까지의 이미지 전부)를 한 번씩 받는다.
+--budget-mb 를 작게 주면 오래된 이미지가 메모리 tier 에서 밀려나고, --disk 면 디스크 tier(mmap)에서 응답한다.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+import logging
+
+import httpx
+
+from bench.asset_proxy import _FakeMinio
+from app.api import assets as assets_api
+from app.core.config import settings
+from app.main import app
+from app.services.asset_cache import HotAssetCache
+from app.services.asset_proxy import asset_proxy
+from app.utils.timing import percentiles
+
+
+class _CountingMinio(_FakeMinio):
+    def __init__(self, objects: dict):
+        super().__init__(objects)
+        self.gets = 0
+
+    async def _respond(self, writer, method, key, headers):
+        self.gets += method == "GET"
+        await super()._respond(writer, method, key, headers)
+
+
+async def _run(http, minio, cache, args, mode):
+    settings.ASSET_CACHE_ENABLED = mode != "off"
+    minio.gets = 0
+    latencies = []
+
+    async def fetch(key):
+        t0 = time.perf_counter()
+        resp = await http.get(f"/{key}")
+        assert resp.status_code == 200, resp.status_code
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    for _ in range(args.updates):
+        # 파이프라인이 새 후보 3장을 업로드 → 모든 헤드셋이 동시에 요청
+        keys = []
+        for _ in range(3):
+            key = f"nodexr-assets/{uuid.uuid4()}.png"
+            data = os.urandom(args.image_kb * 1024)
+            minio.objects[key] = data
+            if mode == "push":
+                cache.put(key, data, "image/png")
+            keys.append(key)
+        await asyncio.gather(*(fetch(key) for key in keys for _ in range(args.headsets)))
+    return minio.gets, args.updates * 3 * args.headsets, percentiles(latencies)
+
+
+async def _late_joiner(http, minio, cache):
+    minio.gets = 0
+    before = cache.stats()
+    t0 = time.perf_counter()
+    for key in list(minio.objects):
+        assert (await http.get(f"/{key}")).status_code == 200
+    after = cache.stats()
+    print(f"late joiner: {len(minio.objects)} images in {(time.perf_counter() - t0) * 1000:.0f} ms "
+          f"minio GETs={minio.gets} memory_hits={after['memory_hits'] - before['memory_hits']} "
+          f"disk_hits={after['disk_hits'] - before['disk_hits']}")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--headsets", type=int, default=8)
+    parser.add_argument("--updates", type=int, default=15)
+    parser.add_argument("--image-kb", type=int, default=1300)
+    parser.add_argument("--budget-mb", type=int, default=256, help="메모리 tier 예산")
+    parser.add_argument("--disk", action="store_true", help="디스크 tier 사용 (임시 디렉토리)")
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    minio = _CountingMinio({})
+    server = await asyncio.start_server(minio.handle, "127.0.0.1", 0)
+    asset_proxy.upstream = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+    print(f"headsets={args.headsets} updates={args.updates} image={args.image_kb} KiB "
+          f"budget={args.budget_mb} MiB disk={args.disk}")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as http:
+        for mode in ("off", "miss", "push"):
+            cache = assets_api.asset_cache = HotAssetCache(
+                max_bytes=args.budget_mb * 1024 * 1024,
+                max_object_bytes=settings.ASSET_CACHE_MAX_OBJECT_BYTES,
+                disk_dir=tempfile.mkdtemp() if args.disk else None,
+                disk_max_bytes=settings.ASSET_CACHE_DISK_MAX_BYTES,
+            )
+            cache.start()
+            gets, requests, p = await _run(http, minio, cache, args, mode)
+            print(f"{mode:<5} requests={requests} minio GETs={gets} ms p50={p['p50']:.1f} p95={p['p95']:.1f}")
+            if mode != "off":
+                stats = cache.stats()
+                print(f"      hit_ratio={stats['hit_ratio']} memory_hits={stats['memory_hits']} "
+                      f"disk_hits={stats['disk_hits']} coalesced={stats['coalesced']} "
+                      f"served={stats['bytes_served'] // 1024 // 1024} MiB fetched={stats['bytes_fetched'] // 1024 // 1024} MiB")
+
+        await _late_joiner(http, minio, cache)
+
+        # 캐시에서 Range / 재검증
+        key = next(iter(minio.objects))
+        full = await http.get(f"/{key}")
+        again = await http.get(f"/{key}", headers={"If-None-Match": full.headers["etag"]})
+        part = await http.get(f"/{key}", headers={"Range": "bytes=-1024"})
+        bad = await http.get(f"/{key}", headers={"Range": f"bytes={len(full.content)}-"})
+    print(f"cached revalidate={again.status_code} range={part.status_code} {part.headers['content-range']} "
+          f"unsatisfiable={bad.status_code}")
+
+    await asset_proxy.aclose()
+    server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
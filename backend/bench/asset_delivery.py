@@ -0,0 +1,83 @@
+"""
+asset 전달 방식별 API 프로세스 비용: proxy (bytes 전달) vs redirect (presigned URL 로 302)
+
+    python -m bench.asset_delivery
+    python -m bench.asset_delivery --requests 600 --image-kb 1300 --keys 30
+
+fake MinIO (bench.asset_proxy 의 로컬 HTTP 서버) 앞에서 FastAPI 앱의 /nodexr-assets 를 in-process 로 호출하고
+요청 1건당 API 프로세스 CPU 시간 / 응답 bytes 를 비교한다 (redirect 는 클라이언트가 MinIO 에서 직접 받는 부분 제외).
+- proxy (cache off) : 요청마다 MinIO → FastAPI → 클라이언트
+- proxy (cache on)  : hot asset 캐시 hit
+- redirect          : presigned URL 캐시 hit 이면 서명도 없이 302
+"""
+import argparse
+import asyncio
+import os
+import time
+import uuid
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+import logging
+
+import httpx
+
+from bench.asset_proxy import _FakeMinio
+from app.core.config import settings
+from app.main import app
+from app.services.asset_proxy import asset_proxy
+from app.storage.presigned import presigned_urls
+from app.utils.asset_url import build_asset_url, client_asset_url
+
+
+async def _run(http, keys, requests):
+    sent = 0
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    for i in range(requests):
+        resp = await http.get(f"/{keys[i % len(keys)]}")
+        assert resp.status_code in (200, 302), resp.status_code
+        sent += len(resp.content)
+    return (time.process_time() - cpu0) / requests * 1000, (time.perf_counter() - t0) / requests * 1000, sent
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--keys", type=int, default=30)
+    parser.add_argument("--image-kb", type=int, default=1300)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    keys = [f"nodexr-assets/{uuid.uuid4()}.png" for _ in range(args.keys)]
+    minio = _FakeMinio({key: os.urandom(args.image_kb * 1024) for key in keys})
+    server = await asyncio.start_server(minio.handle, "127.0.0.1", 0)
+    asset_proxy.upstream = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+
+    print(f"requests={args.requests} keys={args.keys} image={args.image_kb} KiB")
+    rows = (("proxy (cache off)", "proxy", False), ("proxy (cache on)", "proxy", True), ("redirect", "redirect", True))
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as http:
+        for name, mode, cache in rows:
+            settings.ASSET_DELIVERY_MODE, settings.ASSET_CACHE_ENABLED = mode, cache
+            await _run(http, keys, len(keys))  # warm (캐시 / presigned URL)
+            cpu_ms, wall_ms, sent = await _run(http, keys, args.requests)
+            print(f"{name:<18} cpu ms/req={cpu_ms:.3f} wall ms/req={wall_ms:.3f} "
+                  f"bytes through API={sent // 1024 // 1024} MiB")
+
+    settings.ASSET_DELIVERY_MODE = "presigned"
+    # 저장되는 img_url 은 만료 없는 URL, 클라이언트로 보낼 때 서명
+    stored = build_asset_url("minio:9000/" + keys[0])
+    print(f"stored img_url: {stored}")
+    print(f"presigned img_url: {client_asset_url(stored)[:100]}...")
+    print(f"presigned stats: {presigned_urls.stats()}")
+
+    await asset_proxy.aclose()
+    server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
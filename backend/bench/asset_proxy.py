@@ -0,0 +1,165 @@
+"""
+/nodexr-assets 프록시 벤치마크 (fake MinIO = 로컬 asyncio HTTP/1.1 서버)
+
+    python -m bench.asset_proxy
+    python -m bench.asset_proxy --requests 200 --concurrency 20 --glb-mb 20
+
+- legacy : 기존 proxy_minio (요청마다 AsyncClient 생성 + client.get 으로 body 전체를 메모리에)
+- pooled : AssetProxy (공유 커넥션 풀 + chunk streaming)
+요청 수 / upstream TCP 연결 수 / 지연 분포 / 요청 1건이 잡는 최대 메모리(tracemalloc),
+그리고 Unity 가 graph 갱신마다 다시 받는 상황(If-None-Match → 304, Range → 206)의 전송 bytes 를 비교한다.
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import time
+import tracemalloc
+import uuid
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+import logging
+
+import httpx
+
+from app.main import app
+from app.services import asset_proxy as proxy_module
+from app.services.asset_proxy import AssetProxy
+from app.utils.timing import percentiles
+
+
+class _FakeMinio:
+    """GET / HEAD + If-None-Match(304) + Range(206) 만 지원하는 keep-alive HTTP/1.1 서버"""
+
+    def __init__(self, objects: dict):
+        self.objects = objects
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                method, path, _ = line.decode().split(" ", 2)
+                headers = {}
+                while (header := await reader.readline()) not in (b"\r\n", b""):
+                    name, value = header.decode().split(":", 1)
+                    headers[name.strip().lower()] = value.strip()
+                await self._respond(writer, method, path.lstrip("/"), headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, method, key, headers):
+        data = self.objects.get(key)
+        if data is None:
+            writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            return await writer.drain()
+
+        etag = f'"{hashlib.md5(data).hexdigest()}"'
+        status, body, extra = "200 OK", data, ""
+        if headers.get("if-none-match") == etag:
+            status, body = "304 Not Modified", b""
+        elif headers.get("range", "").startswith("bytes="):
+            start, end = headers["range"][6:].split("-")
+            start, end = int(start), int(end) if end else len(data) - 1
+            status, body = "206 Partial Content", data[start:end + 1]
+            extra = f"Content-Range: bytes {start}-{end}/{len(data)}\r\n"
+        writer.write((
+            f"HTTP/1.1 {status}\r\nContent-Type: application/octet-stream\r\nETag: {etag}\r\n"
+            f"Accept-Ranges: bytes\r\n{extra}Content-Length: {len(body)}\r\n\r\n"
+        ).encode())
+        if method == "GET":
+            for i in range(0, len(body), 256 * 1024):
+                writer.write(body[i:i + 256 * 1024])
+                await writer.drain()
+        await writer.drain()
+
+
+async def _legacy(upstream: str, key: str) -> int:
+    async with httpx.AsyncClient() as client:
+        resp = await client.get(f"{upstream}/{key}", timeout=10.0)
+        return sum(len(chunk) for chunk in resp.iter_bytes())
+
+
+async def _pooled(proxy: AssetProxy, key: str) -> int:
+    resp = await proxy.open("GET", key, {})
+    return sum([len(chunk) async for chunk in proxy.stream(resp)])
+
+
+async def _load(fn, keys, requests, concurrency):
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i):
+        async with slots:
+            t0 = time.perf_counter()
+            await fn(keys[i % len(keys)])
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return time.perf_counter() - t0, percentiles(latencies)
+
+
+async def _peak_memory(fn, key) -> float:
+    tracemalloc.start()
+    await fn(key)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024 / 1024
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=30)
+    parser.add_argument("--image-kb", type=int, default=1300, help="2D 후보 이미지 크기")
+    parser.add_argument("--glb-mb", type=int, default=15, help="GLB 크기 (메모리 비교용)")
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    images = {f"nodexr-assets/{uuid.uuid4()}.png": os.urandom(args.image_kb * 1024) for _ in range(3)}
+    glb_key = f"nodexr-assets/3d/{uuid.uuid4()}.glb"
+    minio = _FakeMinio({**images, glb_key: os.urandom(args.glb_mb * 1024 * 1024)})
+    server = await asyncio.start_server(minio.handle, "127.0.0.1", 0)
+    upstream = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    keys = list(images)
+
+    print(f"requests={args.requests} concurrency={args.concurrency} image={args.image_kb} KiB glb={args.glb_mb} MiB")
+    proxy = AssetProxy(upstream=upstream)
+    for name, fn in (("legacy", lambda key: _legacy(upstream, key)), ("pooled", lambda key: _pooled(proxy, key))):
+        minio.connections = 0
+        elapsed, p = await _load(fn, keys, args.requests, args.concurrency)
+        peak = await _peak_memory(fn, glb_key)
+        print(f"{name:<7} {args.requests / elapsed:7.0f} req/s  ms p50={p['p50']:.1f} p95={p['p95']:.1f}  "
+              f"upstream connections={minio.connections}  GLB request peak memory={peak:.1f} MiB")
+
+    # Unity 재요청: 같은 key 를 ETag 로 재검증 / GLB 이어받기 (FastAPI 앱 경유)
+    proxy_module.asset_proxy.upstream = upstream
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as http:
+        first = await http.get(f"/{keys[0]}")
+        again = await http.get(f"/{keys[0]}", headers={"If-None-Match": first.headers["etag"]})
+        part = await http.get(f"/{glb_key}", headers={"Range": "bytes=0-1048575"})
+        missing = await http.get(f"/nodexr-assets/{uuid.uuid4()}.png")
+    print(f"first GET {first.status_code} {len(first.content)} bytes cache-control={first.headers['cache-control']!r}")
+    print(f"revalidate {again.status_code} {len(again.content)} bytes")
+    print(f"range      {part.status_code} {len(part.content)} bytes content-range={part.headers['content-range']}")
+    print(f"missing    {missing.status_code}")
+    print(f"proxy stats: {proxy_module.asset_proxy.stats()}")
+
+    await proxy.aclose()
+    server.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""
+core 이미지 캐시 벤치마크: 카테고리 이미지 요청 → 첫 Gemini 호출 시작까지 걸리는 시간
+
+    python -m bench.core_image_cache
+    python -m bench.core_image_cache --requests 50 --minio-latency 0.08 --size 1024
+
+- uncached: 매 요청마다 MinIO get_object + PIL 디코딩/PNG 재인코딩 (core_asset_id 없이 호출)
+- cached  : select 직후 warm 된 room 별 캐시의 types.Part 를 그대로 사용
+MinIO 는 --minio-latency 만큼 걸리는 LocalObjectStore, Gemini 는 호출 시각만 기록하는 fake.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from io import BytesIO
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+import logging
+
+from PIL import Image
+
+from bench.image_generation import _FakeGemini
+from app.services.core_image_cache import core_image_cache
+from app.services.image_service import ImageService
+from app.storage.object_store import LocalObjectStore, object_store
+from app.utils.timing import percentiles
+
+
+class _StartClock(_FakeGemini):
+    """generate_content 가 처음 불린 시각만 기록"""
+
+    def __init__(self):
+        super().__init__(latency=0)
+        response, clock = self._response, self
+        self.first_call = None
+
+        class _AsyncModels:
+            async def generate_content(self, model, contents, config=None):
+                if clock.first_call is None:
+                    clock.first_call = time.perf_counter()
+                return response
+
+        self.aio.models = _AsyncModels()
+
+
+def _core_png(size: int) -> bytes:
+    buf = BytesIO()
+    Image.effect_noise((size, size), 64).convert("RGB").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+async def _run(service: ImageService, clock: _StartClock, room_id, asset_id, requests: int):
+    latencies = []
+    for _ in range(requests):
+        clock.first_call = None
+        t0 = time.perf_counter()
+        async for _key in service.iter_category_images(
+            "p", n=3, room_id=room_id, core_img_url="minio:9000/nodexr-assets/core.png", core_asset_id=asset_id,
+        ):
+            pass
+        latencies.append((clock.first_call - t0) * 1000)
+    return percentiles(latencies)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=30)
+    parser.add_argument("--minio-latency", type=float, default=0.03, help="MinIO get_object 왕복(sec)")
+    parser.add_argument("--size", type=int, default=768, help="core 이미지 한 변 px")
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    data = _core_png(args.size)
+
+    class _SlowStore(LocalObjectStore):
+        def get(self, object_key):
+            time.sleep(args.minio_latency)
+            return super().get(object_key)
+
+    object_store.backend = _SlowStore(tempfile.mkdtemp())
+    object_store.backend.put("nodexr-assets/core.png", data, "image/png")
+    clock = _StartClock()
+    service = ImageService(client=clock, max_concurrency=8, timeout=60)
+
+    room_id, asset_id = uuid.uuid4(), uuid.uuid4()
+    print(f"requests={args.requests} core={args.size}px ({len(data) // 1024} KiB) minio={args.minio_latency * 1000:.0f}ms")
+
+    p = await _run(service, clock, room_id, None, args.requests)
+    print(f"uncached   request→first Gemini call ms p50={p['p50']:.1f} p95={p['p95']:.1f}")
+
+    # /api/2d/select 와 같은 순서: invalidate → warm (응답 후 background)
+    core_image_cache.invalidate(room_id)
+    await core_image_cache.warm(room_id, asset_id, "minio:9000/nodexr-assets/core.png")
+    p = await _run(service, clock, room_id, asset_id, args.requests)
+    print(f"cached     request→first Gemini call ms p50={p['p50']:.1f} p95={p['p95']:.1f}")
+    print(f"cache stats: {core_image_cache.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,150 @@
+"""
+build_graph_state 벤치마크 (room 크기별 쿼리 수 / 지연시간)
+
+    python -m bench.graph_builder                      # sqlite in-memory
+    python -m bench.graph_builder --dsn postgresql+psycopg2://...
+
+다른 room 의 edge 를 함께 깔아서 room 필터가 동작하는지도 같이 확인한다.
+"""
+import argparse
+import os
+import statistics
+import time
+import uuid
+
+# app.core.config 는 필수 env 가 없으면 import 자체가 실패하므로 벤치용 기본값
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from app.db.session import Base
+from app.db.models.room import Room
+from app.db.models.category import Category
+from app.db.models.node import Node
+from app.db.models.edge import Edge
+from app.db.models.asset import Asset
+from app.db.models.category_detail import CategoryDetail
+from app.db.models.graph_snapshot import GraphSnapshot  # noqa: F401 (metadata 등록)
+from app.services.graph_builder import build_graph_state
+from app.utils.asset_url import build_asset_url
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+def _legacy_build_graph_state(db, graph_snapshot_id, room_id) -> dict:
+    """비교용: 기존 N+1 구현"""
+    nodes_out = []
+    details = db.query(CategoryDetail).join(Node, Node.node_id == CategoryDetail.node_id)\
+        .filter(Node.room_id == room_id).all()
+    detail_by_node = {d.node_id: d for d in details}
+    for n in db.query(Node).filter(Node.room_id == room_id).all():
+        if n.node_type == "CATEGORY":
+            d = detail_by_node.get(n.node_id)
+            nodes_out.append({"node_id": n.node_id, "node_type": "CATEGORY",
+                              "label": d.detail_text if d else "", "order": d.order if d else 0})
+        else:
+            a = db.query(Asset).filter(Asset.node_id == n.node_id).first()
+            parent = None
+            if a:
+                pd = db.query(CategoryDetail).filter(
+                    CategoryDetail.category_detail_id == a.category_detail_id).first()
+                parent = pd.node_id if pd else None
+            nodes_out.append({"node_id": n.node_id, "node_type": "ASSET",
+                              "img_url": build_asset_url(a.img_url) if a else None,
+                              "parent_category_id": parent})
+    edges_out = [{"edge_id": e.edge_id, "from_node_id": e.from_node_id, "to_node_id": e.to_node_id}
+                 for e in db.query(Edge).all()]
+    return {"graph_snapshot_id": graph_snapshot_id, "nodes": nodes_out, "edges": edges_out}
+
+
+def _seed_room(db, n_categories: int, assets_per_category: int = 3) -> uuid.UUID:
+    """utterance 파이프라인과 같은 모양: CATEGORY 노드마다 ASSET 후보 n개"""
+    room = Room(room_topic="bench", password="bench")
+    db.add(room)
+    db.flush()
+    cat = Category(room_id=room.room_id, category_name="ROOT", phase="ACTIVE")
+    db.add(cat)
+    db.flush()
+
+    for order in range(n_categories):
+        cnode = Node(room_id=room.room_id, node_type="CATEGORY")
+        db.add(cnode)
+        db.flush()
+        detail = CategoryDetail(category_id=cat.category_id, node_id=cnode.node_id,
+                                detail_text=f"keyword-{order}", order=order)
+        db.add(detail)
+        db.flush()
+        for _ in range(assets_per_category):
+            anode = Node(room_id=room.room_id, node_type="ASSET")
+            db.add(anode)
+            db.flush()
+            db.add(Asset(node_id=anode.node_id, category_detail_id=detail.category_detail_id,
+                         img_url=f"minio:9000/nodexr-assets/{uuid.uuid4()}.png",
+                         type="2D_CATEGORY_CANDIDATE"))
+            db.add(Edge(from_node_id=cnode.node_id, to_node_id=anode.node_id))
+    db.commit()
+    return room.room_id
+
+
+def _measure(engine, Session, fn, room_id, repeat: int):
+    counter = {"n": 0}
+
+    def _count(*_args, **_kw):
+        counter["n"] += 1
+
+    event.listen(engine, "before_cursor_execute", _count)
+    try:
+        timings = []
+        queries = 0
+        for _ in range(repeat):
+            db = Session()
+            counter["n"] = 0
+            t0 = time.perf_counter()
+            state = fn(db, None, room_id)
+            timings.append((time.perf_counter() - t0) * 1000)
+            queries = counter["n"]
+            db.close()
+        return queries, statistics.median(timings), len(state["edges"])
+    finally:
+        event.remove(engine, "before_cursor_execute", _count)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dsn", default="sqlite://")
+    parser.add_argument("--sizes", default="1,10,50,200")
+    parser.add_argument("--noise-rooms", type=int, default=5, help="다른 room 수 (edge 필터 확인용)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine(args.dsn, future=True)
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    db = Session()
+    for _ in range(args.noise_rooms):
+        _seed_room(db, max(sizes))
+    rooms = {size: _seed_room(db, size) for size in sizes}
+    db.close()
+
+    print(f"{'categories':>10} {'nodes':>6} | {'legacy q':>8} {'ms':>8} {'edges':>6} | {'new q':>5} {'ms':>8} {'edges':>6}")
+    for size, room_id in rooms.items():
+        lq, lms, ledges = _measure(engine, Session, _legacy_build_graph_state, room_id, args.repeat)
+        nq, nms, nedges = _measure(engine, Session, build_graph_state, room_id, args.repeat)
+        print(f"{size:>10} {size * 4:>6} | {lq:>8} {lms:>8.2f} {ledges:>6} | {nq:>5} {nms:>8.2f} {nedges:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+ImageService 이미지 n장 생성 wall time / event loop 정지 시간 벤치마크 (fake Gemini client)
+
+    python -m bench.image_generation
+    python -m bench.image_generation --latency 0.5 --counts 1,3,6,12 --max-concurrency 6
+
+- legacy : async def 안에서 blocking client.models.generate_content 호출 (gather 해도 순차 실행)
+- current: client.aio.models.generate_content + 전역 semaphore + 요청별 timeout
+loop stall 은 10ms 주기 heartbeat task 가 실제로 깨어난 간격의 최댓값 (WS 전송이 멈춰 있던 시간).
+MinIO 대신 임시 디렉토리의 LocalObjectStore 에 업로드한다.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from io import BytesIO
+from types import SimpleNamespace
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+import logging
+
+from PIL import Image
+
+from app.services import image_service as image_module
+from app.services.image_service import ImageService
+from app.storage.object_store import LocalObjectStore, object_store
+
+
+def _png_bytes() -> bytes:
+    buf = BytesIO()
+    Image.new("RGB", (64, 64), (200, 120, 40)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class _FakeGemini:
+    """client.models (blocking) / client.aio.models (async) 둘 다 latency 만큼 걸리는 fake"""
+
+    def __init__(self, latency: float):
+        data = _png_bytes()
+        part = SimpleNamespace(inline_data=SimpleNamespace(data=data, mime_type="image/png"))
+        self._response = SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+        self.latency = latency
+
+        fake = self
+
+        class _Models:
+            def generate_content(self, model, contents, config=None):
+                time.sleep(fake.latency)
+                return fake._response
+
+        class _AsyncModels:
+            async def generate_content(self, model, contents, config=None):
+                await asyncio.sleep(fake.latency)
+                return fake._response
+
+        self.models = _Models()
+        self.aio = SimpleNamespace(models=_AsyncModels())
+
+
+async def _legacy_generate_images(service: ImageService, prompt: str, n: int):
+    """비교용: 기존 구현 (blocking SDK 호출을 async def 안에서)"""
+    async def single(idx):
+        response = service.client.models.generate_content(
+            model=service.model, contents=[prompt], config=image_module._IMAGE_CONFIG,
+        )
+        part = response.candidates[0].content.parts[0]
+        return await service._store_image(part.inline_data.data, idx)
+
+    return await asyncio.gather(*(single(i) for i in range(n)), return_exceptions=True)
+
+
+async def _generate_images(service: ImageService, prompt: str, n: int):
+    return [key async for key in service.iter_images(prompt, n=n)]
+
+
+async def _measure(fn, *args):
+    gaps = []
+    stop = asyncio.Event()
+
+    async def heartbeat():
+        last = time.perf_counter()
+        while not stop.is_set():
+            await asyncio.sleep(0.01)
+            now = time.perf_counter()
+            gaps.append(now - last - 0.01)
+            last = now
+
+    hb = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.02)
+    t0 = time.perf_counter()
+    result = await fn(*args)
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await hb
+    return elapsed, max(gaps, default=0.0), result
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", type=float, default=0.5, help="fake Gemini 1회 응답 시간(sec)")
+    parser.add_argument("--counts", default="1,3,6,12")
+    parser.add_argument("--max-concurrency", type=int, default=6)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    object_store.backend = LocalObjectStore(tempfile.mkdtemp())
+    service = ImageService(
+        client=_FakeGemini(args.latency),
+        max_concurrency=args.max_concurrency,
+        timeout=args.latency * 10,
+    )
+
+    print(f"latency={args.latency}s max_concurrency={args.max_concurrency}")
+    print(f"{'n':>3} | {'legacy s':>8} {'stall ms':>8} | {'current s':>9} {'stall ms':>8} {'ok':>3}")
+    for n in [int(c) for c in args.counts.split(",")]:
+        l_elapsed, l_stall, _ = await _measure(_legacy_generate_images, service, "p", n)
+        c_elapsed, c_stall, urls = await _measure(_generate_images, service, "p", n)
+        print(f"{n:>3} | {l_elapsed:>8.2f} {l_stall * 1000:>8.0f} | {c_elapsed:>9.2f} {c_stall * 1000:>8.0f} {len(urls):>3}")
+
+    # 타임아웃: 응답이 timeout 보다 느리면 빈 결과로 끝나고 wall time 은 timeout 근처
+    slow = ImageService(client=_FakeGemini(args.latency * 4), max_concurrency=args.max_concurrency, timeout=args.latency)
+    elapsed, _, urls = await _measure(_generate_images, slow, "p", 3)
+    print(f"timeout={args.latency}s vs latency={args.latency * 4}s: {elapsed:.2f}s, images={len(urls)}")
+
+    # 취소: 파이프라인 task 를 취소하면 진행 중 요청도 즉시 정리
+    task = asyncio.create_task(_generate_images(service, "p", 3))
+    await asyncio.sleep(args.latency / 5)
+    t0 = time.perf_counter()
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    print(f"cancel: settled in {(time.perf_counter() - t0) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""
+생성 이미지 저장 경로 벤치마크: PIL 디코딩 + PNG 재인코딩 vs header 확인 후 원본 bytes 그대로 업로드
+
+    python -m bench.image_passthrough
+    python -m bench.image_passthrough --size 1024 --images 30 --formats original,png,webp
+
+Gemini 응답처럼 1024px PNG (노이즈 + 그라데이션) 를 만들어 두고, 이미지 1장당
+ImageService._prepare_image (업로드 직전까지) 에 걸리는 시간과 업로드될 bytes 를 비교한다.
+- legacy  : 기존 구현 (Image.open → image.save(PNG))
+- original: IMAGE_OUTPUT_FORMAT=original (probe 만, pass-through)
+- png/jpeg/webp: 해당 출력 정책 (Gemini 가 PNG 를 주므로 png 는 pass-through, 나머지는 변환)
+"""
+import argparse
+import os
+import time
+from io import BytesIO
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+import logging
+
+from PIL import Image
+
+from bench.image_generation import _FakeGemini
+from app.core.config import settings
+from app.services.image_service import ImageService
+from app.utils.timing import percentiles
+
+
+def _generated_png(size: int) -> bytes:
+    noise = Image.effect_noise((size, size), 32).convert("RGB")
+    gradient = Image.linear_gradient("L").resize((size, size)).convert("RGB")
+    buf = BytesIO()
+    Image.blend(noise, gradient, 0.6).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _legacy_store(data: bytes) -> bytes:
+    buf = BytesIO()
+    Image.open(BytesIO(data)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--images", type=int, default=20)
+    parser.add_argument("--formats", default="original,png,jpeg,webp")
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    data = _generated_png(args.size)
+    uploaded = []
+
+    print(f"images={args.images} size={args.size}px gemini png={len(data) // 1024} KiB")
+    rows = [("legacy", None)] + [(fmt, fmt) for fmt in args.formats.split(",")]
+    for name, fmt in rows:
+        uploaded.clear()
+        if fmt:
+            settings.IMAGE_OUTPUT_FORMAT = fmt
+            service = ImageService(client=_FakeGemini(0))
+        times = []
+        for i in range(args.images):
+            t0 = time.perf_counter()
+            if fmt:
+                out, info = service._prepare_image(data)
+                uploaded.append((len(out), info.mime_type))
+            else:
+                out = _legacy_store(data)
+                uploaded.append((len(out), "image/png"))
+            times.append((time.perf_counter() - t0) * 1000)
+        p = percentiles(times)
+        size, content_type = uploaded[-1]
+        stats = service.output_stats() if fmt else {}
+        print(f"{name:<9} ms/image p50={p['p50']:7.2f} p95={p['p95']:7.2f} "
+              f"upload={size // 1024} KiB {content_type} "
+              f"passthrough={stats.get('passthrough', 0)} transcoded={stats.get('transcoded', 0)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+LLM 응답 캐시 효과 벤치마크 (fake OpenAI client, memory tier)
+
+    python -m bench.llm_cache
+    python -m bench.llm_cache --requests 500 --distinct 40 --latency 0.8
+
+데모 / 리허설 room 처럼 같은 (category, 발화) 쌍이 반복되는 요청열을 만들어
+캐시 on / off 각각 category_discuss 지연 분포와 실제 OpenAI 호출 수를 비교한다.
+발화는 공백 / 대소문자만 다른 변형을 섞어 정규화 key 가 같은 응답을 재사용하는지도 본다.
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+import logging
+
+from bench.llm_streaming import _FakeOpenAI
+from app.core.config import settings
+from app.services.llm_cache import llm_cache
+from app.services.llm_service import LLMService
+from app.utils.timing import percentiles
+
+
+def _workload(requests: int, distinct: int, seed: int = 7):
+    rng = random.Random(seed)
+    base = [(f"category {i % 5}", f"Utterance number {i}") for i in range(distinct)]
+    out = []
+    for _ in range(requests):
+        category, utterance = rng.choice(base)
+        if rng.random() < 0.3:
+            utterance = "  " + utterance.upper().replace(" ", "   ") + " "
+        out.append((category, utterance))
+    return out
+
+
+async def _run(service: LLMService, workload, concurrency: int):
+    latencies = []
+    slots = asyncio.Semaphore(concurrency)
+
+    async def one(category, utterance):
+        async with slots:
+            t0 = time.perf_counter()
+            await service.category_discuss(category, utterance)
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(c, u) for c, u in workload))
+    return time.perf_counter() - t0, percentiles(latencies)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--distinct", type=int, default=20, help="서로 다른 (category, 발화) 쌍 수")
+    parser.add_argument("--latency", type=float, default=0.5, help="fake OpenAI 응답 시간(sec)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    fake = _FakeOpenAI(ttft=args.latency, cps=1e9)
+    create = fake.chat.completions.create
+    calls = {"n": 0}
+
+    async def counted_create(**kwargs):
+        calls["n"] += 1
+        return await create(**kwargs)
+
+    fake.chat.completions.create = counted_create
+    service = LLMService(client=fake)
+    workload = _workload(args.requests, args.distinct)
+
+    print(f"requests={args.requests} distinct={args.distinct} latency={args.latency}s concurrency={args.concurrency}")
+    for enabled in (False, True):
+        settings.LLM_CACHE_ENABLED = enabled
+        llm_cache.clear()
+        calls["n"] = 0
+        elapsed, lat = await _run(service, workload, args.concurrency)
+        print(f"cache={enabled!s:<5} elapsed={elapsed:.2f}s openai calls={calls['n']} "
+              f"latency ms p50={lat['p50']:.1f} p95={lat['p95']:.1f} p99={lat['p99']:.1f}")
+    stats = llm_cache.stats()
+    print(f"cache stats: hit_ratio={stats['hit_ratio']} hits={stats['hits_memory']} "
+          f"misses={stats['misses']} entries={stats['entries']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+"""
+LLM 스트리밍 응답의 time-to-first-field 벤치마크 (fake OpenAI client)
+
+    python -m bench.llm_streaming
+    python -m bench.llm_streaming --ttft 0.4 --chars-per-sec 300 --requests 20
+
+- fake client 는 첫 토큰까지 --ttft, 이후 --chars-per-sec 속도로 응답 JSON 을 잘라서 보낸다
+  (stream=False 면 전체가 다 만들어진 뒤 한 번에 반환)
+- category_discuss_fields 로 keyword / image_prompt 가 각각 손에 들어오는 시점을 잰다
+  keyword 시점 = 파이프라인이 CATEGORY 노드를 insert / broadcast 할 수 있는 시점
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from types import SimpleNamespace
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+import logging
+
+from app.core.config import settings
+from app.services.llm_service import LLMService
+from app.utils.timing import percentiles
+
+_RESPONSE = json.dumps({
+    "keyword": "부드러운 곡선의 원목 다리",
+    "image_prompt": "A minimalist lamp with a soft curved oak wooden base, warm diffused light, "
+                    "matte ceramic shade, studio lighting, isometric product sketch, white background. " * 3,
+}, ensure_ascii=False)
+
+
+class _FakeStream:
+    def __init__(self, text: str, ttft: float, cps: float, chunk: int = 4, fail_at: int | None = None):
+        self.text, self.ttft, self.cps, self.chunk, self.fail_at = text, ttft, cps, chunk, fail_at
+
+    async def __aiter__(self):
+        await asyncio.sleep(self.ttft)
+        for i in range(0, len(self.text), self.chunk):
+            if self.fail_at is not None and i >= self.fail_at:
+                raise ConnectionError("stream cut")
+            await asyncio.sleep(self.chunk / self.cps)
+            delta = SimpleNamespace(content=self.text[i:i + self.chunk])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def close(self):
+        pass
+
+
+class _FakeOpenAI:
+    def __init__(self, ttft: float, cps: float, fail_at: int | None = None):
+        fake = self
+        self.ttft, self.cps, self.fail_at = ttft, cps, fail_at
+
+        class _Completions:
+            async def create(self, model, messages, temperature, timeout, stream=False):
+                if stream:
+                    return _FakeStream(_RESPONSE, fake.ttft, fake.cps, fail_at=fake.fail_at)
+                await asyncio.sleep(fake.ttft + len(_RESPONSE) / fake.cps)
+                message = SimpleNamespace(content=_RESPONSE)
+                return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        self.chat = SimpleNamespace(completions=_Completions())
+
+    async def close(self):
+        pass
+
+
+async def _one(service: LLMService):
+    t0 = time.perf_counter()
+    fields = service.category_discuss_fields("조명", "다리는 원목으로")
+    try:
+        await fields.get("keyword")
+        t_keyword = time.perf_counter() - t0
+        await fields.get("image_prompt")
+        t_full = time.perf_counter() - t0
+    finally:
+        await fields.aclose()
+    return t_keyword * 1000, t_full * 1000
+
+
+async def _run(service: LLMService, streaming: bool, requests: int):
+    settings.LLM_STREAMING = streaming
+    results = await asyncio.gather(*(_one(service) for _ in range(requests)))
+    return percentiles([r[0] for r in results]), percentiles([r[1] for r in results])
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ttft", type=float, default=0.3, help="첫 토큰까지 시간(sec)")
+    parser.add_argument("--chars-per-sec", type=float, default=400)
+    parser.add_argument("--requests", type=int, default=8)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    service = LLMService(client=_FakeOpenAI(args.ttft, args.chars_per_sec))
+
+    print(f"ttft={args.ttft}s rate={args.chars_per_sec:.0f} chars/s response={len(_RESPONSE)} chars "
+          f"requests={args.requests}")
+    for streaming in (False, True):
+        keyword, full = await _run(service, streaming, args.requests)
+        print(f"streaming={streaming!s:<5} keyword ms p50={keyword['p50']:.0f} p99={keyword['p99']:.0f} | "
+              f"image_prompt ms p50={full['p50']:.0f} p99={full['p99']:.0f}")
+
+    # 스트림이 keyword 뒤에서 끊기면: keyword 는 받고 image_prompt 에서 예외
+    settings.LLM_STREAMING = True
+    broken = LLMService(client=_FakeOpenAI(args.ttft, args.chars_per_sec, fail_at=len(_RESPONSE) // 2))
+    fields = broken.category_discuss_fields("조명", "다리는 원목으로")
+    try:
+        keyword = await fields.get("keyword")
+        try:
+            await fields.get("image_prompt")
+            outcome = "no error"
+        except ConnectionError as e:
+            outcome = f"{type(e).__name__}: {e}"
+    finally:
+        await fields.aclose()
+    print(f"cut mid-stream: keyword={keyword!r} image_prompt -> {outcome}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
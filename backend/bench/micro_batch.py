@@ -0,0 +1,187 @@
+"""
+CATEGORY_DISCUSS micro-batch 효과 측정 (fake LLM / 이미지, 임시 sqlite DB)
+
+    python -m bench.micro_batch
+    python -m bench.micro_batch --rooms 20 --bursts 5 --burst-size 4 --window 1.0
+
+room 마다 여러 사용자가 --spread 초 안에 --burst-size 개씩 발화하는 burst 를 --bursts 번 보낸다.
+- off: 발화마다 run_phase_pipeline (room 안에서는 순서대로)
+- on : worker 의 micro-batch 와 같은 규칙으로, 앞 발화가 도착한 뒤 --window 안에 들어온 같은 room 발화를
+       (최대 PIPELINE_BATCH_MAX_SIZE 개) 한 번의 run_phase_pipeline 으로 묶는다
+외부 호출 수(LLM / 이미지 생성 세트)와 발화 도착 → 키워드 노드 전송까지의 지연을 비교한다.
+(job claim SQL 은 Postgres 전용이라 여기서는 묶는 규칙만 재현)
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+import logging
+
+from bench.room_ordering import _fields, _select_core, _setup
+from app.core.config import settings
+from app.db import session as db_session
+from app.db.models.room import Room
+from app.schemas.utterance import PhaseType
+from app.services import phase_pipeline
+from app.utils.timing import percentiles
+
+
+class _FakeLLM:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def _call(self, *result):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return result
+
+    def basic_discuss_fields(self, room_topic, text):
+        return _fields(self._call("root", ["a", "b"], "sketch"), ("root_label", "categories", "sketch_prompt"))
+
+    def category_discuss_fields(self, category_name, text):
+        return _fields(self._call(text, "prompt"), ("keyword", "image_prompt"))
+
+    def category_discuss_batch_fields(self, category_name, utterances):
+        return _fields(self._call(list(utterances), "prompt"), ("keywords", "image_prompt"))
+
+
+class _FakeImages:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    async def _images(self, n):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return [f"minio:9000/nodexr-assets/{random.getrandbits(64):x}.png" for _ in range(n)]
+
+    async def iter_images(self, prompt, n=3, timer=None):
+        for key in await self._images(n):
+            yield key
+
+    async def iter_category_images(self, prompt, n, room_id, core_img_url, core_asset_id=None, timer=None):
+        for key in await self._images(n):
+            yield key
+
+
+class _KeywordClock:
+    """NODE_KEYWORD_UPDATE 가 나간 시각을 발화 label 별로 기록"""
+
+    def __init__(self, publisher):
+        self.sent_at = {}
+        self._publisher = publisher
+
+    def __getattr__(self, name):
+        return getattr(self._publisher, name)
+
+    async def publish_delta(self, room_id, cause, version, nodes=(), edges=(), **kwargs):
+        if cause == "NODE_KEYWORD_UPDATE":
+            for node in nodes:
+                self.sent_at[node.get("label")] = time.perf_counter()
+        return await self._publisher.publish_delta(room_id, cause, version, nodes=nodes, edges=edges, **kwargs)
+
+
+async def _room(room_id, args, batch: bool, arrived: dict):
+    rng = random.Random(str(room_id))
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def producer():
+        for b in range(args.bursts):
+            for i in range(args.burst_size):
+                await asyncio.sleep(rng.uniform(0, args.spread / args.burst_size))
+                label = f"{room_id.hex[:6]}-{b}-{i}"
+                arrived[label] = time.perf_counter()
+                queue.put_nowait(label)
+            await asyncio.sleep(args.gap)
+        queue.put_nowait(None)
+
+    async def consumer():
+        while True:
+            label = await queue.get()
+            if label is None:
+                return
+            texts = [label]
+            if batch:
+                # 대표 발화 도착 후 window 까지 기다렸다가 그 사이 쌓인 발화를 같이
+                remaining = args.window - (time.perf_counter() - arrived[label])
+                if remaining > 0:
+                    await asyncio.sleep(remaining)
+                while len(texts) < settings.PIPELINE_BATCH_MAX_SIZE and not queue.empty():
+                    nxt = queue.get_nowait()
+                    if nxt is None:
+                        queue.put_nowait(None)
+                        break
+                    texts.append(nxt)
+            await phase_pipeline.run_phase_pipeline(
+                room_id, PhaseType.CATEGORY_DISCUSS, texts if len(texts) > 1 else label,
+            )
+
+    await asyncio.gather(producer(), consumer())
+
+
+async def _run(room_ids, args, batch: bool):
+    llm = phase_pipeline.llm_service = _FakeLLM(args.llm_latency)
+    images = phase_pipeline.image_service = _FakeImages(args.image_latency)
+    arrived = {}
+    clock = _KeywordClock(phase_pipeline.graph_event_publisher)
+    original = phase_pipeline.graph_event_publisher
+    phase_pipeline.graph_event_publisher = clock
+    try:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(_room(room_id, args, batch, arrived) for room_id in room_ids))
+        elapsed = time.perf_counter() - t0
+    finally:
+        phase_pipeline.graph_event_publisher = original
+    latencies = [(clock.sent_at[label] - t) * 1000 for label, t in arrived.items() if label in clock.sent_at]
+    return elapsed, llm.calls, images.calls, len(arrived), len(latencies), percentiles(latencies)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--bursts", type=int, default=3)
+    parser.add_argument("--burst-size", type=int, default=4, help="burst 하나에 들어오는 발화 수")
+    parser.add_argument("--spread", type=float, default=1.0, help="burst 하나가 퍼져 있는 시간(sec)")
+    parser.add_argument("--gap", type=float, default=2.0, help="burst 사이 간격(sec)")
+    parser.add_argument("--window", type=float, default=1.0, help="micro-batch window(sec)")
+    parser.add_argument("--llm-latency", type=float, default=0.8)
+    parser.add_argument("--image-latency", type=float, default=1.5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    _setup(None)
+    db = db_session.SessionLocal()
+    rooms = [Room(room_topic="bench", password="bench") for _ in range(args.rooms * 2)]
+    db.add_all(rooms)
+    db.commit()
+    room_ids = [room.room_id for room in rooms]
+    db.close()
+
+    phase_pipeline.llm_service = _FakeLLM(0)
+    phase_pipeline.image_service = _FakeImages(0)
+    for room_id in room_ids:
+        await phase_pipeline.run_phase_pipeline(room_id, PhaseType.BASIC_DISCUSS, "basic")
+        _select_core(room_id)
+
+    print(f"rooms={args.rooms} utterances/room={args.bursts * args.burst_size} "
+          f"burst={args.burst_size} in {args.spread}s window={args.window}s "
+          f"llm={args.llm_latency}s image={args.image_latency}s")
+    for batch, ids in ((False, room_ids[:args.rooms]), (True, room_ids[args.rooms:])):
+        elapsed, llm_calls, image_calls, sent, keyed, lat = await _run(ids, args, batch)
+        print(f"batch={batch!s:<5} elapsed={elapsed:.2f}s utterances={sent} keyword-nodes-for={keyed} "
+              f"llm calls={llm_calls} image sets={image_calls} "
+              f"arrival→keyword ms p50={lat['p50']:.0f} p95={lat['p95']:.0f} max={lat['max']:.0f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
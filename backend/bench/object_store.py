@@ -0,0 +1,118 @@
+"""
+object storage 계층 벤치마크 (LocalObjectStore, 임시 디렉토리)
+
+    python -m bench.object_store
+    python -m bench.object_store --busy 60 --uploads 30 --put-latency 0.05 --glb-mb 64
+
+1) 격리: 동기 endpoint / DB 구간처럼 starlette 기본 threadpool(40) 을 오래 잡는 작업이 --busy 개 몰린 상태에서
+   이미지 업로드를 run_in_threadpool(기존) 과 object_store 전용 pool 로 각각 --uploads 개 보냈을 때 지연
+   (업로드 1건은 --put-latency 만큼 걸리는 것으로 가정)
+2) 읽기 메모리: --glb-mb 크기 object 를 get() (한 번에) vs stream() (재사용 버퍼) 으로 읽을 때 최대 메모리(tracemalloc)
+MinIO multipart 병렬 업로드(OBJECT_STORE_PARALLEL_UPLOADS)는 MinIO 서버가 필요해서 여기서는 측정하지 않는다.
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+import tracemalloc
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+import logging
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.storage.object_store import AsyncObjectStore, LocalObjectStore, new_asset_key
+from app.utils.timing import percentiles
+
+
+class _SlowLocal(LocalObjectStore):
+    def __init__(self, root: str, put_latency: float):
+        super().__init__(root)
+        self.put_latency = put_latency
+
+    def put(self, object_key, data, content_type):
+        time.sleep(self.put_latency)  # MinIO 왕복
+        return super().put(object_key, data, content_type)
+
+
+async def _uploads(upload, n: int, data: bytes):
+    latencies = []
+
+    async def one():
+        t0 = time.perf_counter()
+        await upload(new_asset_key("png"), data)
+        latencies.append((time.perf_counter() - t0) * 1000)
+
+    await asyncio.gather(*(one() for _ in range(n)))
+    return percentiles(latencies)
+
+
+async def _isolation(args, store: AsyncObjectStore, data: bytes):
+    backend = store.backend
+    rows = (
+        ("run_in_threadpool", lambda key, body: run_in_threadpool(backend.put, key, body, "image/png")),
+        ("object_store", lambda key, body: store.put(key, body, "image/png")),
+    )
+    for name, upload in rows:
+        # 동기 endpoint / DB 구간이 기본 threadpool 을 잡고 있는 상황
+        busy = [asyncio.ensure_future(run_in_threadpool(time.sleep, args.busy_sec)) for _ in range(args.busy)]
+        await asyncio.sleep(0.05)
+        p = await _uploads(upload, args.uploads, data)
+        await asyncio.gather(*busy)
+        print(f"  {name:<18} upload ms p50={p['p50']:.0f} p95={p['p95']:.0f} max={p['max']:.0f}")
+
+
+async def _read_memory(store: AsyncObjectStore, key: str):
+    for name in ("get", "stream"):
+        tracemalloc.start()
+        digest = hashlib.md5()
+        if name == "get":
+            digest.update(await store.get(key))
+        else:
+            async for chunk in store.stream(key):
+                digest.update(chunk)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"  {name:<6} peak memory={peak / 1024 / 1024:.1f} MiB md5={digest.hexdigest()[:8]}")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--busy", type=int, default=40, help="기본 threadpool 을 잡는 동기 작업 수")
+    parser.add_argument("--busy-sec", type=float, default=1.0)
+    parser.add_argument("--uploads", type=int, default=12)
+    parser.add_argument("--put-latency", type=float, default=0.03)
+    parser.add_argument("--image-kb", type=int, default=1300)
+    parser.add_argument("--glb-mb", type=int, default=32)
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    store = AsyncObjectStore(
+        _SlowLocal(tempfile.mkdtemp(), args.put_latency),
+        max_workers=settings.OBJECT_STORE_MAX_WORKERS,
+        chunk_size=settings.OBJECT_STORE_CHUNK_SIZE,
+    )
+
+    print(f"1) isolation: busy={args.busy}x{args.busy_sec}s uploads={args.uploads} put={args.put_latency * 1000:.0f}ms")
+    await _isolation(args, store, os.urandom(args.image_kb * 1024))
+
+    glb_key = new_asset_key("glb", prefix="nodexr-assets/3d")
+    store.backend.put_latency = 0
+    await store.put(glb_key, os.urandom(args.glb_mb * 1024 * 1024), "model/gltf-binary")
+    print(f"2) read {args.glb_mb} MiB object (chunk={settings.OBJECT_STORE_CHUNK_SIZE // 1024} KiB)")
+    await _read_memory(store, glb_key)
+    print(f"stats: {store.stats()}")
+    store.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,89 @@
+"""
+이미지 후보 점진 전달 벤치마크: gather(전부 끝난 뒤 1회) vs iter_images(끝나는 대로 1장씩)
+
+    python -m bench.progressive_images
+    python -m bench.progressive_images --runs 50 --median 4 --sigma 0.5
+
+fake Gemini 는 요청마다 lognormal 지연 (실제 이미지 생성처럼 3장 중 한 장이 꼬리가 김).
+사용자가 보는 시점 기준으로
+- first: 첫 후보 이미지가 화면에 뜨는 시점
+- all  : 마지막 후보까지 뜨는 시점
+을 비교한다 (gather 는 first == all). 업로드는 임시 디렉토리의 LocalObjectStore.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import random
+import time
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+import logging
+
+from bench.image_generation import _FakeGemini
+from app.services.image_service import ImageService
+from app.storage.object_store import LocalObjectStore, object_store
+from app.utils.timing import percentiles
+
+
+class _JitteryGemini(_FakeGemini):
+    def __init__(self, median: float, sigma: float, scale: float):
+        super().__init__(latency=median)
+        response = self._response
+
+        class _AsyncModels:
+            async def generate_content(self, model, contents, config=None):
+                await asyncio.sleep(random.lognormvariate(0, sigma) * median * scale)
+                return response
+
+        self.aio.models = _AsyncModels()
+
+
+async def _gather(service: ImageService, n: int):
+    t0 = time.perf_counter()
+    # 기존 흐름: 모든 이미지가 끝나야 한 번에 반영
+    keys = [key async for key in service.iter_images("p", n=n)]
+    done = time.perf_counter() - t0
+    return done, done, len(keys)
+
+
+async def _progressive(service: ImageService, n: int):
+    t0 = time.perf_counter()
+    arrivals = [time.perf_counter() - t0 async for _ in service.iter_images("p", n=n)]
+    return arrivals[0], arrivals[-1], len(arrivals)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=30)
+    parser.add_argument("--n", type=int, default=3)
+    parser.add_argument("--median", type=float, default=4.0, help="이미지 1장 생성 시간 중앙값(sec)")
+    parser.add_argument("--sigma", type=float, default=0.4, help="lognormal sigma (꼬리 길이)")
+    parser.add_argument("--scale", type=float, default=0.05, help="벤치 시간 축소 비율 (출력은 원래 단위로 환산)")
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    object_store.backend = LocalObjectStore(tempfile.mkdtemp())
+    service = ImageService(client=_JitteryGemini(args.median, args.sigma, args.scale), max_concurrency=64, timeout=60)
+
+    print(f"runs={args.runs} n={args.n} median={args.median}s sigma={args.sigma} (simulated at x{args.scale})")
+    for name, fn in (("gather", _gather), ("progressive", _progressive)):
+        random.seed(1)
+        first, last = [], []
+        for _ in range(args.runs):
+            f, l, _ = await fn(service, args.n)
+            first.append(f / args.scale)
+            last.append(l / args.scale)
+        pf, pl = percentiles(first), percentiles(last)
+        print(f"{name:<11} first s p50={pf['p50']:.2f} p95={pf['p95']:.2f} | "
+              f"all s p50={pl['p50']:.2f} p95={pl['p95']:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
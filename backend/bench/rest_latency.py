@@ -0,0 +1,211 @@
+"""
+파이프라인이 돌고 있는 동안의 REST 지연시간 (p50 / p95 / p99) 부하 테스트
+
+    python -m bench.rest_latency                              # sqlite 파일 DB, pool 5 + overflow 0
+    python -m bench.rest_latency --hold-session               # 비교: 외부 호출 동안 커넥션을 잡고 있던 이전 구조
+    python -m bench.rest_latency --dsn postgresql+psycopg2://... --rooms 30
+
+- room 마다 BASIC_DISCUSS → core 선택 → CATEGORY_DISCUSS × n 을 run_phase_pipeline 으로 실행
+  (LLM 은 즉시 응답하는 fake, 이미지 생성은 --image-latency 만큼 걸리는 fake)
+- 그 동안 GET /api/rooms/info 를 --clients 개 동시 클라이언트가 계속 호출 (ASGI in-process)
+- --hold-session 은 이미지 생성을 기다리는 동안 커넥션 하나를 checkout 해 두어
+  세션을 파이프라인 전체에 걸쳐 열어 두던 구조의 풀 점유를 재현한다
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+import logging
+
+import httpx
+from sqlalchemy import create_engine, text as sql
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+
+from app.db import session as db_session
+from app.db.pool import TimedQueuePool, pool_stats
+from app.db.session import Base
+from app.db.models.room import Room
+from app.db.models.node import Node
+from app.db.models.asset import Asset
+from app.db.models.user import User  # noqa: F401 (metadata 등록)
+from app.db.models.edge import Edge  # noqa: F401
+from app.db.models.graph_snapshot import GraphSnapshot  # noqa: F401
+from app.main import app
+from app.schemas.utterance import PhaseType
+from app.services import phase_pipeline
+from app.services.llm_service import LLMFields
+from app.utils.timing import percentiles
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+def _fields(result, names) -> LLMFields:
+    async def source():
+        for field in zip(names, await result):
+            yield field
+    return LLMFields(source(), names)
+
+
+class _FakeLLM:
+    async def basic_discuss(self, room_topic, text):
+        return "root", ["a", "b"], "sketch"
+
+    async def category_discuss(self, category_name, text):
+        return text, "prompt"
+
+    def basic_discuss_fields(self, room_topic, text):
+        return _fields(self.basic_discuss(room_topic, text), ("root_label", "categories", "sketch_prompt"))
+
+    def category_discuss_fields(self, category_name, text):
+        return _fields(self.category_discuss(category_name, text), ("keyword", "image_prompt"))
+
+
+class _FakeImages:
+    def __init__(self, engine, latency: float, hold_session: bool):
+        self.engine = engine
+        self.latency = latency
+        self.hold_session = hold_session
+
+    async def _images(self, n):
+        if self.hold_session:
+            # checkout 만 하고 await 동안 들고 있음 (이전 구조의 SessionLocal 점유)
+            conn = await asyncio.to_thread(self.engine.connect)
+            try:
+                conn.execute(sql("SELECT 1"))
+                await asyncio.sleep(self.latency)
+            finally:
+                conn.close()
+        else:
+            await asyncio.sleep(self.latency)
+        return [f"minio:9000/nodexr-assets/{uuid.uuid4()}.png" for _ in range(n)]
+
+    async def iter_images(self, prompt, n=3, timer=None):
+        for key in await self._images(n):
+            yield key
+
+    async def iter_category_images(self, prompt, n, room_id, core_img_url, core_asset_id=None, timer=None):
+        for key in await self._images(n):
+            yield key
+
+
+def _setup(args):
+    dsn = args.dsn
+    connect_args = {}
+    if dsn is None:
+        dsn = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    if dsn.startswith("sqlite"):
+        connect_args = {"check_same_thread": False, "timeout": 30}
+    engine = create_engine(
+        dsn,
+        connect_args=connect_args,
+        poolclass=TimedQueuePool,
+        pool_size=args.pool_size,
+        max_overflow=args.max_overflow,
+        pool_timeout=args.pool_timeout,
+    )
+    Base.metadata.create_all(engine)
+    db_session.SessionLocal.configure(bind=engine)
+    return engine
+
+
+def _select_core(room_id: uuid.UUID):
+    db = db_session.SessionLocal()
+    try:
+        asset = (
+            db.query(Asset)
+            .join(Node, Node.node_id == Asset.node_id)
+            .filter(Node.room_id == room_id)
+            .first()
+        )
+        asset.type = "CURR_2D_CORE"
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _run_room(room_id: uuid.UUID, n_utterances: int):
+    await phase_pipeline.run_phase_pipeline(room_id, PhaseType.BASIC_DISCUSS, "basic")
+    await asyncio.to_thread(_select_core, room_id)
+    for i in range(n_utterances):
+        await phase_pipeline.run_phase_pipeline(room_id, PhaseType.CATEGORY_DISCUSS, f"u{i}")
+
+
+async def _client(http: httpx.AsyncClient, room_ids, done: asyncio.Event, latencies, errors):
+    i = 0
+    while not done.is_set():
+        room_id = room_ids[i % len(room_ids)]
+        i += 1
+        t0 = time.perf_counter()
+        try:
+            resp = await http.get("/api/rooms/info", params={"room_id": str(room_id)})
+            ok = resp.status_code == 200
+        except Exception:
+            ok = False
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if not ok:
+            errors.append(1)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dsn", default=None)
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--utterances", type=int, default=3, help="room 당 CATEGORY_DISCUSS 수")
+    parser.add_argument("--image-latency", type=float, default=1.0)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--max-overflow", type=int, default=0)
+    parser.add_argument("--pool-timeout", type=float, default=5.0)
+    parser.add_argument("--hold-session", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    engine = _setup(args)
+    phase_pipeline.llm_service = _FakeLLM()
+    phase_pipeline.image_service = _FakeImages(engine, args.image_latency, args.hold_session)
+
+    db = db_session.SessionLocal()
+    rooms = [Room(room_topic="bench", password="bench") for _ in range(args.rooms)]
+    db.add_all(rooms)
+    db.commit()
+    room_ids = [room.room_id for room in rooms]
+    db.close()
+
+    latencies, errors = [], []
+    done = asyncio.Event()
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        clients = [
+            asyncio.create_task(_client(http, room_ids, done, latencies, errors))
+            for _ in range(args.clients)
+        ]
+        t0 = time.perf_counter()
+        await asyncio.gather(*(_run_room(room_id, args.utterances) for room_id in room_ids))
+        elapsed = time.perf_counter() - t0
+        done.set()
+        await asyncio.gather(*clients)
+
+    stats = pool_stats(engine)
+    print(f"mode={'hold-session' if args.hold_session else 'short-phases'} rooms={args.rooms} "
+          f"pipelines={args.rooms * (args.utterances + 1)} pool={args.pool_size}+{args.max_overflow} "
+          f"elapsed={elapsed:.2f}s")
+    print(f"REST /api/rooms/info: {percentiles(latencies)} errors={len(errors)}")
+    print(f"pool checkout wait ms: {stats['wait_ms']} timeouts={stats['timeouts']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
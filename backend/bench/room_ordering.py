@@ -0,0 +1,227 @@
+"""
+room 별 직렬 / room 간 병렬 파이프라인 stress test
+
+    python -m bench.room_ordering                       # 50 rooms × 20 utterances
+    python -m bench.room_ordering --rooms 200 --utterances 10 --unordered
+
+LLM / 이미지 호출은 임의 지연을 주는 fake 로 대체하고 run_phase_pipeline 을 전부 동시에 띄운다.
+- room 마다 category_details.order 가 발화 순서와 같은지 (중복 / 역전 없음)
+- 같은 room 의 파이프라인이 겹쳐 실행된 적이 없는지 (room 당 최대 동시 실행 수 = 1)
+- 여러 room 이 동시에 진행됐는지 (동시 진행 room 수 / 전체 소요시간 vs 전체 직렬 소요시간)
+--unordered 는 room_serial 을 끄고 같은 검사를 돌려 겹침이 검출되는지 확인하는 용도.
+
+기본은 임시 sqlite 파일 DB (파이프라인 DB 구간이 threadpool 에서 동시에 실행되므로 in-memory 공유 연결은 불가).
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import uuid
+from contextlib import asynccontextmanager
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+import logging
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+
+from app.db import session as db_session
+from app.db.session import Base
+from app.db.models.room import Room
+from app.db.models.category_detail import CategoryDetail
+from app.db.models.node import Node
+from app.db.models.asset import Asset
+from app.db.models.edge import Edge  # noqa: F401 (metadata 등록)
+from app.db.models.graph_snapshot import GraphSnapshot  # noqa: F401
+from app.db.models.user import User  # noqa: F401 (pipeline_jobs → utterances FK)
+from app.db.models.utterance import Utterance  # noqa: F401
+from app.schemas.utterance import PhaseType
+from app.services import phase_pipeline
+from app.services.llm_service import LLMFields
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+def _fields(result, names) -> LLMFields:
+    async def source():
+        for field in zip(names, await result):
+            yield field
+    return LLMFields(source(), names)
+
+
+class _FakeLLM:
+    def __init__(self, max_delay: float):
+        self.max_delay = max_delay
+
+    async def basic_discuss(self, room_topic, text):
+        await asyncio.sleep(random.uniform(0, self.max_delay))
+        return "root", ["a", "b"], "sketch"
+
+    async def category_discuss(self, category_name, text):
+        await asyncio.sleep(random.uniform(0, self.max_delay))
+        return text, "prompt"
+
+    def basic_discuss_fields(self, room_topic, text):
+        return _fields(self.basic_discuss(room_topic, text), ("root_label", "categories", "sketch_prompt"))
+
+    def category_discuss_fields(self, category_name, text):
+        return _fields(self.category_discuss(category_name, text), ("keyword", "image_prompt"))
+
+
+class _FakeImages:
+    """이미지 생성 구간에서 room 별 / 전체 동시 실행 수를 기록"""
+
+    def __init__(self, max_delay: float):
+        self.max_delay = max_delay
+        self.in_flight: dict = {}
+        self.max_per_room = 0
+        self.max_rooms = 0
+
+    async def _images(self, n, room_id=None):
+        if room_id is not None:
+            self.in_flight[room_id] = self.in_flight.get(room_id, 0) + 1
+            self.max_per_room = max(self.max_per_room, self.in_flight[room_id])
+            self.max_rooms = max(self.max_rooms, len(self.in_flight))
+        try:
+            await asyncio.sleep(random.uniform(0, self.max_delay))
+        finally:
+            if room_id is not None:
+                self.in_flight[room_id] -= 1
+                if not self.in_flight[room_id]:
+                    del self.in_flight[room_id]
+        return [f"minio:9000/nodexr-assets/{uuid.uuid4()}.png" for _ in range(n)]
+
+    async def iter_images(self, prompt, n=3, timer=None):
+        for key in await self._images(n):
+            yield key
+
+    async def iter_category_images(self, prompt, n, room_id, core_img_url, core_asset_id=None, timer=None):
+        for key in await self._images(n, room_id):
+            yield key
+
+
+class _NoLock:
+    @asynccontextmanager
+    async def hold(self, key):
+        yield
+
+
+def _setup(dsn: str | None):
+    connect_args = {}
+    if dsn is None:
+        dsn = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+    if dsn.startswith("sqlite"):
+        connect_args = {"check_same_thread": False, "timeout": 30}
+    engine = create_engine(dsn, connect_args=connect_args, pool_size=50, max_overflow=50)
+    Base.metadata.create_all(engine)
+    db_session.SessionLocal.configure(bind=engine)
+    return engine
+
+
+def _select_core(room_id: uuid.UUID):
+    # /api/2d/select 와 같은 효과: BASIC_DISCUSS 후보 하나를 CURR_2D_CORE 로
+    db = db_session.SessionLocal()
+    try:
+        asset = (
+            db.query(Asset)
+            .join(Node, Node.node_id == Asset.node_id)
+            .filter(Node.room_id == room_id)
+            .first()
+        )
+        asset.type = "CURR_2D_CORE"
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _run_room(room_id: uuid.UUID, n_utterances: int, gap: float):
+    await phase_pipeline.run_phase_pipeline(room_id, PhaseType.BASIC_DISCUSS, "basic")
+    _select_core(room_id)
+
+    # 발화는 room 안에서 순서대로 도착 (API 호출 순서), 파이프라인은 기다리지 않고 바로 띄운다
+    tasks = []
+    for i in range(n_utterances):
+        await asyncio.sleep(random.uniform(0, gap))
+        tasks.append(asyncio.create_task(
+            phase_pipeline.run_phase_pipeline(room_id, PhaseType.CATEGORY_DISCUSS, f"u{i:04d}")
+        ))
+    await asyncio.gather(*tasks)
+
+
+def _check(room_ids, n_utterances: int) -> int:
+    db = db_session.SessionLocal()
+    violations = 0
+    try:
+        for room_id in room_ids:
+            labels = [
+                label for label, in (
+                    db.query(CategoryDetail.detail_text)
+                    .join(Node, Node.node_id == CategoryDetail.node_id)
+                    .filter(Node.room_id == room_id, CategoryDetail.detail_text.like("u%"))
+                    .order_by(CategoryDetail.order)
+                    .all()
+                )
+            ]
+            if labels != [f"u{i:04d}" for i in range(n_utterances)]:
+                violations += 1
+    finally:
+        db.close()
+    return violations
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dsn", default=None)
+    parser.add_argument("--rooms", type=int, default=50)
+    parser.add_argument("--utterances", type=int, default=20, help="room 당 CATEGORY_DISCUSS 발화 수")
+    parser.add_argument("--max-delay", type=float, default=0.05, help="fake 이미지 생성 지연 상한(sec)")
+    parser.add_argument("--gap", type=float, default=0.002, help="같은 room 발화 간 도착 간격 상한(sec)")
+    parser.add_argument("--unordered", action="store_true")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    _setup(args.dsn)
+    phase_pipeline.llm_service = _FakeLLM(args.max_delay)
+    images = phase_pipeline.image_service = _FakeImages(args.max_delay)
+    if args.unordered:
+        phase_pipeline.room_serial = _NoLock()
+
+    db = db_session.SessionLocal()
+    rooms = [Room(room_topic="bench", password="bench") for _ in range(args.rooms)]
+    db.add_all(rooms)
+    db.commit()
+    room_ids = [room.room_id for room in rooms]
+    db.close()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_run_room(room_id, args.utterances, args.gap) for room_id in room_ids))
+    elapsed = time.perf_counter() - t0
+
+    total = args.rooms * (args.utterances + 1)
+    violations = _check(room_ids, args.utterances)
+    # room 하나를 직렬로 돌렸을 때의 기대 시간 (이미지 지연 평균 × 발화 수, 도착 간격 제외)
+    serial_room = (args.utterances + 1) * args.max_delay / 2
+
+    print(f"rooms={args.rooms} utterances/room={args.utterances + 1} pipelines={total} ordered={not args.unordered}")
+    print(f"elapsed={elapsed:.2f}s  throughput={total / elapsed:.0f}/s  "
+          f"single-room serial≈{serial_room:.2f}s  all-serial≈{serial_room * args.rooms:.2f}s")
+    print(f"rooms with order violations: {violations}/{args.rooms}")
+    print(f"max concurrent pipelines in one room: {images.max_per_room}  "
+          f"max rooms in flight: {images.max_rooms}")
+    print(f"room locks left: {phase_pipeline.room_serial.stats() if not args.unordered else '-'}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
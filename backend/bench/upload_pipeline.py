@@ -0,0 +1,94 @@
+"""
+생성 이미지 업로드 분리 벤치마크 (fake Gemini + 느린 LocalObjectStore, 임시 디렉토리)
+
+    python -m bench.upload_pipeline
+    python -m bench.upload_pipeline --runs 10 --n 3 --latency 1.0 --put-latency 0.4 --workers 1,8
+
+ImageService.iter_images 로 n 장을 동시에 생성하고, key 가 나오는 시점을 비교한다.
+- wait upload : key 를 내보내기 전에 업로드 완료까지 기다림 (IMAGE_UPLOAD_EARLY_RELEASE=False, 기존 흐름)
+- early       : key 예약 + hot 캐시 적재 후 바로 내보내고 업로드는 worker pool 에서
+durable 은 마지막 업로드가 object storage 에 반영된 시점 (worker 수가 적으면 뒤로 밀림).
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+import logging
+
+from bench.image_generation import _FakeGemini
+from bench.object_store import _SlowLocal
+from app.core.config import settings
+from app.services.asset_cache import asset_cache
+from app.services.image_service import ImageService
+from app.services.image_upload import ImageUploadPool
+from app.services import image_service as image_module
+from app.storage.object_store import object_store, to_object_key
+from app.utils.timing import StageTimer, percentiles
+
+
+async def _run(service: ImageService, pool: ImageUploadPool, n: int):
+    timer = StageTimer()
+    t0 = time.perf_counter()
+    first = last = None
+    keys = []
+    async for img_url in service.iter_images("bench", n=n, timer=timer):
+        last = (time.perf_counter() - t0) * 1000
+        first = first if first is not None else last
+        keys.append(to_object_key(img_url))
+        assert asset_cache.lookup(keys[-1]) is not None  # 업로드 전에도 프록시가 바로 응답
+    await pool._queue.join()
+    durable = (time.perf_counter() - t0) * 1000
+    for key in keys:
+        assert os.path.exists(object_store.backend.path_for(key))
+    return first, last, durable, timer
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=8)
+    parser.add_argument("--n", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.5, help="Gemini 1장 생성 시간")
+    parser.add_argument("--put-latency", type=float, default=0.3, help="MinIO 업로드 1건 시간")
+    parser.add_argument("--workers", default="1,8", help="업로드 worker 수 목록")
+    args = parser.parse_args()
+
+    logging.disable(logging.ERROR)
+    object_store.backend = _SlowLocal(tempfile.mkdtemp(), args.put_latency)
+    settings.ASSET_CACHE_ENABLED = True
+    service = ImageService(client=_FakeGemini(args.latency))
+
+    print(f"runs={args.runs} n={args.n} gemini={args.latency * 1000:.0f}ms put={args.put_latency * 1000:.0f}ms")
+    for workers in (int(w) for w in args.workers.split(",")):
+        for name, early in (("wait upload", False), ("early", True)):
+            settings.IMAGE_UPLOAD_EARLY_RELEASE = early
+            pool = ImageUploadPool(workers=workers, max_queue=64, retries=0, retry_backoff_sec=0)
+            image_module.image_upload_pool = pool
+            firsts, lasts, durables = [], [], []
+            for _ in range(args.runs):
+                first, last, durable, timer = await _run(service, pool, args.n)
+                firsts.append(first)
+                lasts.append(last)
+                durables.append(durable)
+            f, l, d = percentiles(firsts), percentiles(lasts), percentiles(durables)
+            print(f"workers={workers} {name:<11} first key ms p50={f['p50']:.0f} | all keys p50={l['p50']:.0f} "
+                  f"| durable p50={d['p50']:.0f} | last run timer={timer.stages}")
+            await pool.drain(timeout=10)
+
+    stages = service.stage_stats()
+    print("per image ms p50: " + ", ".join(
+        f"{name}={stages[name].get('p50')}" for name in ("generate", "encode", "upload_wait")
+    ))
+    object_store.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
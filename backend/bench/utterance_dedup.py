@@ -0,0 +1,171 @@
+"""
+중복 발화 병합 효과 측정 (POST /api/utterances, in-process ASGI)
+
+    python -m bench.utterance_dedup
+    python -m bench.utterance_dedup --rooms 20 --utterances 30 --threshold 0.8
+
+room 마다 서로 다른 발화 --utterances 개를 보내되, STT 클라이언트처럼 마지막 어절이 빠진
+partial 을 먼저 보내거나 final 을 (공백만 바꿔) 한 번 더 보내는 경우를 섞는다.
+worker 는 띄우지 않으므로 job 은 PENDING 으로 남아 전부 "진행 중" 비교 대상이 된다.
+- 만들어진 job 수 vs 보낸 요청 수 (병합률) / final 발화 text 로 된 job 이 없는 발화 수 (잘못 합쳐짐)
+- dedup on / off 요청 지연시간 분포
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+import logging
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import localtimestamp
+
+from app.core.config import settings
+from app.db import session as db_session
+from app.db.session import Base
+from app.db.models.room import Room
+from app.db.models.user import User
+from app.db.models.pipeline_job import PipelineJob
+from app.db.models.utterance import Utterance  # noqa: F401 (metadata 등록)
+from app.main import app
+from app.services.utterance_dedup import utterance_dedup
+from app.utils.timing import percentiles
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@compiles(localtimestamp, "sqlite")
+def _localtimestamp_sqlite(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+_WORDS = [
+    "의자", "다리는", "원목으로", "등받이를", "조금", "더", "높게", "곡선", "형태로", "쿠션은",
+    "회색", "패브릭", "팔걸이", "없이", "가볍게", "금속", "프레임", "매트한", "마감", "둥글게",
+]
+
+
+def _utterance(rng: random.Random) -> str:
+    return " ".join(rng.sample(_WORDS, rng.randint(5, 9)))
+
+
+def _posts(rng: random.Random, text: str):
+    """STT 클라이언트가 한 발화에 대해 보내는 요청들 (partial → final → 재전송)"""
+    partial = [text.rsplit(" ", 1)[0]] if rng.random() < 0.3 else []
+    resends = rng.sample([text, "  " + text.replace(" ", "  ") + " "], rng.randint(0, 1))
+    return partial + [text] + resends
+
+
+def _setup():
+    engine = create_engine(
+        f"sqlite:///{tempfile.mkdtemp()}/bench.db",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(engine)
+    db_session.SessionLocal.configure(bind=engine)
+
+
+def _seed(rooms: int):
+    db = db_session.SessionLocal()
+    try:
+        pairs = []
+        for _ in range(rooms):
+            room = Room(room_topic="bench", password="bench")
+            db.add(room)
+            db.flush()
+            user = User(room_id=room.room_id, nickname="bench")
+            db.add(user)
+            db.flush()
+            pairs.append((room.room_id, user.user_id))
+        db.commit()
+        return pairs
+    finally:
+        db.close()
+
+
+def _job_texts():
+    db = db_session.SessionLocal()
+    try:
+        return [(room_id, text) for room_id, text in db.query(PipelineJob.room_id, PipelineJob.text).all()]
+    finally:
+        db.close()
+
+
+def _clear_jobs():
+    db = db_session.SessionLocal()
+    try:
+        db.query(PipelineJob).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _room(http, room_id, user_id, n, seed, latencies, sent):
+    rng = random.Random(seed)
+    for _ in range(n):
+        text = _utterance(rng)
+        sent.append((room_id, text))
+        for body in _posts(rng, text):
+            t0 = time.perf_counter()
+            resp = await http.post("/api/utterances", json={
+                "room_id": str(room_id), "user_id": str(user_id),
+                "phase": "CATEGORY_DISCUSS", "text": body,
+            })
+            latencies.append((time.perf_counter() - t0) * 1000)
+            assert resp.status_code == 200, resp.text
+
+
+async def _run(pairs, n, enabled):
+    settings.UTTERANCE_DEDUP_ENABLED = enabled
+    _clear_jobs()
+    latencies, sent = [], []
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+        await asyncio.gather(*(
+            _room(http, room_id, user_id, n, seed, latencies, sent)
+            for seed, (room_id, user_id) in enumerate(pairs)
+        ))
+    return latencies, sent
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rooms", type=int, default=10)
+    parser.add_argument("--utterances", type=int, default=20, help="room 당 서로 다른 발화 수")
+    parser.add_argument("--threshold", type=float, default=settings.UTTERANCE_DEDUP_THRESHOLD)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    _setup()
+    pairs = _seed(args.rooms)
+    utterance_dedup.threshold = args.threshold
+
+    for enabled in (False, True):
+        latencies, sent = await _run(pairs, args.utterances, enabled)
+        jobs = _job_texts()
+        distinct = set(sent)
+        # 합쳐졌더라도 final 발화 text 로 job 이 남아 있어야 함 (partial 만 남거나 다른 발화에 먹히면 누락)
+        missing = len(distinct - set(jobs))
+        print(f"dedup={enabled!s:<5} posts={len(latencies)} distinct={len(distinct)} jobs={len(jobs)} "
+              f"missing-final={missing} latency ms p50={percentiles(latencies)['p50']:.1f} "
+              f"p99={percentiles(latencies)['p99']:.1f}")
+    print(f"dedup stats: {utterance_dedup.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
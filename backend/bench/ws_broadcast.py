@@ -0,0 +1,97 @@
+"""
+WSRoomManager.broadcast 인코딩 비용 벤치마크 (연결 수 × graph 크기)
+
+    python -m bench.ws_broadcast
+
+- legacy : UUID 재귀 변환 후 연결마다 send_json (starlette 의 json.dumps)
+- current: orjson 으로 1회 인코딩 후 같은 text 프레임을 모든 연결에 전송
+소켓 I/O 는 제외하고 인코딩에 드는 CPU 만 측정한다.
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+import uuid
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY",
+):
+    os.environ.setdefault(_k, "bench")
+
+from app.core.ws_manager import WSRoomManager
+from app.services.graph_builder import asset_node_item, category_node_item, edge_item
+from app.utils.serialize import stringify_uuids
+
+
+class _FakeWS:
+    """starlette WebSocket 의 send_json / send_text 인코딩만 재현"""
+
+    async def accept(self):
+        pass
+
+    async def send_json(self, data):
+        json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+    async def send_text(self, data):
+        pass
+
+
+def _graph_payload(n_nodes: int) -> dict:
+    nodes, edges = [], []
+    for i in range(n_nodes // 4):
+        cid = uuid.uuid4()
+        nodes.append(category_node_item(cid, f"keyword-{i}", i))
+        for _ in range(3):
+            aid = uuid.uuid4()
+            nodes.append(asset_node_item(aid, f"minio:9000/nodexr-assets/{aid}.png", cid))
+            edges.append(edge_item(uuid.uuid4(), cid, aid))
+    return {
+        "event": "GRAPH_STATE",
+        "version": 1,
+        "core_img_url": None,
+        "graph_state": {"graph_snapshot_id": uuid.uuid4(), "nodes": nodes, "edges": edges},
+    }
+
+
+async def _legacy_broadcast(conns, payload):
+    payload = stringify_uuids(payload)
+    for ws in conns:
+        await ws.send_json(payload)
+
+
+async def _bench(fn, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        await fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--conns", default="1,5,20,50")
+    parser.add_argument("--nodes", default="40,400,2000")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    room_id = uuid.uuid4()
+    print(f"{'nodes':>6} {'conns':>6} | {'legacy ms':>10} {'current ms':>11} {'speedup':>8}")
+    for n_nodes in (int(n) for n in args.nodes.split(",")):
+        payload = _graph_payload(n_nodes)
+        for n_conns in (int(c) for c in args.conns.split(",")):
+            manager = WSRoomManager(f"bench-{n_nodes}-{n_conns}")
+            conns = [_FakeWS() for _ in range(n_conns)]
+            for ws in conns:
+                await manager.connect(room_id, ws)
+
+            legacy = await _bench(lambda: _legacy_broadcast(conns, payload), args.repeat)
+            current = await _bench(lambda: manager.broadcast(room_id, payload), args.repeat)
+            print(f"{n_nodes:>6} {n_conns:>6} | {legacy:>10.3f} {current:>11.3f} {legacy / current:>7.1f}x")
+
+
+if __name__ == "__main__":
+    import logging
+    logging.disable(logging.INFO)
+    asyncio.run(main())
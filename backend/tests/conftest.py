@@ -0,0 +1,62 @@
+"""
+공용 fixture. Postgres / MinIO / OpenAI 없이 실행되도록:
+- 필수 환경변수는 더미 값으로 (settings 로드용)
+- DB 는 테스트마다 새 in-memory SQLite (JSONB 는 JSON 으로 컴파일)
+"""
+import os
+
+for _k in (
+    "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD", "POSTGRES_HOST",
+    "MINIO_ENDPOINT", "MINIO_ACCESS_KEY", "MINIO_SECRET_KEY", "MINIO_BUCKET",
+    "OPENAI_API_KEY", "GOOGLE_API_KEY",
+):
+    os.environ.setdefault(_k, "test")
+
+import importlib
+import pathlib
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
+
+import app.db.session as db_session
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_as_json(type_, compiler, **kw):
+    return "JSON"
+
+
+for _model in (pathlib.Path(db_session.__file__).parent / "models").glob("*.py"):
+    importlib.import_module(f"app.db.models.{_model.stem}")
+
+
+@pytest.fixture
+def db_engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    db_session.Base.metadata.create_all(engine)
+    db_session.SessionLocal.configure(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(db_engine):
+    session = db_session.SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture(autouse=True)
+def _reset_graph_state():
+    # 프로세스 전역 캐시 / version 이 테스트 사이에 남지 않도록
+    from app.services.graph_cache import graph_cache
+    from app.services.graph_events import graph_event_publisher
+
+    yield
+    graph_cache._rooms.clear()
+    graph_event_publisher._versions.clear()
@@ -0,0 +1,117 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from app.services import asset_cache as asset_cache_module
+from app.services.asset_cache import HotAssetCache, _parse_range, _Unsatisfiable
+
+DATA = bytes(range(256)) * 4
+
+
+def _key() -> str:
+    return f"nodexr-assets/{uuid.uuid4()}.png"
+
+
+def _body(response) -> bytes:
+    if not hasattr(response, "body_iterator"):
+        return response.body
+
+    async def read():
+        return b"".join([chunk async for chunk in response.body_iterator])
+
+    return asyncio.run(read())
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("bytes=0-9", (0, 9)),
+    ("bytes=1000-", (1000, 1023)),
+    ("bytes=-24", (1000, 1023)),
+    ("bytes=-5000", (0, 1023)),
+    ("bytes=10-99999", (10, 1023)),
+    ("bytes=0-1,5-6", None),
+    ("items=0-1", None),
+    ("bytes=a-b", None),
+])
+def test_parse_range(value, expected):
+    assert _parse_range(value, len(DATA)) == expected
+
+
+@pytest.mark.parametrize("value", ["bytes=1024-", "bytes=-0", "bytes=9-3"])
+def test_parse_range_unsatisfiable(value):
+    with pytest.raises(_Unsatisfiable):
+        _parse_range(value, len(DATA))
+
+
+@pytest.fixture(params=["memory", "disk"])
+def entry(request, tmp_path):
+    cache = HotAssetCache(max_bytes=1 << 20, max_object_bytes=1 << 20, disk_dir=str(tmp_path), disk_max_bytes=1 << 20)
+    cache.start()
+    key = _key()
+    cache._store(key, DATA, "image/png", None)
+    memory = cache.lookup(key)
+    if request.param == "memory":
+        return cache, memory
+    return cache, cache._disk[key]
+
+
+def test_if_none_match_is_304(entry):
+    cache, item = entry
+    res = cache.respond(item, {"if-none-match": f'"other", {item.etag}'})
+    assert res.status_code == 304
+    assert res.headers["etag"] == item.etag
+
+
+def test_range_is_206(entry):
+    cache, item = entry
+    res = cache.respond(item, {"range": "bytes=10-19"})
+    assert res.status_code == 206
+    assert res.headers["content-range"] == f"bytes 10-19/{len(DATA)}"
+    assert res.headers["content-length"] == "10"
+    assert _body(res) == DATA[10:20]
+
+
+def test_unsatisfiable_range_is_416(entry):
+    cache, item = entry
+    res = cache.respond(item, {"range": f"bytes={len(DATA)}-"})
+    assert res.status_code == 416
+    assert res.headers["content-range"] == f"bytes */{len(DATA)}"
+
+
+def test_stale_if_range_gets_full_body(entry):
+    cache, item = entry
+    res = cache.respond(item, {"range": "bytes=10-19", "if-range": '"stale"'})
+    assert res.status_code == 200
+    assert _body(res) == DATA
+
+
+def test_disk_tier_starts_empty_and_clears_dead_workers(tmp_path, monkeypatch):
+    live_pid, dead_pid = 111, 222
+    monkeypatch.setattr(asset_cache_module, "_pid_alive", lambda pid: pid == live_pid)
+    for name in (str(live_pid), str(dead_pid), str(os.getpid())):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "cached").write_bytes(DATA)
+    (tmp_path / "legacy_flat_file").write_bytes(DATA)
+
+    cache = HotAssetCache(max_bytes=1 << 20, max_object_bytes=1 << 20, disk_dir=str(tmp_path), disk_max_bytes=1 << 20)
+    # 생성(import) 시점에는 디스크를 건드리지 않음
+    assert cache.disk_dir is None
+    assert len(os.listdir(tmp_path)) == 4
+
+    cache.start()
+
+    assert cache.disk_dir == str(tmp_path / str(os.getpid()))
+    assert os.listdir(cache.disk_dir) == []
+    assert sorted(os.listdir(tmp_path)) == sorted([str(live_pid), str(os.getpid())])
+    assert cache.stats()["disk_bytes"] == 0
+
+
+def test_disk_budget_evicts_files(tmp_path):
+    cache = HotAssetCache(max_bytes=1, max_object_bytes=1 << 20, disk_dir=str(tmp_path), disk_max_bytes=len(DATA) * 2)
+    cache.start()
+    for _ in range(4):
+        cache._store(_key(), DATA, "image/png", None)
+
+    assert cache.stats()["disk_bytes"] == len(DATA) * 2
+    assert len(os.listdir(cache.disk_dir)) == 2
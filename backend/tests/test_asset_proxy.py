@@ -0,0 +1,81 @@
+import uuid
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import assets
+from app.core.config import settings
+from app.services.asset_proxy import asset_proxy
+
+BODY = bytes(range(256)) * 4
+ETAG = '"abc123"'
+
+
+def _minio(request: httpx.Request) -> httpx.Response:
+    """Range / If-None-Match 만 해석하는 MinIO 흉내"""
+    _minio.seen.append(request)
+    if request.url.path.endswith("missing.png"):
+        return httpx.Response(404)
+    headers = {"etag": ETAG, "accept-ranges": "bytes", "content-type": "image/png", "x-amz-request-id": "1"}
+    if request.headers.get("if-none-match") == ETAG:
+        return httpx.Response(304, headers=headers)
+    if request.headers.get("range") == "bytes=10-19":
+        headers["content-range"] = f"bytes 10-19/{len(BODY)}"
+        return _streamed(206, headers, BODY[10:20])
+    return _streamed(200, headers, BODY)
+
+
+def _streamed(status: int, headers: dict, body: bytes) -> httpx.Response:
+    # 프록시는 aiter_raw 로 읽으므로 미리 읽힌 content 대신 stream 으로
+    return httpx.Response(status, headers={**headers, "content-length": str(len(body))}, stream=httpx.ByteStream(body))
+
+
+@pytest.fixture
+def client(monkeypatch):
+    _minio.seen = []
+    monkeypatch.setattr(settings, "ASSET_CACHE_ENABLED", False)
+    monkeypatch.setattr(settings, "ASSET_DELIVERY_MODE", "proxy")
+    monkeypatch.setattr(settings, "OBJECT_STORE_BACKEND", "minio")
+    monkeypatch.setattr(asset_proxy, "client", httpx.AsyncClient(transport=httpx.MockTransport(_minio)))
+    app = FastAPI()
+    app.include_router(assets.router)
+    with TestClient(app) as client:
+        yield client
+
+
+def test_range_is_forwarded_and_206_passed_through(client):
+    key = f"{uuid.uuid4()}.png"
+    res = client.get(f"/nodexr-assets/{key}", headers={"range": "bytes=10-19", "cookie": "session=1"})
+
+    assert res.status_code == 206
+    assert res.content == BODY[10:20]
+    assert res.headers["content-range"] == f"bytes 10-19/{len(BODY)}"
+    assert res.headers["cache-control"].endswith("immutable")
+    assert "x-amz-request-id" not in res.headers
+
+    upstream = _minio.seen[-1]
+    assert upstream.url.path == f"/nodexr-assets/{key}"
+    assert upstream.headers["range"] == "bytes=10-19"
+    assert "cookie" not in upstream.headers
+
+
+def test_if_none_match_returns_304_without_body(client):
+    res = client.get("/nodexr-assets/core.png", headers={"if-none-match": ETAG})
+
+    assert res.status_code == 304
+    assert res.content == b""
+    assert res.headers["etag"] == ETAG
+    assert res.headers["cache-control"] == "no-cache"  # uuid 파일명이 아니면 매번 재검증
+
+
+def test_full_get_streams_body(client):
+    res = client.get("/nodexr-assets/core.png")
+    assert res.status_code == 200
+    assert res.content == BODY
+
+
+def test_missing_object_is_404(client):
+    res = client.get("/nodexr-assets/missing.png")
+    assert res.status_code == 404
@@ -0,0 +1,67 @@
+import time
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.services.graph_builder import asset_node_item
+from app.services.graph_events import ReplayBuffer, _parse_node
+from app.utils.asset_url import asset_key_from_url, build_asset_url, client_asset_url, client_graph_state
+from app.utils.serialize import stringify_uuids
+
+
+@pytest.fixture
+def presigned(monkeypatch):
+    monkeypatch.setattr(settings, "ASSET_DELIVERY_MODE", "presigned")
+    monkeypatch.setattr(settings, "OBJECT_STORE_BACKEND", "minio")
+
+
+def _key() -> str:
+    return f"nodexr-assets/{uuid.uuid4()}.png"
+
+
+def test_stored_url_never_expires(presigned):
+    key = _key()
+    node = asset_node_item(uuid.uuid4(), f"minio:9000/{key}", uuid.uuid4())
+    assert "X-Amz-Signature" not in node["img_url"]
+    assert asset_key_from_url(node["img_url"]) == key
+
+
+def test_client_state_is_signed_copy(presigned):
+    node = asset_node_item(uuid.uuid4(), f"minio:9000/{_key()}", uuid.uuid4())
+    state = {"nodes": [node], "edges": []}
+    stored = node["img_url"]
+
+    client = client_graph_state(state)
+
+    assert "X-Amz-Signature=" in client["nodes"][0]["img_url"]
+    assert state["nodes"][0]["img_url"] == stored  # 캐시 / snapshot 쪽은 그대로
+
+
+def test_legacy_presigned_url_is_normalized_in_proxy_mode(presigned, monkeypatch):
+    key = _key()
+    signed = client_asset_url(build_asset_url(key))
+    monkeypatch.setattr(settings, "ASSET_DELIVERY_MODE", "proxy")
+
+    assert asset_key_from_url(signed) == key
+    assert client_asset_url(signed) == build_asset_url(key)
+
+
+def test_remote_frame_url_is_stored_unsigned(presigned):
+    key = _key()
+    node = asset_node_item(uuid.uuid4(), f"minio:9000/{key}", uuid.uuid4())
+    wire = stringify_uuids(client_graph_state({"nodes": [node]})["nodes"][0])
+    assert _parse_node(wire)["img_url"] == build_asset_url(key)
+
+
+def test_replay_skips_frames_older_than_max_age(monkeypatch):
+    buffer = ReplayBuffer(size=8, max_rooms=4, max_age_sec=60)
+    room_id = uuid.uuid4()
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now - 120)
+    buffer.append(room_id, 1, "old")
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+    buffer.append(room_id, 2, "new")
+
+    assert buffer.since(room_id, 1, 2) == ["new"]
+    assert buffer.since(room_id, 0, 2) is None  # 오래된 프레임이 필요하면 full state
@@ -0,0 +1,50 @@
+import json
+import uuid
+
+from app.core.broadcast_bus import PostgresBus
+from app.services.graph_builder import category_node_item
+from app.utils.serialize import dumps_json
+
+# Postgres NOTIFY payload 는 8000 bytes 미만이어야 함
+NOTIFY_LIMIT_BYTES = 8000
+
+
+def _msg() -> dict:
+    return {"c": "graph_event", "r": str(uuid.uuid4()), "o": uuid.uuid4().hex}
+
+
+def _frame(label: str) -> str:
+    node = category_node_item(uuid.uuid4(), label, 1)
+    return dumps_json({"type": "graph_delta", "version": 1, "delta": {"nodes": [node], "edges": []}})
+
+
+def test_long_korean_label_never_exceeds_notify_limit():
+    msg = _msg()
+    for length in range(1500, 3000, 50):
+        text = _frame("가" * length)
+        payload = PostgresBus._inline_payload(msg, text)
+        if payload is None:
+            continue
+        assert len(payload.encode("utf-8")) < NOTIFY_LIMIT_BYTES
+        assert json.loads(payload)["t"] == text
+
+
+def test_boundary_is_measured_on_final_payload():
+    msg = _msg()
+    # 본문이 한도에 딱 걸리는 가장 긴 라벨
+    length = 1
+    while len(_frame("한" * (length + 1)).encode("utf-8")) <= PostgresBus.MAX_INLINE_BYTES:
+        length += 1
+    text = _frame("한" * length)
+    # 본문만 보면 한도 안쪽이지만 따옴표 escape 까지 포함한 최종 payload 는 넘는다
+    assert len(text.encode("utf-8")) <= PostgresBus.MAX_INLINE_BYTES
+    assert len(json.dumps({**msg, "t": text}, ensure_ascii=False).encode("utf-8")) > PostgresBus.MAX_INLINE_BYTES
+    assert PostgresBus._inline_payload(msg, text) is None
+
+
+def test_short_korean_frame_stays_inline_unescaped():
+    msg = _msg()
+    text = _frame("짧은 라벨")
+    payload = PostgresBus._inline_payload(msg, text)
+    assert payload is not None
+    assert "짧은 라벨" in payload
@@ -0,0 +1,78 @@
+import asyncio
+import uuid
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from app.services import core_image_cache as core_image_cache_module
+from app.services.core_image_cache import CoreImageCache
+
+IMG_URL = "minio:9000/nodexr-assets/core.png"
+
+
+def _png() -> bytes:
+    buf = BytesIO()
+    Image.new("RGB", (4, 4), "red").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class _Store:
+    """get 마다 gate 가 열릴 때까지 대기, fail 이면 예외"""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = 0
+        self.gate = asyncio.Event()
+
+    async def get(self, object_key: str) -> bytes:
+        self.calls += 1
+        await self.gate.wait()
+        if self.fail:
+            raise ConnectionError("minio down")
+        return _png()
+
+
+@pytest.fixture
+def store(monkeypatch):
+    def install(fail: bool = False) -> _Store:
+        store = _Store(fail)
+        monkeypatch.setattr(core_image_cache_module, "object_store", store)
+        return store
+    return install
+
+
+def test_cancelled_loader_does_not_leave_waiters_empty(store):
+    async def main():
+        minio = store()
+        cache, room_id, asset_id = CoreImageCache(max_rooms=4), uuid.uuid4(), uuid.uuid4()
+        loader = asyncio.create_task(cache.get(room_id, asset_id, IMG_URL))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get(room_id, asset_id, IMG_URL))
+        await asyncio.sleep(0)
+
+        loader.cancel()  # 적재하던 파이프라인이 취소됨
+        await asyncio.sleep(0)
+        minio.gate.set()
+        entry = await waiter
+        return minio, loader, entry, asset_id
+
+    minio, loader, entry, asset_id = asyncio.run(main())
+    assert loader.cancelled()
+    assert entry.asset_id == asset_id and entry.mime_type == "image/png"
+    assert minio.calls == 2  # 기다리던 쪽이 다시 적재
+
+
+def test_load_failure_reaches_every_waiter(store):
+    async def main():
+        minio = store(fail=True)
+        cache, room_id, asset_id = CoreImageCache(max_rooms=4), uuid.uuid4(), uuid.uuid4()
+        tasks = [asyncio.create_task(cache.get(room_id, asset_id, IMG_URL)) for _ in range(3)]
+        await asyncio.sleep(0)
+        minio.gate.set()
+        return minio, cache, await asyncio.gather(*tasks, return_exceptions=True)
+
+    minio, cache, results = asyncio.run(main())
+    assert minio.calls == 1  # single-flight
+    assert all(isinstance(r, ConnectionError) for r in results)
+    assert cache.stats()["load_errors"] == 1
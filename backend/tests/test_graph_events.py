@@ -0,0 +1,61 @@
+import uuid
+
+import pytest
+
+from app.core.ws_manager import graph_ws_manager
+from app.db.models.room import Room
+from app.services.graph_builder import category_node_item
+from app.services.graph_cache import RoomGraph, graph_cache
+from app.services.graph_events import graph_event_publisher
+from app.services.graph_snapshots import write_snapshot
+from app.utils.serialize import dumps_json
+
+
+@pytest.fixture
+def room(db):
+    room = Room(room_topic="topic", password="pw")
+    db.add(room)
+    db.commit()
+    return room
+
+
+def test_version_survives_restart(db, room):
+    # version 1 에서 snapshot, 2~3 은 snapshot 없이 delta 만 나간 상태
+    graph = RoomGraph(room.room_id)
+    for i in range(3):
+        version = graph_event_publisher.next_version(db, room.room_id)
+        graph.apply([category_node_item(uuid.uuid4(), f"k{version}", version)])
+        if i == 0:
+            write_snapshot(db, graph, version)
+        db.commit()
+
+    # 재시작 직후: 캐시도 이 worker 의 version 도 비어 있음
+    graph_cache.invalidate(room.room_id)
+    graph_event_publisher._versions.pop(room.room_id, None)
+
+    state = graph_event_publisher.full_state_event(db, room.room_id)
+    assert state["version"] == 3
+    assert graph_event_publisher.current_version(room.room_id) == 3
+    # 이미 클라이언트에 나간 2, 3 을 다시 발급하지 않음
+    assert graph_event_publisher.next_version(db, room.room_id) == 4
+    # 재시작 전 프레임은 버퍼에 없으므로 replay 대신 full state
+    assert graph_event_publisher.replay_frames(room.room_id, 1) is None
+
+
+def test_rolled_back_version_is_not_issued(db, room):
+    assert graph_event_publisher.next_version(db, room.room_id) == 1
+    db.rollback()
+    assert graph_event_publisher.next_version(db, room.room_id) == 1
+
+
+def test_remote_delta_uses_bus_version(db, room):
+    graph = graph_cache.get(db, room.room_id)
+    node = category_node_item(uuid.uuid4(), "원격", 1)
+    text = dumps_json({"event": "GRAPH_DELTA", "version": 7, "delta": {"nodes": [node], "edges": []}})
+
+    graph_ws_manager.deliver(room.room_id, text, local=False, version=7)
+    graph_ws_manager.deliver(room.room_id, dumps_json({"event": "NODE_IMAGE_UPDATE"}), local=False)
+
+    assert graph_event_publisher.current_version(room.room_id) == 7
+    assert graph_event_publisher.replay_frames(room.room_id, 6) == [text]
+    assert graph.nodes[node["node_id"]]["label"] == "원격"
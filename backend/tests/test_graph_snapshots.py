@@ -0,0 +1,166 @@
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.db.compact_snapshots import compact_room
+from app.db.models.graph_snapshot import GraphSnapshot
+from app.db.models.room import Room
+from app.services.graph_builder import asset_node_item, category_node_item, edge_item
+from app.services.graph_cache import RoomGraph
+from app.services.graph_snapshots import apply_diff, diff_graph, load_snapshot_state, write_snapshot
+from app.utils.serialize import stringify_uuids
+
+
+def _category(label: str, order: int) -> dict:
+    return category_node_item(uuid.uuid4(), label, order)
+
+
+def _state(graph: RoomGraph) -> dict:
+    state = stringify_uuids(graph.to_state())
+    return {"nodes": state["nodes"], "edges": state["edges"]}
+
+
+def _restored(db, snapshot_id) -> dict:
+    state = load_snapshot_state(db, snapshot_id)
+    return {"nodes": state["nodes"], "edges": state["edges"]}
+
+
+@pytest.fixture
+def room(db):
+    room = Room(room_topic="topic", password="pw")
+    db.add(room)
+    db.commit()
+    return room
+
+
+def test_diff_then_apply_reproduces_target():
+    a, b, c = _category("a", 0), _category("b", 1), _category("c", 2)
+    ab = edge_item(uuid.uuid4(), a["node_id"], b["node_id"])
+    prev_nodes = {a["node_id"]: a, b["node_id"]: b}
+    prev_edges = {ab["edge_id"]: ab}
+
+    renamed_a = {**a, "label": "a2"}
+    nodes = {a["node_id"]: renamed_a, c["node_id"]: c}
+    edges = {}
+
+    diff = diff_graph(prev_nodes, prev_edges, nodes, edges)
+    assert diff["nodes"] == [renamed_a, c]
+    assert diff["removed_node_ids"] == [b["node_id"]]
+    assert diff["removed_edge_ids"] == [ab["edge_id"]]
+
+    restored_nodes, restored_edges = dict(prev_nodes), dict(prev_edges)
+    apply_diff(restored_nodes, restored_edges, diff)
+    assert restored_nodes == nodes
+    assert restored_edges == edges
+
+
+def test_unchanged_graph_has_empty_diff():
+    a = _category("a", 0)
+    nodes = {a["node_id"]: a}
+    assert diff_graph(nodes, {}, dict(nodes), {}) == {
+        "nodes": [], "edges": [], "removed_node_ids": [], "removed_edge_ids": [],
+    }
+
+
+def test_delta_chain_reconstructs_every_version(db, room):
+    graph = RoomGraph(room.room_id)
+    root = _category("root", 1)
+    graph.apply([root])
+
+    expected = {}
+    for version in range(1, 6):
+        asset = asset_node_item(uuid.uuid4(), f"minio:9000/nodexr-assets/{uuid.uuid4()}.png", root["node_id"])
+        graph.apply([asset], [edge_item(uuid.uuid4(), root["node_id"], asset["node_id"])])
+        snap = write_snapshot(db, graph, version)
+        db.commit()
+        expected[snap.graph_snapshot_id] = (snap.kind, _state(graph))
+
+    kinds = [kind for kind, _ in expected.values()]
+    assert kinds == ["KEYFRAME"] + ["DELTA"] * 4
+    for snapshot_id, (_, state) in expected.items():
+        assert _restored(db, snapshot_id) == state
+
+
+def test_keyframe_after_interval(db, room, monkeypatch):
+    monkeypatch.setattr(settings, "GRAPH_SNAPSHOT_KEYFRAME_INTERVAL", 2)
+    graph = RoomGraph(room.room_id)
+    kinds = []
+    for version in range(1, 6):
+        graph.apply([_category(f"k{version}", version)])
+        kinds.append(write_snapshot(db, graph, version).kind)
+        db.commit()
+    assert kinds == ["KEYFRAME", "DELTA", "KEYFRAME", "DELTA", "KEYFRAME"]
+
+
+def test_keyframe_when_another_worker_wrote_latest(db, room):
+    mine, other = RoomGraph(room.room_id), RoomGraph(room.room_id)
+    node = _category("root", 1)
+    mine.apply([node])
+    other.apply([node])
+
+    write_snapshot(db, mine, 1)
+    write_snapshot(db, other, 2)  # 다른 worker 의 캐시 (이 프로세스의 last_snapshot 은 모름)
+    db.commit()
+
+    mine.apply([_category("next", 2)])
+    snap = write_snapshot(db, mine, 3)
+    db.commit()
+    assert snap.kind == "KEYFRAME"
+    assert _restored(db, snap.graph_snapshot_id) == _state(mine)
+
+
+def test_legacy_null_version_row_does_not_break_delta_chain(db, room):
+    graph = RoomGraph(room.room_id)
+    graph.apply([_category("root", 1)])
+    write_snapshot(db, graph, 1)
+    # compact 전의 legacy row: version 이 NULL (Postgres 는 DESC 정렬에서 맨 앞)
+    db.add(GraphSnapshot(room_id=room.room_id, graph_state=stringify_uuids(graph.to_state())))
+    db.commit()
+
+    graph.apply([_category("next", 2)])
+    snap = write_snapshot(db, graph, 2)
+    db.commit()
+    assert snap.kind == "DELTA"
+    assert _restored(db, snap.graph_snapshot_id) == _state(graph)
+
+
+def test_missing_keyframe_is_broken_chain(db, room):
+    delta = GraphSnapshot(
+        room_id=room.room_id,
+        kind="DELTA",
+        version=2,
+        keyframe_snapshot_id=uuid.uuid4(),
+        graph_state={"graph_snapshot_id": None, "base_snapshot_id": str(uuid.uuid4()), "nodes": [], "edges": []},
+    )
+    db.add(delta)
+    db.commit()
+
+    with pytest.raises(ValueError, match="broken snapshot chain"):
+        load_snapshot_state(db, delta.graph_snapshot_id)
+
+
+def test_compact_room_is_idempotent(db, room):
+    # 변환 전 형태: 모든 row 가 full state, version 없음
+    graph = RoomGraph(room.room_id)
+    originals = []
+    for i in range(6):
+        graph.apply([_category(f"k{i}", i)])
+        snapshot_id = uuid.uuid4()
+        db.add(GraphSnapshot(
+            graph_snapshot_id=snapshot_id,
+            room_id=room.room_id,
+            graph_state=stringify_uuids(graph.to_state(snapshot_id)),
+        ))
+        db.commit()
+        originals.append((snapshot_id, _state(graph)))
+
+    compact_room(db, room.room_id, keyframe_interval=3)
+    first = {row.graph_snapshot_id: (row.kind, row.version, row.graph_state) for row in db.query(GraphSnapshot)}
+    compact_room(db, room.room_id, keyframe_interval=3)
+    second = {row.graph_snapshot_id: (row.kind, row.version, row.graph_state) for row in db.query(GraphSnapshot)}
+
+    assert first == second
+    assert sorted(kind for kind, _, _ in first.values()) == ["DELTA"] * 4 + ["KEYFRAME"] * 2
+    for snapshot_id, state in originals:
+        assert _restored(db, snapshot_id) == state
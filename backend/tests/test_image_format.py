@@ -0,0 +1,68 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from app.utils.image_format import probe_image, sniff_image_format, transcode_image
+
+
+def _encode(image: Image.Image, fmt: str, **options) -> bytes:
+    buf = BytesIO()
+    image.save(buf, format=fmt, **options)
+    return buf.getvalue()
+
+
+def _gradient(mode: str = "RGB", size=(64, 48)) -> Image.Image:
+    image = Image.new(mode, size)
+    image.putdata([(x * 4, y * 5, 128, 200)[:len(mode)] for y in range(size[1]) for x in range(size[0])])
+    return image
+
+
+def test_probe_reads_png_header_only():
+    data = _encode(_gradient(), "PNG")
+    idat = data.index(b"IDAT")
+    header = data[:idat + 16]  # IDAT 앞부분에서 잘림 → 디코딩하면 실패하는 bytes
+    with pytest.raises(OSError):
+        Image.open(BytesIO(header)).load()
+
+    info = probe_image(header)
+    assert (info.mime_type, info.ext, info.width, info.height) == ("image/png", "png", 64, 48)
+
+
+def test_probe_reads_jpeg_header_only():
+    data = _encode(_gradient(), "JPEG", quality=90)
+    sos = data.index(b"\xff\xda")
+    header = data[:sos + 16]  # 스캔 데이터 시작 직후에서 잘림
+    with pytest.raises(OSError):
+        Image.open(BytesIO(header)).load()
+
+    info = probe_image(header)
+    assert (info.mime_type, info.ext, info.width, info.height) == ("image/jpeg", "jpg", 64, 48)
+
+
+@pytest.mark.parametrize("data", [b"", b"not an image", b"\x89PNG\r\n\x1a\n"])
+def test_probe_rejects_non_images(data):
+    with pytest.raises(ValueError):
+        probe_image(data)
+
+
+def test_transcode_png_round_trip_is_lossless():
+    source = _gradient()
+    data, info = transcode_image(_encode(source, "JPEG"), "png", quality=90)
+    decoded = Image.open(BytesIO(data))
+
+    again, _ = transcode_image(data, "png", quality=90)
+    assert (info.mime_type, info.ext, info.width, info.height) == ("image/png", "png", 64, 48)
+    assert sniff_image_format(data) == ("image/png", "png")
+    assert list(Image.open(BytesIO(again)).getdata()) == list(decoded.getdata())
+
+
+def test_transcode_rgba_png_to_jpeg():
+    data, info = transcode_image(_encode(_gradient("RGBA"), "PNG"), "jpeg", quality=85)
+
+    assert probe_image(data) == info
+    assert (info.mime_type, info.width, info.height) == ("image/jpeg", 64, 48)
+    with Image.open(BytesIO(data)) as image:
+        assert image.mode == "RGB"  # JPEG 는 alpha 없음
+        r, g, b = image.getpixel((10, 10))
+        assert abs(r - 40) < 12 and abs(g - 50) < 12 and abs(b - 128) < 12
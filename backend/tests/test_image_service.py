@@ -0,0 +1,115 @@
+import asyncio
+import pathlib
+import re
+from types import SimpleNamespace
+
+from app.services.image_service import ImageService
+
+
+class _FakeGemini:
+    """client.aio.models.generate_content 흉내: 호출 순서대로 gate 가 열리면 응답 (gate 없으면 latency 만큼)"""
+
+    def __init__(self, gates=None, latency: float = 0.0):
+        self.gates = gates
+        self.latency = latency
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.cancelled = 0
+        fake = self
+
+        class _AsyncModels:
+            async def generate_content(self, model, contents, config=None):
+                idx = fake.calls
+                fake.calls += 1
+                fake.in_flight += 1
+                fake.max_in_flight = max(fake.max_in_flight, fake.in_flight)
+                try:
+                    if fake.gates is not None:
+                        await fake.gates[idx].wait()
+                    else:
+                        await asyncio.sleep(fake.latency)
+                except asyncio.CancelledError:
+                    fake.cancelled += 1
+                    raise
+                finally:
+                    fake.in_flight -= 1
+                part = SimpleNamespace(inline_data=SimpleNamespace(data=f"img{idx}".encode()))
+                return SimpleNamespace(candidates=[SimpleNamespace(content=SimpleNamespace(parts=[part]))])
+
+        self.aio = SimpleNamespace(models=_AsyncModels())
+
+
+def _service(client: _FakeGemini, max_concurrency: int = 8) -> ImageService:
+    service = ImageService(client=client, max_concurrency=max_concurrency, timeout=5)
+
+    async def store(data, idx=0, timer=None):
+        # 업로드 경로는 test_image_upload 에서, 여기서는 생성 순서만
+        return data.decode()
+
+    service._store_image = store
+    return service
+
+
+def test_first_finished_image_is_yielded_before_slowest():
+    async def main():
+        gates = [asyncio.Event() for _ in range(3)]
+        client = _FakeGemini(gates)
+        keys = _service(client).iter_images("p", n=3)
+
+        gates[1].set()
+        first = await keys.__anext__()
+        still_running = client.in_flight  # #0, #2 는 아직 생성 중
+
+        gates[2].set()
+        second = await keys.__anext__()
+        gates[0].set()
+        rest = [key async for key in keys]
+        return first, still_running, second, rest
+
+    first, still_running, second, rest = asyncio.run(main())
+    assert first == "img1"
+    assert still_running == 2
+    assert [second, *rest] == ["img2", "img0"]
+
+
+def test_concurrency_is_capped_by_semaphore():
+    async def main():
+        client = _FakeGemini(latency=0.01)
+        keys = [key async for key in _service(client, max_concurrency=2).iter_images("p", n=5)]
+        return client, keys
+
+    client, keys = asyncio.run(main())
+    assert sorted(keys) == [f"img{i}" for i in range(5)]
+    assert client.max_in_flight == 2
+
+
+def test_closing_iterator_cancels_remaining_requests():
+    async def main():
+        gates = [asyncio.Event() for _ in range(3)]
+        client = _FakeGemini(gates)
+        keys = _service(client).iter_images("p", n=3)
+        gates[0].set()
+        first = await keys.__anext__()
+        await keys.aclose()  # 파이프라인이 중간에 멈춤
+        return first, client
+
+    first, client = asyncio.run(main())
+    assert first == "img0"
+    assert (client.cancelled, client.in_flight) == (2, 0)
+
+
+def test_removed_batch_apis_have_no_callers():
+    # 전체 대기(gather) 방식 API 는 iter_images / iter_category_images 로 대체됨
+    removed = ("generate_images", "generate_category_images", "_save_asset_to_db")
+    assert not [name for name in removed if hasattr(ImageService, name)]
+
+    app_dir = pathlib.Path(__file__).resolve().parent.parent / "app"
+    pattern = re.compile(r"\.(%s)\(" % "|".join(removed))
+    callers = [
+        f"{path.relative_to(app_dir)}:{line}"
+        for path in app_dir.rglob("*.py")
+        for line, text in enumerate(path.read_text(encoding="utf-8").splitlines(), 1)
+        if pattern.search(text)
+    ]
+    assert callers == []
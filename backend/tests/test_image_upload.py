@@ -0,0 +1,97 @@
+import asyncio
+import os
+import uuid
+
+import pytest
+
+from app.services import image_upload
+from app.services.image_upload import ImageUploadPool
+
+DATA = b"\x89PNG fake image bytes"
+
+
+class _FlakyStore:
+    def __init__(self, fail: bool = True, delay: float = 0.0):
+        self.fail = fail
+        self.delay = delay
+        self.objects = {}
+
+    async def put(self, object_key: str, data: bytes, content_type: str) -> str:
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("minio down")
+        self.objects[object_key] = data
+        return '"etag"'
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = _FlakyStore()
+    monkeypatch.setattr(image_upload, "object_store", store)
+    return store
+
+
+def _pool(spool_dir) -> ImageUploadPool:
+    return ImageUploadPool(workers=2, max_queue=8, retries=1, retry_backoff_sec=0, spool_dir=str(spool_dir), spool_retry_sec=0.01)
+
+
+def _key() -> str:
+    return f"nodexr-assets/{uuid.uuid4()}.png"
+
+
+def test_failed_early_release_upload_is_spooled_then_reuploaded(store, tmp_path):
+    async def main():
+        pool, key = _pool(tmp_path), _key()
+        done = await pool.submit(key, DATA, "image/png", spool_on_failure=True)
+        await asyncio.wait({done})
+        assert isinstance(done.exception(), ConnectionError)
+
+        # 업로드 전까지는 spool 파일로 응답 가능
+        path = pool.spooled_path(key)
+        assert path is not None
+        with open(path, "rb") as f:
+            assert f.read() == DATA
+
+        store.fail = False
+        for _ in range(100):
+            if pool.spooled_path(key) is None:
+                break
+            await asyncio.sleep(0.01)
+        await pool.drain(timeout=1)
+        return pool, key
+
+    pool, key = asyncio.run(main())
+    assert store.objects[key] == DATA
+    assert os.listdir(tmp_path) == []
+    stats = pool.stats()
+    assert (stats["spooled"], stats["recovered"]) == (1, 1)
+
+
+def test_failure_without_spool_flag_is_dropped(store, tmp_path):
+    async def main():
+        pool = _pool(tmp_path)
+        done = await pool.submit(_key(), DATA, "image/png")
+        await asyncio.wait({done})
+        await pool.drain(timeout=1)
+        return pool
+
+    pool = asyncio.run(main())
+    assert os.listdir(tmp_path) == []
+    assert pool.stats()["spooled"] == 0
+
+
+def test_uploads_abandoned_by_drain_are_spooled(store, tmp_path):
+    store.fail, store.delay = False, 10
+
+    async def main():
+        pool = _pool(tmp_path)
+        keys = [_key() for _ in range(3)]  # worker 2 개 → 2 개는 업로드 중, 1 개는 대기열
+        for key in keys:
+            await pool.submit(key, DATA, "image/png", spool_on_failure=True)
+        await asyncio.sleep(0)
+        await pool.drain(timeout=0.05)
+        return pool, keys
+
+    pool, keys = asyncio.run(main())
+    assert all(pool.spooled_path(key) for key in keys)
+    assert pool.stats()["spooled"] == 3
@@ -0,0 +1,60 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.db.models.pipeline_job import PipelineJob
+from app.db.models.room import Room
+from app.services import job_queue
+
+
+@pytest.fixture
+def room(db):
+    room = Room(room_topic="topic", password="pw")
+    db.add(room)
+    db.commit()
+    return room
+
+
+def _running(db, room, heartbeat_ago: float, attempts: int = 1, committed=None) -> PipelineJob:
+    # SQLite 의 localtimestamp 기준 (recover_stale_jobs 와 같은 시계)
+    now = datetime.now()
+    job = PipelineJob(
+        room_id=room.room_id, phase="CATEGORY_DISCUSS", text="t", status="RUNNING", attempts=attempts,
+        started_at=now - timedelta(hours=1), heartbeat_at=now - timedelta(seconds=heartbeat_ago),
+        committed_phases=committed,
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+
+def test_recover_only_expired_leases(db, room, monkeypatch):
+    monkeypatch.setattr(settings, "PIPELINE_JOB_LEASE_SEC", 60)
+    monkeypatch.setattr(settings, "PIPELINE_MAX_ATTEMPTS", 2)
+    alive = _running(db, room, heartbeat_ago=5)          # 오래 걸리지만 heartbeat 중
+    lost = _running(db, room, heartbeat_ago=600)
+    exhausted = _running(db, room, heartbeat_ago=600, attempts=2)
+    committed = _running(db, room, heartbeat_ago=600, committed=["db_keyword"])
+
+    assert job_queue.recover_stale_jobs() == 3
+    db.expire_all()
+
+    assert db.get(PipelineJob, alive.job_id).status == "RUNNING"
+    assert db.get(PipelineJob, lost.job_id).status == "PENDING"
+    assert db.get(PipelineJob, exhausted.job_id).status == "FAILED"
+    failed = db.get(PipelineJob, committed.job_id)
+    assert failed.status == "FAILED"  # 다시 실행하면 노드 / 엣지가 중복되므로 재시도하지 않음
+    assert failed.error.endswith("after commit")
+    assert failed.finished_at is not None
+
+
+def test_heartbeat_extends_lease(db, room, monkeypatch):
+    monkeypatch.setattr(settings, "PIPELINE_JOB_LEASE_SEC", 60)
+    job = _running(db, room, heartbeat_ago=600)
+
+    job_queue.heartbeat([job.job_id])
+
+    assert job_queue.recover_stale_jobs() == 0
+    db.expire_all()
+    assert db.get(PipelineJob, job.job_id).status == "RUNNING"
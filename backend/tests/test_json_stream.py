@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from app.utils.json_stream import JsonFieldStream
+
+DOC = {
+    "keyword": "따뜻한 \"조명\"\\n",
+    "count": -12.5e1,
+    "flags": [True, False, None, {"nested": "}]"}],
+    "meta": {"a": [1, {"b": "{"}], "c": ""},
+    "last": None,
+}
+
+
+def _fields(chunks):
+    parser = JsonFieldStream()
+    out = []
+    for chunk in chunks:
+        out.extend(parser.feed(chunk))
+    return parser, out
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_fields_match_json_loads_for_any_chunking(size):
+    text = "```json\n" + json.dumps(DOC, ensure_ascii=False, indent=2) + "\n```"
+    parser, out = _fields(text[i:i + size] for i in range(0, len(text), size))
+
+    assert out == list(DOC.items())
+    assert parser.done
+
+
+def test_field_is_emitted_as_soon_as_it_is_complete():
+    parser = JsonFieldStream()
+    assert parser.feed('{"keyword": "lam') == []
+    assert parser.feed('p", "image_pro') == [("keyword", "lamp")]
+    assert parser.feed('mpt": "a lamp"') == [("image_prompt", "a lamp")]
+    assert not parser.done
+    assert parser.feed("}") == []
+    assert parser.done
+
+
+def test_scalar_needs_delimiter():
+    parser = JsonFieldStream()
+    assert parser.feed('{"n": 12') == []
+    assert parser.feed("3") == []
+    assert parser.feed("}") == [("n", 123)]
+
+
+def test_text_after_object_is_ignored():
+    parser, out = _fields(['{"a": 1}', ' {"b": 2}'])
+    assert out == [("a", 1)]
@@ -0,0 +1,69 @@
+import asyncio
+
+from app.utils.keyed_lock import KeyedLock
+
+
+async def _worker(lock: KeyedLock, key, name: str, log: list, delay: float = 0.01):
+    async with lock.hold(key):
+        log.append(("start", name))
+        await asyncio.sleep(delay)
+        log.append(("end", name))
+
+
+def test_same_key_runs_one_at_a_time_in_arrival_order():
+    async def main():
+        lock, log = KeyedLock(), []
+        tasks = [asyncio.create_task(_worker(lock, "room", f"j{i}", log)) for i in range(4)]
+        await asyncio.sleep(0)
+        assert lock.stats() == {"keys": 1, "waiting": 3}
+        await asyncio.gather(*tasks)
+        return lock, log
+
+    lock, log = asyncio.run(main())
+    assert log == [(edge, f"j{i}") for i in range(4) for edge in ("start", "end")]
+    # 보유 / 대기자가 없으면 lock 도 제거
+    assert lock.stats() == {"keys": 0, "waiting": 0}
+
+
+def test_different_keys_run_in_parallel():
+    async def main():
+        lock, log = KeyedLock(), []
+        await asyncio.gather(_worker(lock, "a", "a", log), _worker(lock, "b", "b", log))
+        return log
+
+    log = asyncio.run(main())
+    assert [edge for edge, _ in log] == ["start", "start", "end", "end"]
+
+
+def test_lock_released_when_holder_fails():
+    async def main():
+        lock = KeyedLock()
+
+        async def boom():
+            async with lock.hold("room"):
+                raise RuntimeError("fail")
+
+        results = await asyncio.gather(boom(), _worker(lock, "room", "next", []), return_exceptions=True)
+        return lock, results
+
+    lock, results = asyncio.run(main())
+    assert isinstance(results[0], RuntimeError)
+    assert results[1] is None
+    assert lock.stats() == {"keys": 0, "waiting": 0}
+
+
+def test_cancelled_waiter_is_not_counted():
+    async def main():
+        lock = KeyedLock()
+        holder = asyncio.create_task(_worker(lock, "room", "holder", [], delay=0.05))
+        waiter = asyncio.create_task(_worker(lock, "room", "waiter", []))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        during = lock.stats()
+        await holder
+        return during, lock.stats()
+
+    during, after = asyncio.run(main())
+    assert during == {"keys": 1, "waiting": 0}
+    assert after == {"keys": 0, "waiting": 0}
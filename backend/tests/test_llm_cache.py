@@ -0,0 +1,85 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.db.models.llm_cache import LLMCacheEntry
+from app.services.llm_cache import LLMCache
+
+TEMPLATE = "keyword for {utterance}"
+
+
+def _key(*inputs: str, template: str = TEMPLATE, model: str = "gpt-4o-mini") -> str:
+    return LLMCache.make_key("category_discuss", template, model, 0.7, *inputs)
+
+
+def test_key_is_stable_across_whitespace_width_and_case():
+    assert _key("재질", "Wooden  lamp\n") == _key("재질", " wooden lamp")
+    assert _key("ＡＢＣ") == _key("abc")  # NFKC
+
+
+def test_key_changes_with_template_model_or_input():
+    base = _key("재질", "wooden lamp")
+    assert _key("재질", "wooden lamp", template=TEMPLATE + "!") != base
+    assert _key("재질", "wooden lamp", model="gpt-4o") != base
+    assert _key("재질", "metal lamp") != base
+    assert _key("재질 wooden", "lamp") != base  # 입력 경계도 key 에 포함
+
+
+def test_memory_lru_hit_and_eviction():
+    cache = LLMCache(max_entries=2, ttl_sec=60, backend="memory")
+
+    async def main():
+        await cache.set("a", "k", "m", {"keyword": "a"})
+        await cache.set("b", "k", "m", {"keyword": "b"})
+        hit = await cache.get("a")      # a 가 최근 사용 → 다음 set 에서 b 가 밀려남
+        await cache.set("c", "k", "m", {"keyword": "c"})
+        return hit, await cache.get("a"), await cache.get("b")
+
+    hit, again, evicted = asyncio.run(main())
+    assert hit == again == {"keyword": "a"}
+    assert evicted is None
+    stats = cache.stats()
+    assert (stats["hits_memory"], stats["misses"], stats["evictions"]) == (2, 1, 1)
+
+
+def test_expired_memory_entry_is_a_miss():
+    cache = LLMCache(max_entries=2, ttl_sec=-1, backend="memory")
+
+    async def main():
+        await cache.set("a", "k", "m", {"keyword": "a"})
+        return await cache.get("a")
+
+    assert asyncio.run(main()) is None
+
+
+def test_postgres_tier_hit_is_promoted_to_memory(db):
+    key = _key("재질", "wooden lamp")
+    db.add(LLMCacheEntry(
+        cache_key=key, kind="category_discuss", model="gpt-4o-mini",
+        response={"keyword": "나무"}, expires_at=datetime.now() + timedelta(minutes=5),
+    ))
+    db.commit()
+    cache = LLMCache(max_entries=8, ttl_sec=60, backend="postgres")
+
+    async def main():
+        first = await cache.get(key)
+        db.query(LLMCacheEntry).delete()  # 두 번째는 DB 없이 memory 에서
+        db.commit()
+        return first, await cache.get(key)
+
+    first, second = asyncio.run(main())
+    assert first == second == {"keyword": "나무"}
+    stats = cache.stats()
+    assert (stats["hits_db"], stats["hits_memory"], stats["misses"]) == (1, 1, 0)
+
+
+def test_expired_postgres_row_is_a_miss(db):
+    key = _key("재질", "wooden lamp")
+    db.add(LLMCacheEntry(
+        cache_key=key, kind="category_discuss", model="gpt-4o-mini",
+        response={"keyword": "나무"}, expires_at=datetime.now() - timedelta(seconds=1),
+    ))
+    db.commit()
+    cache = LLMCache(max_entries=8, ttl_sec=60, backend="postgres")
+
+    assert asyncio.run(cache.get(key)) is None
+    assert cache.stats()["misses"] == 1
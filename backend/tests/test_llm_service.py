@@ -0,0 +1,87 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+from app.core.config import settings
+from app.services.llm_service import LLMService
+
+
+class _FakeCompletions:
+    """처음 fail_times 번은 fail 예외, 그 뒤로는 응답"""
+
+    def __init__(self, fail_times: int, fail: Exception):
+        self.fail_times = fail_times
+        self.fail = fail
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        if len(self.calls) <= self.fail_times:
+            raise self.fail
+        return "response"
+
+
+def _connection_error() -> openai.APIConnectionError:
+    return openai.APIConnectionError(request=httpx.Request("POST", "https://api.openai.com/v1/chat/completions"))
+
+
+def _service(completions: _FakeCompletions) -> LLMService:
+    return LLMService(client=SimpleNamespace(chat=SimpleNamespace(completions=completions)))
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 2)
+    monkeypatch.setattr(settings, "LLM_RETRY_BASE_SEC", 0.001)
+    monkeypatch.setattr(settings, "LLM_RETRY_MAX_SEC", 0.001)
+
+
+def _create(service: LLMService, deadline_sec: float = 5):
+    return asyncio.run(service._create(time.monotonic() + deadline_sec, messages=[]))
+
+
+def test_retryable_error_is_retried_until_success():
+    completions = _FakeCompletions(fail_times=2, fail=_connection_error())
+    assert _create(_service(completions)) == "response"
+    assert len(completions.calls) == 3
+
+
+def test_retries_stop_at_limit():
+    completions = _FakeCompletions(fail_times=10, fail=_connection_error())
+    with pytest.raises(openai.APIConnectionError):
+        _create(_service(completions))
+    assert len(completions.calls) == 1 + settings.LLM_MAX_RETRIES
+
+
+def test_non_retryable_error_is_not_retried():
+    completions = _FakeCompletions(fail_times=10, fail=ValueError("bad request"))
+    with pytest.raises(ValueError):
+        _create(_service(completions))
+    assert len(completions.calls) == 1
+
+
+def test_request_timeout_is_bounded_by_deadline():
+    completions = _FakeCompletions(fail_times=0, fail=_connection_error())
+    _create(_service(completions), deadline_sec=2)
+    assert completions.calls[0]["timeout"] <= 2
+
+
+def test_deadline_aborts_before_request():
+    completions = _FakeCompletions(fail_times=0, fail=_connection_error())
+    with pytest.raises(TimeoutError):
+        _create(_service(completions), deadline_sec=0)
+    assert completions.calls == []
+
+
+def test_backoff_past_deadline_aborts_retry(monkeypatch):
+    monkeypatch.setattr(LLMService, "_backoff", staticmethod(lambda attempt, error: 60))
+    completions = _FakeCompletions(fail_times=10, fail=_connection_error())
+    t0 = time.monotonic()
+    with pytest.raises(openai.APIConnectionError):
+        _create(_service(completions), deadline_sec=1)
+    assert len(completions.calls) == 1  # 60초 기다렸다가 재시도하지 않고 바로 실패
+    assert time.monotonic() - t0 < 1
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.db.models.room import Room
+from app.schemas.utterance import PhaseType
+from app.services import phase_pipeline
+from app.services.graph_cache import graph_cache
+from app.services.graph_events import graph_event_publisher
+from app.services.llm_service import LLMFields
+
+
+class _FakeLLM:
+    def basic_discuss_fields(self, room_topic, text):
+        async def source():
+            yield "root_label", "lamp"
+            yield "categories", ["material"]
+            yield "sketch_prompt", "a lamp"
+        return LLMFields(source(), ("root_label", "categories", "sketch_prompt"))
+
+
+class _NoImages:
+    def iter_images(self, prompt, n, timer=None):
+        async def keys():
+            return
+            yield  # async generator
+        return keys()
+
+
+@pytest.fixture
+def room(db):
+    room = Room(room_topic="topic", password="pw")
+    db.add(room)
+    db.commit()
+    return room
+
+
+@pytest.fixture
+def published(monkeypatch):
+    sent = []
+
+    async def publish_delta(room_id, cause, version, nodes=(), edges=(), **kwargs):
+        sent.append((cause, version, list(nodes)))
+        return version
+
+    monkeypatch.setattr(phase_pipeline, "llm_service", _FakeLLM())
+    monkeypatch.setattr(phase_pipeline, "image_service", _NoImages())
+    monkeypatch.setattr(graph_event_publisher, "publish_delta", publish_delta)
+    return sent
+
+
+def _wrap_root_keyword(monkeypatch, room_id, seen: list, fail: bool):
+    original = phase_pipeline._insert_root_keyword
+
+    def insert(db, *args):
+        rows = original(db, *args)
+        # 커밋 전: 캐시에는 아직 없어야 함
+        seen.append(rows.node_id in graph_cache.peek(room_id).nodes)
+        if fail:
+            db.add(Room(room_topic=None, password="pw"))  # 커밋 시 NOT NULL 위반
+        return rows
+
+    monkeypatch.setattr(phase_pipeline, "_insert_root_keyword", insert)
+
+
+def test_cache_and_delta_follow_commit(db, room, published, monkeypatch):
+    graph = graph_cache.get(db, room.room_id)
+    seen = []
+    _wrap_root_keyword(monkeypatch, room.room_id, seen, fail=False)
+
+    asyncio.run(phase_pipeline.run_phase_pipeline(room.room_id, PhaseType.BASIC_DISCUSS, "hello"))
+
+    assert seen == [False]
+    cause, version, nodes = published[0]
+    assert (cause, version) == ("NODE_KEYWORD_UPDATE", 1)
+    assert nodes[0]["node_id"] in graph.nodes
+
+
+def test_failed_commit_leaves_cache_and_clients_untouched(db, room, published, monkeypatch):
+    graph_cache.get(db, room.room_id)
+    seen = []
+    _wrap_root_keyword(monkeypatch, room.room_id, seen, fail=True)
+
+    with pytest.raises(IntegrityError):
+        asyncio.run(phase_pipeline.run_phase_pipeline(room.room_id, PhaseType.BASIC_DISCUSS, "hello"))
+
+    assert seen == [False]
+    assert published == []
+    graph = graph_cache.peek(room.room_id)
+    assert graph is None or not graph.nodes
+    db.expire_all()
+    assert db.get(Room, room.room_id).graph_version == 0
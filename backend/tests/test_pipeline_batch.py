@@ -0,0 +1,132 @@
+import asyncio
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.services import job_queue, pipeline_worker
+from app.services.job_queue import ClaimedJob
+from app.services.pipeline_worker import PipelineWorkerPool
+from app.utils.timing import StageTimer
+
+ROOM_A, ROOM_B = uuid.uuid4(), uuid.uuid4()
+
+
+def _job(room_id, text: str, phase: str = "CATEGORY_DISCUSS", waited_sec: float = 0.0) -> ClaimedJob:
+    now = datetime.now()
+    created = now - timedelta(seconds=waited_sec)
+    return ClaimedJob(uuid.uuid4(), room_id, phase, text, 1, created, now)
+
+
+class _Queue:
+    """_CLAIM_BATCH_SQL 과 같은 규칙: leader room 의 PENDING CATEGORY_DISCUSS 를 다른 phase job 앞까지, limit 개"""
+
+    def __init__(self, pending):
+        self.pending = list(pending)
+        self.calls = []
+        self.done = []
+
+    def claim_batch(self, leader, worker, limit):
+        self.calls.append((leader.job_id, limit, time.monotonic()))
+        claimed = []
+        for job in [j for j in self.pending if j.room_id == leader.room_id]:
+            if job.phase != "CATEGORY_DISCUSS" or len(claimed) >= limit:
+                break
+            claimed.append(job)
+        for job in claimed:
+            self.pending.remove(job)
+        return claimed
+
+    def mark_done(self, job_id, timings):
+        self.done.append(job_id)
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    def install(pending=()):
+        queue = _Queue(pending)
+        monkeypatch.setattr(job_queue, "claim_batch", queue.claim_batch)
+        monkeypatch.setattr(job_queue, "mark_done", queue.mark_done)
+        return queue
+    return install
+
+
+@pytest.fixture
+def window(monkeypatch):
+    monkeypatch.setattr(settings, "PIPELINE_BATCH_WINDOW_SEC", 0.05)
+    monkeypatch.setattr(settings, "PIPELINE_BATCH_MAX_SIZE", 3)
+
+
+def _gather(leader: ClaimedJob):
+    async def main():
+        pool = PipelineWorkerPool(concurrency=1, poll_interval=1)
+        pool._loop = asyncio.get_running_loop()
+        t0 = time.monotonic()
+        followers = await pool._gather_batch(leader, StageTimer())
+        return followers, t0
+
+    return asyncio.run(main())
+
+
+def test_window_lingers_then_caps_batch_size(queue, window):
+    leader = _job(ROOM_A, "u0")
+    q = queue([_job(ROOM_A, f"u{i}") for i in range(1, 6)])
+
+    followers, t0 = _gather(leader)
+
+    assert [f.text for f in followers] == ["u1", "u2"]  # 대표 포함 PIPELINE_BATCH_MAX_SIZE
+    (_, limit, claimed_at), = q.calls
+    assert limit == settings.PIPELINE_BATCH_MAX_SIZE - 1
+    assert claimed_at - t0 >= 0.04  # window 동안 기다린 뒤 claim
+
+
+def test_window_counts_time_already_spent_in_queue(queue, window):
+    q = queue([_job(ROOM_A, "u1")])
+
+    followers, t0 = _gather(_job(ROOM_A, "u0", waited_sec=1))
+
+    assert [f.text for f in followers] == ["u1"]
+    assert q.calls[0][2] - t0 < 0.04  # 이미 window 보다 오래 기다렸으면 바로
+
+
+def test_no_batch_when_window_disabled_or_not_category(queue, window, monkeypatch):
+    q = queue([_job(ROOM_A, "u1")])
+    assert _gather(_job(ROOM_A, "b0", phase="BASIC_DISCUSS"))[0] == []
+
+    monkeypatch.setattr(settings, "PIPELINE_BATCH_WINDOW_SEC", 0)
+    assert _gather(_job(ROOM_A, "u0"))[0] == []
+    assert q.calls == []
+
+
+def test_batch_runs_only_leader_room(queue, window, monkeypatch):
+    leader = _job(ROOM_A, "a0")
+    q = queue([
+        _job(ROOM_B, "b1"),
+        _job(ROOM_A, "a1"),
+        _job(ROOM_B, "b2"),
+        _job(ROOM_A, "a2", phase="BASIC_DISCUSS"),  # 다른 phase 뒤 발화는 순서 유지를 위해 제외
+        _job(ROOM_A, "a3"),
+    ])
+    runs = []
+
+    async def run_phase_pipeline(room_id, phase, text, timer=None, committed=None, job_ids=()):
+        runs.append((room_id, text, list(job_ids)))
+
+    monkeypatch.setattr(pipeline_worker, "run_phase_pipeline", run_phase_pipeline)
+
+    async def main():
+        pool = PipelineWorkerPool(concurrency=1, poll_interval=1)
+        pool._loop = asyncio.get_running_loop()
+        await pool._execute(leader)
+        return pool
+
+    pool = asyncio.run(main())
+
+    (room_id, texts, job_ids), = runs
+    assert (room_id, texts) == (ROOM_A, ["a0", "a1"])
+    assert q.done == job_ids
+    assert [j.text for j in q.pending] == ["b1", "b2", "a2", "a3"]
+    assert pool.stats()["batched_jobs"] == 1
+    assert not pool._leased  # 끝나면 heartbeat 대상에서 빠짐
@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from app.db.models.node import Node
+from app.db.models.pipeline_job import PipelineJob
+from app.db.models.room import Room
+from app.schemas.utterance import PhaseType
+from app.services import phase_pipeline
+from app.services.job_queue import ClaimedJob
+from app.services.llm_service import LLMFields
+from app.services.pipeline_worker import PipelineWorkerPool
+
+
+class _FakeLLM:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+
+    def basic_discuss_fields(self, room_topic, text):
+        async def source():
+            if self.fail:
+                raise RuntimeError("llm down")
+            yield "root_label", "lamp"
+            yield "categories", ["material", "shape"]
+            yield "sketch_prompt", "a lamp"
+        return LLMFields(source(), ("root_label", "categories", "sketch_prompt"))
+
+
+class _FailingImages:
+    def iter_images(self, prompt, n, timer=None):
+        async def keys():
+            raise RuntimeError("gemini down")
+            yield  # async generator
+        return keys()
+
+
+@pytest.fixture
+def room(db):
+    room = Room(room_topic="topic", password="pw")
+    db.add(room)
+    db.commit()
+    return room
+
+
+def _run_job(db, room, monkeypatch, llm) -> PipelineJob:
+    monkeypatch.setattr(phase_pipeline, "llm_service", llm)
+    monkeypatch.setattr(phase_pipeline, "image_service", _FailingImages())
+
+    row = PipelineJob(room_id=room.room_id, phase=PhaseType.BASIC_DISCUSS.value, text="hello", status="RUNNING", attempts=1)
+    db.add(row)
+    db.commit()
+    now = datetime.now()
+    job = ClaimedJob(row.job_id, room.room_id, row.phase, row.text, row.attempts, now, now)
+
+    async def execute():
+        pool = PipelineWorkerPool(concurrency=1, poll_interval=1)
+        pool._loop = asyncio.get_running_loop()
+        await pool._execute(job)
+
+    asyncio.run(execute())
+    db.expire_all()
+    return db.get(PipelineJob, row.job_id)
+
+
+def test_failure_after_commit_is_not_retried(db, room, monkeypatch):
+    job = _run_job(db, room, monkeypatch, _FakeLLM())
+
+    # db_keyword 는 커밋됨 → 재실행하면 루트 CATEGORY 노드가 하나 더 생기므로 PENDING 으로 되돌리지 않음
+    assert job.status == "FAILED"
+    assert "db_keyword" in job.error
+    assert job.committed_phases == ["db_keyword"]  # worker 가 죽어도 recover 가 알 수 있도록 job row 에도
+    assert db.query(Node).filter(Node.room_id == room.room_id, Node.node_type == "CATEGORY").count() == 1
+
+
+def test_failure_before_commit_is_retried(db, room, monkeypatch):
+    job = _run_job(db, room, monkeypatch, _FakeLLM(fail=True))
+
+    assert job.status == "PENDING"
+    assert job.committed_phases is None
+    assert db.query(Node).filter(Node.room_id == room.room_id).count() == 0
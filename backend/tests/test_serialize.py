@@ -0,0 +1,67 @@
+import asyncio
+import json
+import uuid
+
+from app.core.broadcast_bus import InProcessBus
+from app.core.ws_manager import WSRoomManager
+from app.services.graph_builder import asset_node_item, category_node_item, edge_item
+from app.utils.serialize import dumps_json, stringify_uuids
+
+
+def _payload() -> dict:
+    root = category_node_item(uuid.uuid4(), "루트 \"램프\"", 1)
+    asset = asset_node_item(uuid.uuid4(), f"minio:9000/nodexr-assets/{uuid.uuid4()}.png", root["node_id"])
+    return {
+        "event": "GRAPH_DELTA",
+        "cause": "NODE_IMAGE_UPDATE",
+        "version": 3,
+        "base_version": 2,
+        "core_img_url": None,
+        "delta": {
+            "graph_snapshot_id": uuid.uuid4(),
+            "nodes": [root, asset],
+            "edges": [edge_item(uuid.uuid4(), root["node_id"], asset["node_id"])],
+        },
+    }
+
+
+def _legacy(payload: dict) -> str:
+    # 예전 경로: 연결마다 _stringify_uuids 후 ws.send_json (starlette 의 json.dumps 옵션)
+    return json.dumps(stringify_uuids(payload), separators=(",", ":"), ensure_ascii=False)
+
+
+def test_dumps_json_matches_legacy_send_json_text():
+    payload = _payload()
+    assert dumps_json(payload) == _legacy(payload)
+
+
+class _RecordingWS:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000):
+        pass
+
+
+def test_broadcast_sends_same_encoded_frame_to_every_connection():
+    payload = _payload()
+
+    async def main():
+        manager = WSRoomManager("test_serialize", bus=InProcessBus())
+        room_id, sockets = uuid.uuid4(), [_RecordingWS(), _RecordingWS()]
+        for ws in sockets:
+            await manager.connect(room_id, ws)
+        await manager.broadcast(room_id, payload, version=3)
+        await asyncio.sleep(0.01)
+        for ws in sockets:
+            manager.disconnect(room_id, ws)
+        return sockets
+
+    sockets = asyncio.run(main())
+    assert [ws.sent for ws in sockets] == [[_legacy(payload)]] * 2
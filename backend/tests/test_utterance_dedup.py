@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db.models.pipeline_job import PipelineJob
+from app.db.models.room import Room
+from app.services.utterance_dedup import UtteranceDedup
+from app.utils.text_similarity import jaccard, shingles
+
+PHASE = "CATEGORY_DISCUSS"
+TEXT = "손잡이를 나무 재질로 바꿔 주세요"
+
+
+@pytest.fixture
+def room(db):
+    room = Room(room_topic="topic", password="pw")
+    db.add(room)
+    db.commit()
+    return room
+
+
+def _job(db, room, text: str = TEXT, age_sec: float = 0, status: str = "PENDING") -> PipelineJob:
+    # created_at 은 DB 시계(localtimestamp)와 같은 naive local time
+    job = PipelineJob(
+        room_id=room.room_id, phase=PHASE, text=text, status=status,
+        created_at=datetime.now() - timedelta(seconds=age_sec),
+    )
+    db.add(job)
+    db.commit()
+    return job
+
+
+def _dedup() -> UtteranceDedup:
+    return UtteranceDedup(threshold=0.85, window_sec=60)
+
+
+def test_near_duplicate_is_coalesced_and_upgrades_text(db, room):
+    job = _job(db, room)
+    final = TEXT + "."  # STT partial → final
+    assert jaccard(shingles(TEXT), shingles(final)) >= 0.85
+
+    dedup = _dedup()
+    assert dedup.coalesce(db, room.room_id, PHASE, final) == job.job_id
+    db.commit()
+    db.expire_all()
+
+    row = db.get(PipelineJob, job.job_id)
+    assert (row.coalesced, row.text) == (1, final)
+    assert dedup.stats()["coalesced"] == 1
+
+
+def test_distinct_utterance_is_kept(db, room):
+    _job(db, room)
+    other = "몸통 색을 파란색으로 칠해 주세요"
+    assert jaccard(shingles(TEXT), shingles(other)) < 0.85
+
+    assert _dedup().coalesce(db, room.room_id, PHASE, other) is None
+
+
+def test_job_outside_window_is_not_compared(db, room):
+    _job(db, room, age_sec=120)
+    assert _dedup().coalesce(db, room.room_id, PHASE, TEXT) is None
+
+
+def test_finished_job_and_other_phase_are_not_compared(db, room):
+    _job(db, room, status="DONE")
+    assert _dedup().coalesce(db, room.room_id, "BASIC_DISCUSS", TEXT) is None
+    assert _dedup().coalesce(db, room.room_id, PHASE, TEXT) is None
+
+
+def test_running_job_keeps_its_text(db, room):
+    job = _job(db, room, status="RUNNING")
+    assert _dedup().coalesce(db, room.room_id, PHASE, TEXT + ".") == job.job_id
+    db.commit()
+    db.expire_all()
+    assert db.get(PipelineJob, job.job_id).text == TEXT  # 이미 실행 중이면 교체하지 않음
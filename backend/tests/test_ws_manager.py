@@ -0,0 +1,74 @@
+import asyncio
+import uuid
+
+import pytest
+
+from app.core.broadcast_bus import InProcessBus
+from app.core.ws_manager import WSRoomManager
+
+
+class _StuckWS:
+    """첫 프레임 전송에서 release 될 때까지 멈추는 클라이언트"""
+
+    def __init__(self):
+        self.sent = []
+        self.closed = False
+        self.release = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text: str):
+        await self.release.wait()
+        self.sent.append(text)
+
+    async def close(self, code: int = 1000):
+        self.closed = True
+
+
+async def _flood(policy: str, frames: int = 6):
+    manager = WSRoomManager(f"test_{policy}", bus=InProcessBus(), queue_size=3, slow_consumer_policy=policy)
+    room_id, ws = uuid.uuid4(), _StuckWS()
+    await manager.connect(room_id, ws)
+    manager.deliver(room_id, "f0")
+    await asyncio.sleep(0)  # writer 가 f0 을 꺼내서 send 에서 멈춤
+
+    for i in range(1, frames):
+        manager.deliver(room_id, f"f{i}")
+    conn = manager._conns.get(room_id, {}).get(ws)
+    queued = [text for _, text in list(conn.queue._queue)] if conn else None
+    dropped = conn.dropped if conn else None
+
+    ws.release.set()
+    await asyncio.sleep(0.01)
+    if conn:
+        conn.close()
+    return manager, room_id, ws, queued, dropped
+
+
+def test_drop_oldest_keeps_newest_frames():
+    _, _, ws, queued, dropped = asyncio.run(_flood("drop_oldest"))
+    # f0 은 전송 중, 큐(3)에는 가장 최근 3개
+    assert queued == ["f3", "f4", "f5"]
+    assert dropped == 2
+    assert ws.sent == ["f0", "f3", "f4", "f5"]
+
+
+def test_coalesce_keeps_only_latest_frame_after_overflow():
+    _, _, ws, queued, dropped = asyncio.run(_flood("coalesce"))
+    # f1..f3 으로 가득 → f4 가 모두 비우고, f5 는 빈 자리에 들어감
+    assert queued == ["f4", "f5"]
+    assert dropped == 3
+    assert ws.sent == ["f0", "f4", "f5"]
+
+
+def test_disconnect_drops_slow_connection():
+    manager, room_id, ws, queued, _ = asyncio.run(_flood("disconnect"))
+    assert queued is None
+    assert room_id not in manager._conns
+    assert ws.closed
+
+
+def test_unknown_policy_rejected():
+    with pytest.raises(ValueError):
+        WSRoomManager("test_unknown", bus=InProcessBus(), slow_consumer_policy="block")